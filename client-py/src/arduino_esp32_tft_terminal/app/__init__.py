@@ -6,6 +6,7 @@ from abc import abstractmethod
 from typing import Callable
 
 from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.lib import font5x7
 from arduino_esp32_tft_terminal.lib.board import Board
 
 CAMEL_RX = re.compile('([a-z][A-Z0-9])')
@@ -61,7 +62,7 @@ class App:
 
     def init(self) -> None:
         self.board.set_comm_error_handler(self.init)
-        self.board.configure()
+        self.board.prepare()
         assert config.WIDTH and config.HEIGHT
 
         # ready for run()
@@ -81,7 +82,12 @@ class App:
         self.gfx.display()
 
     def get_title_pos(self, title: str) -> tuple[int, int]:
-        w, h = self.get_text_size(title)
+        # Titles are one line at text size (1, 2): measured host-side, unless
+        # too wide for the panel (then the board wraps them).
+        sx, sy = (int(config.TEXT_SCALING * k + 0.5) for k in (1, 2))
+        w, h = font5x7.text_size(title, sx, sy)
+        if w > config.WIDTH:
+            w, h = self.get_text_size(title)
         x = int(config.WIDTH / 2 - w / 2 + 0.5)
         y = int(config.HEIGHT / 2 - h / 2 + 0.5)
         return x, y
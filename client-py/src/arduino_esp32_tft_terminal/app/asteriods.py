@@ -1,11 +1,14 @@
 import datetime
+import itertools
 import math
 import random
 import time
 from dataclasses import dataclass
+from typing import Hashable
 
 from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.app import App
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
 from arduino_esp32_tft_terminal.lib.board import Board
 from arduino_esp32_tft_terminal.lib.gfx import Gfx
 
@@ -43,6 +46,8 @@ MENU_NEXT = 2
 MENU_AUTO = 3
 MENU_QUIT = 4
 
+SIMULATION_FPS = 15  # steps per second; all speeds are per step
+
 GOTO_MENU = 1
 GOTO_NEXT = 2
 GOTO_QUIT = 3
@@ -59,11 +64,111 @@ COLOR_BOOM = 255, 64, 64
 COLOR_GOVER_TEXT = 64, 64, 64
 COLOR_STATUS_TEXT = 96, 96, 192
 COLOR_DEFAULT = 255, 255, 255
+COLOR_ERASE = 0, 0, 0
+
+# Stable IDs for the render list: every game object keeps its own for life.
+_ids = itertools.count()
+
+Rgb = tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class Render:
+    """One drawable: a primitive, its integer args, its colour, and for text
+    the string. Two renders compare equal iff they paint the same pixels."""
+
+    kind: str  # pixel | circle | fill_circle | triangle | text
+    args: tuple[int, ...]
+    rgb: Rgb
+    text: str = ''
+
+    def bbox(self) -> tuple[int, int, int, int]:
+        if self.kind == 'pixel':
+            x, y = self.args
+            return x, y, x, y
+        if self.kind in ('circle', 'fill_circle'):
+            x, y, r = self.args
+            return x - r, y - r, x + r, y + r
+        if self.kind == 'triangle':
+            xs, ys = self.args[0::2], self.args[1::2]
+            return min(xs), min(ys), max(xs), max(ys)
+        # text: classic font cell is 6x8 per char at text size 1
+        x, y = self.args
+        w = 6 * config.TEXT_SCALING * len(self.text)
+        h = 8 * config.TEXT_SCALING
+        return x, y, x + w - 1, y + h - 1
+
+
+def _overlap(a: tuple[int, int, int, int], b: tuple[int, int, int, int]) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class RenderList:
+    """Retained scene of what is on the panel, keyed by stable object ID.
+
+    Each frame the game `add`s the renders it wants; `commit` erases only the
+    ones that moved, changed or disappeared, and draws only the new or changed
+    ones. Unchanged renders overlapped by an erase are repainted, so erasing
+    never leaves holes in a neighbour."""
+
+    def __init__(self, gfx: Gfx) -> None:
+        self.gfx = gfx
+        self.shown: dict[Hashable, Render] = {}
+        self.wanted: dict[Hashable, Render] = {}
+        self.fg: Rgb | None = None
+        self.text_rgb: Rgb | None = None
+
+    def add(self, key: Hashable, render: Render) -> None:
+        self.wanted[key] = render
+
+    def invalidate(self) -> None:
+        """Forget the panel content, e.g. after a clear or a direct draw."""
+        self.shown.clear()
+        self.fg = self.text_rgb = None
+
+    def commit(self) -> None:
+        shown, wanted = self.shown, self.wanted
+        erased = [r for k, r in shown.items() if wanted.get(k) != r]
+        drawn = [r for k, r in wanted.items() if shown.get(k) != r]
+        if erased:
+            boxes = [r.bbox() for r in erased]
+            for k, r in wanted.items():
+                if shown.get(k) == r and any(_overlap(r.bbox(), b) for b in boxes):
+                    drawn.append(r)  # repair a neighbour punched by an erase
+
+        for r in erased:
+            self.paint(r, erase=True)
+        for r in drawn:
+            self.paint(r)
+        self.shown, self.wanted = wanted, {}
+
+    def paint(self, r: Render, erase: bool = False) -> None:
+        c = 0 if erase else 1
+        if r.kind == 'text':
+            rgb = COLOR_ERASE if erase else r.rgb
+            if rgb != self.text_rgb:
+                self.gfx.set_text_color(*rgb)
+                self.text_rgb = rgb
+            self.gfx.set_cursor(*r.args)
+            self.gfx.print(r.text)
+            return
+        if not erase and r.rgb != self.fg:
+            self.gfx.set_fg_color(*r.rgb)
+            self.fg = r.rgb
+        if r.kind == 'pixel':
+            self.gfx.draw_pixel(*r.args, c)
+        elif r.kind == 'circle':
+            self.gfx.draw_circle(*r.args, c)
+        elif r.kind == 'fill_circle':
+            self.gfx.fill_circle(*r.args, c)
+        elif r.kind == 'triangle':
+            self.gfx.draw_triangle(*r.args, c)
 
 
 class Shot:
     def __init__(self, gfx: Gfx, x: float, y: float, vx: float, vy: float):
         self.gfx = gfx
+        self.id = next(_ids)
         self.x, self.y, self.vx, self.vy = x, y, vx, vy
 
     def move(self) -> None:
@@ -78,10 +183,9 @@ class Shot:
             and self.y < config.HEIGHT
         )
 
-    def add_renders(self) -> None:
-        # self.gfx.set_fg_color(*COLOR_SHOT)
-        self.gfx.draw_pixel(int(self.x + 0.5), int(self.y + 0.5), 1)
-        # self.gfx.set_fg_color(*COLOR_DEFAULT)
+    def add_renders(self, scene: RenderList) -> None:
+        xy = int(self.x + 0.5), int(self.y + 0.5)
+        scene.add(('shot', self.id), Render('pixel', xy, COLOR_SHOT))
 
 
 class Ship:
@@ -167,14 +271,15 @@ class Ship:
         shots.append(shot)
         self.shot_reload = 0
 
-    def add_renders(self) -> None:
+    def add_renders(self, scene: RenderList) -> None:
         x0 = int(self.x0 + 0.5)
         y0 = int(self.y0 + 0.5)
         x1 = int(self.x1 + 0.5)
         y1 = int(self.y1 + 0.5)
         x2 = int(self.x2 + 0.5)
         y2 = int(self.y2 + 0.5)
-        self.gfx.draw_triangle(x0, y0, x1, y1, x2, y2, 1)
+        coords = x0, y0, x1, y1, x2, y2
+        scene.add('ship', Render('triangle', coords, COLOR_DEFAULT))
 
         if self.shield > 0:
             if self.protect:
@@ -183,9 +288,7 @@ class Ship:
                 r = SHIELD_RADIUS - 3 + (self.i % 3) * 3
             x = int(self.x + 0.5)
             y = int(self.y + 0.5)
-            self.gfx.set_fg_color(*COLOR_SHIELD)
-            self.gfx.draw_circle(x, y, r, 1)
-            self.gfx.set_fg_color(*COLOR_DEFAULT)
+            scene.add('shield', Render('circle', (x, y, r), COLOR_SHIELD))
 
     def add_renders_boom(self, i: int) -> None:
         x0 = int(self.x0 + 0.5)
@@ -224,6 +327,7 @@ class Asteroid(AsteriodData):
         self, gfx: Gfx, ship: Ship | None = None, other: AsteriodData | None = None
     ):
         self.gfx = gfx
+        self.id = next(_ids)
         if ship is not None:
             self.init(ship.x, ship.y)
         elif other is not None:
@@ -287,16 +391,15 @@ class Asteroid(AsteriodData):
         if self.r < 4:
             self.r = 0
 
-    def add_renders(self) -> None:
+    def add_renders(self, scene: RenderList) -> None:
         x = int(self.x + 0.5)
         y = int(self.y + 0.5)
         r = int(self.r + 0.5)
         if self.hit:
-            self.gfx.set_fg_color(*COLOR_BOOM)
-            self.gfx.fill_circle(x, y, r, 1)
-            self.gfx.set_fg_color(*COLOR_DEFAULT)
+            render = Render('fill_circle', (x, y, r), COLOR_BOOM)
         else:
-            self.gfx.draw_circle(x, y, r, 1)
+            render = Render('circle', (x, y, r), COLOR_DEFAULT)
+        scene.add(('asteroid', self.id), render)
 
     def add_renders_boom(self, i: int) -> None:
         x = int(self.x + 0.5)
@@ -315,14 +418,12 @@ class Bonus:
     y: int
     value: int
 
-    def render(self, gfx: Gfx) -> None:
-        gfx.set_cursor(
-            self.x + config.TEXT_SCALING * 2, self.y - config.TEXT_SCALING * 4
-        )
-        # gfx.set_fg_color(96, 96, 192)
-        gfx.set_text_color(*COLOR_BOOM)
-        gfx.print(str(self.value))
-        gfx.set_text_color(*COLOR_DEFAULT)
+    def __post_init__(self) -> None:
+        self.id = next(_ids)
+
+    def add_renders(self, scene: RenderList) -> None:
+        xy = self.x + config.TEXT_SCALING * 2, self.y - config.TEXT_SCALING * 4
+        scene.add(('bonus', self.id), Render('text', xy, COLOR_BOOM, str(self.value)))
 
 
 class Game:
@@ -332,6 +433,7 @@ class Game:
         self.player = Player(self.gfx, autoplay_enabled)
         self.shots: list[Shot] = []
         self.asteroids: list[Asteroid] = []
+        self.scene = RenderList(self.gfx)
 
     def update_asteroids(self) -> None:
         for a in self.asteroids:
@@ -385,44 +487,41 @@ class Game:
         return bonuses
 
     def add_renders(self) -> None:
-        self.player.ship.add_renders()
+        self.player.ship.add_renders(self.scene)
         for a in self.asteroids:
-            a.add_renders()
-
-        if self.shots:
-            self.gfx.set_fg_color(*COLOR_SHOT)
-            for shot in self.shots:
-                shot.add_renders()
-            self.gfx.set_fg_color(*COLOR_DEFAULT)
+            a.add_renders(self.scene)
+        for shot in self.shots:
+            shot.add_renders(self.scene)
 
     def add_renders_gameover(self) -> None:
         self.gfx.set_text_color(*COLOR_GOVER_TEXT)
         x, y = GAME_OVER_POS
         self.gfx.set_cursor(x, y)
         self.gfx.print(GAME_OVER_TITLE)
+        self.scene.invalidate()
 
     def add_renders_overlays(self) -> None:
+        scene = self.scene
         if self.player.autoplay_enabled:
-            self.add_renders_gameover()
+            scene.add(
+                'gameover',
+                Render('text', GAME_OVER_POS, COLOR_GOVER_TEXT, GAME_OVER_TITLE),
+            )
 
         x = config.WIDTH - 12 * config.TEXT_SCALING
-        self.gfx.set_cursor(x, 0)
-        self.gfx.set_text_color(*COLOR_STATUS_TEXT)
-        self.gfx.print(str(self.player.lives))
+        lives = str(self.player.lives)
+        scene.add('lives', Render('text', (x, 0), COLOR_STATUS_TEXT, lives))
 
         if self.player.ship.aster_crash:
             return
 
         if self.player.ship.reloading:
-            r = self.player.ship.reloading
-            self.gfx.home()
-            self.gfx.print(f'Shield in {r}')
+            status = f'Shield in {self.player.ship.reloading}'
         elif self.player.ship.shield > 0 and not self.player.ship.protect:
-            self.gfx.home()
-            self.gfx.print('Shield')
+            status = 'Shield'
         else:
-            self.gfx.home()
-            self.gfx.print(f'{self.player.score:04d}')
+            status = f'{self.player.score:04d}'
+        scene.add('status', Render('text', (0, 0), COLOR_STATUS_TEXT, status))
 
     def handle_crash(self) -> bool:
         if not self.player.ship.aster_crash:
@@ -433,6 +532,10 @@ class Game:
         if self.player.lives:
             self.player.lives -= 1
         self.gfx.set_text_color(*COLOR_DEFAULT)
+
+        # the explosion drew outside the render list: start from a blank panel
+        self.gfx.clear()
+        self.scene.invalidate()
         return True
 
     def boom(self, ship: Ship, asteroid: Asteroid) -> None:
@@ -624,17 +727,14 @@ class Asteriods(App):
         autoplay = Autoplay(game, autoplay_enabled)
         self.gfx.reset()
         self.gfx.set_text_size(1, 1)
-        while True:
-            keys = self.board.read_buttons()
-            if 'R' in keys:
-                return GOTO_QUIT
-            if autoplay.enabled and keys:
-                return GOTO_MENU
-
-            # Erase
-            self.gfx.clear()
+        self.gfx.clear()
+        scheduler = FrameScheduler[int](self.gfx, fps=SIMULATION_FPS)
+        held: set[str] = set()  # buttons read at the last frame
+        bonuses: list[Bonus] = []  # scored since the last frame
 
+        def update() -> int | None:
             # Update / create
+            keys = set(held)
             game.update_asteroids()
             game.create_asteroid()
             if autoplay.enabled:
@@ -643,29 +743,25 @@ class Asteriods(App):
             game.update_shots()
 
             # Hits
-            bonuses = game.do_detections()
-
-            # Draw
+            bonuses.extend(game.do_detections())
+            return None
 
-            # - indicators
-            game.add_renders_overlays()
-
-            # - objects
-            game.add_renders()
-
-            for bonus in bonuses:
-                game.player.score += bonus.value
-                bonus.render(self.gfx)
-
-            # - show
-            self.gfx.display()
+        def render(_alpha: float) -> int | None:
+            nonlocal held
+            held = self.board.read_buttons()
+            if 'R' in held:
+                return GOTO_QUIT
+            if autoplay.enabled and held:
+                return GOTO_MENU
 
             now = datetime.datetime.now()
             if autoplay.enabled and autoplay.until and now > autoplay.until:
                 return GOTO_NEXT  # exit autoplay
 
-            # Crash
+            # Crash: blocking animation, not to be caught up afterwards
             crashed = game.handle_crash()
+            if crashed:
+                scheduler.resync()
             if crashed and game.player.lives == 0:
                 game.add_renders_gameover()
                 self.gfx.display()
@@ -678,5 +774,21 @@ class Asteriods(App):
                     autoplay.enable()
                     self.board.wait_no_button()
 
-            if not autoplay.enabled:
-                time.sleep(0.05)
+            # Draw: only what changed since the last frame is erased/redrawn
+
+            # - indicators
+            game.add_renders_overlays()
+
+            # - objects
+            game.add_renders()
+
+            for bonus in bonuses:
+                game.player.score += bonus.value
+                bonus.add_renders(game.scene)
+            bonuses.clear()
+
+            # - show
+            game.scene.commit()
+            return None
+
+        return scheduler.run(update, render)
@@ -8,7 +8,13 @@ sessions with their names and states.
 When there are busy sessions but no asking or idle sessions, it displays an
 animated "clauding" logo.
 
-The app also handles button inputs to exit or refresh the display.
+The app also handles button inputs to exit or refresh the display. When the
+sessions do not fit, the list pages by itself every APP_CLAUDE_PAGE_SECS, and
+the B and C buttons page up and down.
+
+Session discovery runs in a background `SessionPoller`, so a slow scan (many
+sessions) never stalls the animation: the render loop only rebuilds the list
+and counts when the poller's generation moves.
 
 It relies on the `claude_busy_monitor` PyPI library to fetch Claude Code session
 data on the computer for the current user. It sends display command to the TFT
@@ -17,12 +23,16 @@ board using the `lib.gfx` local library for rendering text and graphics.
 
 from __future__ import annotations
 
+import functools
 import random
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from math import cos
+from typing import Callable
 
+import numpy as np
 from claude_busy_monitor import (
     ClaudeSession,
     ClaudeState,
@@ -30,8 +40,13 @@ from claude_busy_monitor import (
     get_state_counts,
 )
 
+from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.app import App, TimeEscaper
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
+from arduino_esp32_tft_terminal.app.widgets import ListView, Sprite
+from arduino_esp32_tft_terminal.lib import font5x7
 from arduino_esp32_tft_terminal.lib.board import Board
+from arduino_esp32_tft_terminal.lib.font5x7 import Mask
 from arduino_esp32_tft_terminal.lib.gfx import Gfx
 
 TITLE = "Claude Code Monitor"
@@ -88,6 +103,69 @@ CLAUDING_SPEED = 0.25
 CLAUDING_DELAY = 0.05
 CLAUDING_COLOR = TextBgColor(NamedColor.WHITE, NamedColor.ORANGE)
 
+STATUS_FRAMES = int(0.5 / CLAUDING_DELAY)  # blink period of the state counts
+LIST_ROW_H = 16 * LIST_TEXT_SIZE_Y + LIST_TEXT_MARGIN
+
+
+################################################################################
+# Session discovery
+################################################################################
+@dataclass(frozen=True)
+class SessionsSnapshot:
+    generation: int = 0  # moves whenever what is displayed changes
+    sessions: tuple[ClaudeSession, ...] = ()
+    counts: dict[ClaudeState, int] = field(default_factory=dict)
+
+
+class SessionPoller:
+    """Discovers the sessions in a daemon thread, every
+    APP_CLAUDE_POLL_INTERVAL, and publishes a `SessionsSnapshot` by swapping a
+    single reference. Polls that change nothing displayed (only token stats)
+    keep the generation, so the renderer can skip them."""
+
+    def __init__(
+        self,
+        fetch: Callable[[], list[ClaudeSession]] = get_sessions,
+        interval: float | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.fetch = fetch
+        self.interval = interval or config.APP_CLAUDE_POLL_INTERVAL
+        self.sleep = sleep
+        self.key: tuple[tuple[str, str, ClaudeState], ...] | None = None
+        self._snapshot = SessionsSnapshot()
+        self.stopped = False
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def snapshot(self) -> SessionsSnapshot:
+        return self._snapshot
+
+    def poll_once(self) -> None:
+        sessions = tuple(self.fetch())
+        key = tuple((s.path, s.id, s.state) for s in sessions)
+        if key == self.key:
+            return
+        self.key = key
+        self._snapshot = SessionsSnapshot(
+            self._snapshot.generation + 1,
+            sessions,
+            get_state_counts(list(sessions)),
+        )
+
+    def _loop(self) -> None:
+        while not self.stopped:
+            try:
+                self.poll_once()
+            except Exception as e:
+                print('Claude sessions:', e)
+            self.sleep(self.interval)
+
 
 ################################################################################
 # State display
@@ -137,24 +215,16 @@ class StateCountStatus:
 
 @dataclass
 class SessionLine:
-    idx: int
     width: int
-    last_value: tuple[ClaudeState, str] | None = (
-        None  # to avoid flickering when unchanged
-    )
-
-    def print(self, gfx: Gfx, session: ClaudeSession) -> int:
-        y = LIST_OFFSET_Y + (16 * LIST_TEXT_SIZE_Y + LIST_TEXT_MARGIN) * self.idx
 
-        # No change, skip to reduce flickering
-        if self.last_value == (session.state, session.name):
-            return y
-        self.last_value = (session.state, session.name)
+    @staticmethod
+    def key(session: ClaudeSession) -> tuple[ClaudeState, str]:
+        # what is shown: repainted only when it changes, to avoid flickering
+        return session.state, session.name
 
+    def print(self, gfx: Gfx, y: int, session: ClaudeSession) -> None:
         # Erase line
-        h = 16 * LIST_TEXT_SIZE_Y
-        gfx.set_bg_color(*LIST_COLOR.bg.value)
-        gfx.fill_rect(0, y, self.width, h, 0)
+        self.clear(gfx, y)
 
         # Print new text
         s = f"{session.state.value.upper():6} {session.name}"
@@ -162,14 +232,10 @@ class SessionLine:
         gfx.set_text_color(*LIST_COLOR.fg.value)
         gfx.print(s)
 
-        return y
-
-    @staticmethod
-    def clear(gfx: Gfx, idx: int, width: int) -> None:
-        y = LIST_OFFSET_Y + (16 * LIST_TEXT_SIZE_Y + LIST_TEXT_MARGIN) * idx
+    def clear(self, gfx: Gfx, y: int) -> None:
         h = 16 * LIST_TEXT_SIZE_Y
         gfx.set_bg_color(*LIST_COLOR.bg.value)
-        gfx.fill_rect(0, y, width, h, 0)
+        gfx.fill_rect(0, y, self.width, h, 0)
 
 
 ################################################################################
@@ -180,7 +246,10 @@ class ClaudeChar:
 
     They consist of multiple sub-characters with specific offsets and sizes to
     create unicode flowers and stars. Because I was too lazy^H^H^H^Hbusy to
-    to create fonts in the Arduino firmware."""
+    to create fonts in the Arduino firmware.
+
+    The composites are rendered host-side once, with the board's classic font,
+    and moved around as a `Sprite`."""
 
     @dataclass(frozen=True)
     class SubChar:
@@ -254,26 +323,55 @@ class ClaudeChar:
         FOUR_POINTED_STAR,
     ]
 
-    def draw(self, gfx: Gfx, char: CompositeChar, x: int, y: int) -> None:
-        for sc in char:
-            gfx.set_text_size(sc.sx // 2, sc.sy // 2)
-            gfx.set_cursor(x + sc.x_offset // 2, y + sc.y_offset // 2)
-            gfx.print(sc.char)
+    def mask(self, char: CompositeChar) -> tuple[Mask, int, int]:
+        """The pixels the sub-characters light, as if printed at (0, 0), and
+        the mask's offset from there. Rendered once per character."""
+        return _composite_mask(tuple(char), config.TEXT_SCALING)
+
+
+@functools.cache
+def _composite_mask(
+    char: tuple[ClaudeChar.SubChar, ...], scaling: int
+) -> tuple[Mask, int, int]:
+    glyphs = []
+    for sc in char:
+        # text sizes as Gfx.set_text_size scales them, and the board clamps
+        sx = max(int(scaling * (sc.sx // 2) + 0.5), 1)
+        sy = max(int(scaling * (sc.sy // 2) + 0.5), 1)
+        text = sc.char.replace('\\\\', '\\')  # unescaped from the wire form
+        glyphs.append(
+            (font5x7.render(text, sx, sy), sc.x_offset // 2, sc.y_offset // 2)
+        )
+    x0 = min(x for _, x, _ in glyphs)
+    y0 = min(y for _, _, y in glyphs)
+    w = max(x + g.shape[1] for g, x, _ in glyphs) - x0
+    h = max(y + g.shape[0] for g, _, y in glyphs) - y0
+    mask = np.zeros((h, w), dtype=bool)
+    for g, x, y in glyphs:
+        mask[y - y0 : y - y0 + g.shape[0], x - x0 : x - x0 + g.shape[1]] |= g
+    return mask, x0, y0
 
 
 class Clauding:
-    def __init__(self, width):
+    def __init__(self, gfx: Gfx, width: int):
+        self.gfx = gfx
         self.width = width
         self.claude_chars = ClaudeChar()
-        self.phase = 0
-        self.last_n = -1
+        self.sprite = Sprite(gfx)
+        self.reset()
 
     def reset(self):
         self.phase = 0
         self.last_n = -1
+        self.i = 0
+        self.sprite.forget()
 
-    def draw(self, gfx: Gfx, n: int) -> None:
+    def step(self, n: int) -> None:
+        """Draw one sub-frame: move the logo to its next flower, repainting
+        only the pixels that differ."""
+        gfx = self.gfx
         gfx.set_bg_color(*CLAUDING_COLOR.bg.value)
+        gfx.set_fg_color(*CLAUDING_COLOR.fg.value)
         lh = 16 * STATUS_TEXT_SIZE_Y + STATUS_TEXT_MARGIN * 2
         h = lh * 3
 
@@ -286,27 +384,19 @@ class Clauding:
             s = f"{n} BUSY"
             gfx.print(s)
             self.last_n = n
+            self.sprite.forget()  # wiped by the fill
 
         # animate claude logo
-        for c in self.claude_chars.ALL_CHARS * 2:
-            gfx.set_text_color(*CLAUDING_COLOR.fg.value)
-            x = 24 + random.randint(0, 4)
-            dy = (
-                int(CLAUDING_AMPL * 2 * (1 - pow(cos(cos(self.phase)), 20)))
-                - CLAUDING_AMPL
-            )
-            self.phase += CLAUDING_SPEED
-            y = TITLE_AREA_H + lh + dy  # - 10 * 0 + random.randint(0, 6)
-            self.claude_chars.draw(gfx, c, x, y)
-            gfx.display()
-
-            if CLAUDING_DELAY:
-                time.sleep(CLAUDING_DELAY)
-
-            # erase
-            gfx.set_text_color(*CLAUDING_COLOR.bg.value)
-            self.claude_chars.draw(gfx, c, x, y)
-            gfx.display()
+        c = self.claude_chars.ALL_CHARS[self.i % len(self.claude_chars.ALL_CHARS)]
+        self.i += 1
+        x = 24 + random.randint(0, 4)
+        dy = (
+            int(CLAUDING_AMPL * 2 * (1 - pow(cos(cos(self.phase)), 20))) - CLAUDING_AMPL
+        )
+        self.phase += CLAUDING_SPEED
+        y = TITLE_AREA_H + lh + dy  # - 10 * 0 + random.randint(0, 6)
+        mask, dx, dy = self.claude_chars.mask(c)
+        self.sprite.show(mask, x + dx, y + dy)
 
 
 ################################################################################
@@ -329,15 +419,24 @@ class ClaudeMonitor(App):
         self.gfx.print(text)
 
     def _run(self) -> bool:
-        escaper = TimeEscaper(self)
+        self.escaper = TimeEscaper(self)
         self.gfx.set_auto_display_off()
         self.gfx.set_text_wrap_off()
-        clauding = Clauding(self.w)
-
-        asking = StateCountStatus("ASKING", 0, self.w, ASKING_COLOR, BLINKED_COLOR)
-        busy = StateCountStatus("BUSY", 1, self.w, BUSY_COLOR)
-        idle = StateCountStatus("IDLE", 2, self.w, IDLE_COLOR)
-        session_by_idx: dict[int, SessionLine] = {}
+        self.clauding = Clauding(self.gfx, self.w)
+
+        self.asking = StateCountStatus("ASKING", 0, self.w, ASKING_COLOR, BLINKED_COLOR)
+        self.busy = StateCountStatus("BUSY", 1, self.w, BUSY_COLOR)
+        self.idle = StateCountStatus("IDLE", 2, self.w, IDLE_COLOR)
+        line = SessionLine(self.w)
+        room = self.h - LIST_OFFSET_Y - 16 * LIST_TEXT_SIZE_Y - LIST_TEXT_MARGIN * 2
+        self.session_list = ListView[ClaudeSession](
+            LIST_OFFSET_Y,
+            LIST_ROW_H,
+            room // LIST_ROW_H + 1,  # rows fitting above the bottom margin
+            lambda y, session: line.print(self.gfx, y, session),
+            lambda y: line.clear(self.gfx, y),
+            SessionLine.key,
+        )
 
         self.gfx.set_text_size(0.5, 0.5)
         self.gfx.set_text_color(*NamedColor.ORANGE.value)
@@ -345,70 +444,94 @@ class ClaudeMonitor(App):
         self.gfx.set_cursor(0, 0)  # (self.w - w) // 2, 0)
         self.gfx.print(TITLE)
 
-        last_max = -1
-        last_n_sessions = -1
-
-        while True:
-            btns = self.board.auto_read_buttons()
-            if 'R' in btns:
-                return True
-            if btns:
-                return False
-            if escaper.check():
-                return False
-
-            sessions = get_sessions()
-            counts = get_state_counts(sessions)
-
-            # nb of sessions
-            n_sessions = len(sessions)
-            if n_sessions != last_n_sessions:
-                if last_n_sessions > -1:
-                    self.print_nb_sessions(last_n_sessions, NamedColor.BLACK)
-                self.print_nb_sessions(n_sessions, NamedColor.WHITE)
-                last_n_sessions = n_sessions
-
-            # sessions
-            sorted_sessions = (
-                [s for s in sessions if s.state == ClaudeState.ASKING]
-                + [s for s in sessions if s.state == ClaudeState.IDLE]
-                + [s for s in sessions if s.state == ClaudeState.BUSY]
-            )
-
-            self.gfx.set_text_size(LIST_TEXT_SIZE_X, LIST_TEXT_SIZE_Y)
-
-            idx = -1
-            for idx, session in enumerate(sorted_sessions):
-                session_line = session_by_idx.setdefault(idx, SessionLine(idx, self.w))
-                y = session_line.print(self.gfx, session)
-                if y + 16 * LIST_TEXT_SIZE_Y + LIST_TEXT_MARGIN * 2 > self.h:
-                    break
-            if not sorted_sessions:
-                session_by_idx.clear()
-
-            # clear remaining lines if sessions have decreased
-            if idx < last_max:
-                for i in range(idx + 1, last_max + 1):
-                    SessionLine.clear(self.gfx, i, self.w)
-            last_max = idx
-
-            # counts
-            asking.value = counts.get(ClaudeState.ASKING, 0)
-            busy.value = counts.get(ClaudeState.BUSY, 0)
-            idle.value = counts.get(ClaudeState.IDLE, 0)
-
-            is_clauding = asking.value == 0 and idle.value == 0 and busy.value > 0
-            if is_clauding:
-                clauding.draw(self.gfx, busy.value)
-                asking.last_value = idle.last_value = busy.last_value = None
-            else:
-                clauding.reset()
-                self.gfx.set_text_size(STATUS_TEXT_SIZE_X, STATUS_TEXT_SIZE_Y)
-                asking.print(self.gfx)
-                busy.print(self.gfx)
-                idle.print(self.gfx)
-
-            # display
-            self.gfx.display()
-            if not is_clauding:
-                time.sleep(0.5)
+        self.last_n_sessions = -1
+        self.generation = 0
+        self.frame = 0
+        self.paged_frame = 0  # when the list last changed page
+        self.was_clauding = False
+
+        self.poller = SessionPoller()
+        self.poller.start()
+        try:
+            scheduler = FrameScheduler[bool](self.gfx, fps=1 / CLAUDING_DELAY)
+            return scheduler.run(lambda: None, self.render)
+        finally:
+            self.poller.stop()
+
+    def render(self, _alpha: float) -> bool | None:
+        btns = self.board.auto_read_buttons()
+        session_list = self.session_list
+        if 'R' in btns:
+            return True
+        elif session_list.overflows and btns & {'B', 'C'}:
+            session_list.page(-1 if 'B' in btns else 1)
+            self.show_page()
+            self.escaper.retrigger()
+            self.board.wait_button_up(0)
+        elif btns:
+            return False
+        elif self.escaper.check():
+            return False
+
+        # auto-paging, when the list is longer than the panel
+        page_frames = int(config.APP_CLAUDE_PAGE_SECS / CLAUDING_DELAY)
+        if (
+            page_frames
+            and session_list.overflows
+            and self.frame - self.paged_frame >= page_frames
+        ):
+            session_list.auto_page()
+            self.show_page()
+
+        snap = self.poller.snapshot()
+        changed = snap.generation != self.generation
+        if changed:
+            self.generation = snap.generation
+            self.show_sessions(snap)
+
+        asking, busy, idle = self.asking, self.busy, self.idle
+        is_clauding = asking.value == 0 and idle.value == 0 and busy.value > 0
+        if is_clauding:
+            self.clauding.step(busy.value)
+            asking.last_value = idle.last_value = busy.last_value = None
+        elif changed or self.was_clauding or self.frame % STATUS_FRAMES == 0:
+            self.clauding.reset()
+            self.gfx.set_text_size(STATUS_TEXT_SIZE_X, STATUS_TEXT_SIZE_Y)
+            asking.print(self.gfx)
+            busy.print(self.gfx)
+            idle.print(self.gfx)
+        self.was_clauding = is_clauding
+        self.frame += 1
+        return None
+
+    def show_page(self) -> None:
+        self.paged_frame = self.frame
+        self.gfx.set_text_size(LIST_TEXT_SIZE_X, LIST_TEXT_SIZE_Y)
+        self.session_list.render()
+
+    def show_sessions(self, snap: SessionsSnapshot) -> None:
+        sessions, counts = snap.sessions, snap.counts
+
+        # nb of sessions
+        n_sessions = len(sessions)
+        if n_sessions != self.last_n_sessions:
+            if self.last_n_sessions > -1:
+                self.print_nb_sessions(self.last_n_sessions, NamedColor.BLACK)
+            self.print_nb_sessions(n_sessions, NamedColor.WHITE)
+            self.last_n_sessions = n_sessions
+
+        # sessions
+        sorted_sessions = (
+            [s for s in sessions if s.state == ClaudeState.ASKING]
+            + [s for s in sessions if s.state == ClaudeState.IDLE]
+            + [s for s in sessions if s.state == ClaudeState.BUSY]
+        )
+
+        self.session_list.set_items(sorted_sessions)
+        self.gfx.set_text_size(LIST_TEXT_SIZE_X, LIST_TEXT_SIZE_Y)
+        self.session_list.render()
+
+        # counts
+        self.asking.value = counts.get(ClaudeState.ASKING, 0)
+        self.busy.value = counts.get(ClaudeState.BUSY, 0)
+        self.idle.value = counts.get(ClaudeState.IDLE, 0)
@@ -16,6 +16,7 @@ import numpy as np
 
 from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.app import App, TimeEscaper
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
 from arduino_esp32_tft_terminal.lib.board import Board
 from arduino_esp32_tft_terminal.lib.gfx import Gfx
 
@@ -363,55 +364,59 @@ class CollisionsElastic(App):
             self.g,
         )
 
-        escaper = TimeEscaper(self)
-        previous_particles: list[Particle] = []
+        self.sim = sim
+        self.escaper = TimeEscaper(self)
+        self.previous_particles: list[Particle] = []
 
-        kick = 0.0
-        friction = 0.0
+        self.pending_kick = 0.0
+        self.pending_friction = 0.0
         self.gfx.set_auto_display_off()
 
-        while True:
-            for i in range(TIME_SUBQUANTAS):
-                sim.animate(0, kick, friction)
-
-            kick = 0.0
-            friction = 0.0
-            btns = self.board.auto_read_buttons()
-            if 'R' in btns:
-                return True
-            elif 'B' in btns:
-                kick = self.kick
-                escaper.retrigger()
-            elif 'C' in btns:
-                friction = self.friction
-                escaper.retrigger()
-            elif btns:
-                return False
-            elif escaper.check():
-                return False
-
-            particles = sim.particles
-
-            self.draw(previous_particles, erase=True)
-
-            self.gfx.set_fg_color(*COLOR_BORDER)
-            self.gfx.draw_rect(0, 0, config.WIDTH - 1, config.HEIGHT - 1, 1)
-
-            self.draw(particles)
-            self.gfx.display()
-
-            previous_particles = [Particle.create_from(p) for p in particles]
-            sim.after_draw()
-
-            for p in particles:
-                p.is_hit_by_wall = False
-                p.is_hit_by_other = False
+        return FrameScheduler[bool](self.gfx).run(self.update, self.render)
+
+    def update(self) -> None:
+        for i in range(TIME_SUBQUANTAS):
+            self.sim.animate(0, self.pending_kick, self.pending_friction)
+        self.pending_kick = 0.0
+        self.pending_friction = 0.0
+
+    def render(self, _alpha: float) -> bool | None:
+        btns = self.board.auto_read_buttons()
+        if 'R' in btns:
+            return True
+        elif 'B' in btns:
+            self.pending_kick = self.kick
+            self.escaper.retrigger()
+        elif 'C' in btns:
+            self.pending_friction = self.friction
+            self.escaper.retrigger()
+        elif btns:
+            return False
+        elif self.escaper.check():
+            return False
+
+        particles = self.sim.particles
+
+        self.draw(self.previous_particles, erase=True)
+
+        self.gfx.set_fg_color(*COLOR_BORDER)
+        self.gfx.draw_rect(0, 0, config.WIDTH - 1, config.HEIGHT - 1, 1)
+
+        self.draw(particles)
+
+        self.previous_particles = [Particle.create_from(p) for p in particles]
+        self.sim.after_draw()
+
+        for p in particles:
+            p.is_hit_by_wall = False
+            p.is_hit_by_other = False
+        return None
 
     def draw(self, particles: list[Particle], erase: bool = False) -> None:
-        c = 0 if erase else 1
+        # Erasing needs no color change: all the circles go in two bulk calls
+        drawn: list[tuple[int, int, int]] = []
+        filled: list[tuple[int, int, int]] = []
         for p in particles:
-            if not erase:
-                self.gfx.set_fg_color(*p.rgb)
             x = int(p.r[0])
             y = int(p.r[1])
             r = int(p.radius)
@@ -421,10 +426,17 @@ class CollisionsElastic(App):
                 or p.is_hit_by_wall
                 and self.flash_on_hit_wall
             )
+            if erase:
+                (filled if flash else drawn).append((x, y, r))
+                continue
+            self.gfx.set_fg_color(*p.rgb)
             if flash:
-                self.gfx.fill_circle(x, y, r, c)
+                self.gfx.fill_circle(x, y, r, 1)
             else:
-                self.gfx.draw_circle(x, y, r, c)
+                self.gfx.draw_circle(x, y, r, 1)
+        if erase:
+            self.gfx.fill_circles(np.array(filled, dtype=int), 0)
+            self.gfx.draw_circles(np.array(drawn, dtype=int), 0)
 
     def rand(self, min: float, max: float, nb: int) -> Floats:
         return [random.random() * (max - min) + min for i in range(nb)]
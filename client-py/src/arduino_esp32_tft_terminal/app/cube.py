@@ -1,58 +1,169 @@
+"""Rotating Cube, by Al Sweigart al@inventwithpython.com A rotating
+cube animation. Press Ctrl-C to stop.  This code is available
+at https://nostarch.com/big-book-small-python-programming
+Tags: large, artistic, math
+
+https://inventwithpython.com/bigbookpython/project62.html
+
+Reworked as a NumPy pipeline: one composed rotation matrix per frame applied
+to the whole vertex array, a vectorized projection, and face visibility and
+shading computed in the same batch. Any mesh can be shown (APP_CUBE_MESH, an
+OBJ file), the cube being the default one.
+"""
+
 import math
-from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
 
 from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.app import App, TimeEscaper
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
 from arduino_esp32_tft_terminal.lib.board import Board
 
 ISOMETRIC = True
 BOUNCE_SIZE = True
 
+Floats = NDArray[np.float64]
+Ints = NDArray[np.int_]
+Bools = NDArray[np.bool_]
+Xy = tuple[int, int]
+
+
+def rotation_matrix(ax: float, ay: float, az: float) -> Floats:
+    """Rotation around the x, then y, then z axis, by angles in radians.
+
+    Directions of each axis:
+     -y
+      |
+      +-- +x
+     /
+    +z
+    """
+    cx, sx = math.cos(ax), math.sin(ax)
+    cy, sy = math.cos(ay), math.sin(ay)
+    cz, sz = math.cos(az), math.sin(az)
+    rx = np.array(((1, 0, 0), (0, cx, -sx), (0, sx, cx)))
+    ry = np.array(((cy, 0, sy), (0, 1, 0), (-sy, 0, cy)))
+    rz = np.array(((cz, -sz, 0), (sz, cz, 0), (0, 0, 1)))
+    return rz @ ry @ rx
+
+
+class View:
+    """One frame of a mesh: panel coordinates, and per face/edge visibility."""
+
+    def __init__(
+        self, xy: Ints, depth: Floats, visible: Bools, shade: Floats, usage: Ints
+    ) -> None:
+        self.xy = xy  # (V, 2) panel coordinates of the vertices
+        self.depth = depth  # (F,) mean face z, larger is nearer
+        self.visible = visible  # (F,) front-facing faces
+        self.shade = shade  # (F,) lighting value in [-1, 1]
+        self.usage = usage  # (E,) number of visible faces using each edge
+
+
+class Mesh:
+    """Polyhedron as arrays: vertices, faces, and edges derived from faces.
+
+    Faces are vertex index loops, counter-clockwise seen from outside in panel
+    axes, so that (v1 - v0) x (v2 - v0) is the outward normal."""
+
+    def __init__(
+        self,
+        vertices: list[tuple[float, float, float]],
+        faces: list[tuple[int, ...]],
+    ):
+        self.vertices: Floats = np.array(vertices, dtype=float)
+        self.faces = [tuple(f) for f in faces]
+        self.face_normal_ix: Ints = np.array([f[:3] for f in self.faces])
+
+        edge_ix: dict[tuple[int, int], int] = {}
+        fe_face: list[int] = []
+        fe_edge: list[int] = []
+        for i, f in enumerate(self.faces):
+            for a, b in zip(f, f[1:] + f[:1]):
+                key = (a, b) if a < b else (b, a)
+                fe_face.append(i)
+                fe_edge.append(edge_ix.setdefault(key, len(edge_ix)))
+        self.edges: Ints = np.array(list(edge_ix), dtype=int).reshape(-1, 2)
+        self.fe_face: Ints = np.array(fe_face, dtype=int)  # face-edge incidences
+        self.fe_edge: Ints = np.array(fe_edge, dtype=int)
+
+        # fan triangulation, for filling
+        self.face_tris = [
+            [(f[0], f[i], f[i + 1]) for i in range(1, len(f) - 1)] for f in self.faces
+        ]
 
-@dataclass
-class Point:
-    x: float
-    y: float
-    z: float
-
-
-@dataclass
-class Vector:
-    x: float
-    y: float
-    z: float
-
-
-@dataclass
-class Point2:
-    x: int
-    y: int
-
-
-@dataclass
-class Line:
-    x1: int
-    y1: int
-    x2: int
-    y2: int
-
-
-PointIndex = int
-
-
-@dataclass
-class Edge:
-    a: PointIndex
-    b: PointIndex
-
-
-EdgeIndex = int
-
+    @staticmethod
+    def cube() -> 'Mesh':
+        """The indexes for each corner of the cube are marked in this diagram:
+          0------1
+         /|     /|
+        2------3 |
+        | 4----|-5
+        |/     |/
+        6------7
+        """
+        corners = [
+            (-1, -1, -1),
+            (+1, -1, -1),
+            (-1, -1, +1),
+            (+1, -1, +1),
+            (-1, +1, -1),
+            (+1, +1, -1),
+            (-1, +1, +1),
+            (+1, +1, +1),
+        ]
+        faces = [
+            (0, 1, 3, 2),  # top
+            (1, 5, 7, 3),  # right
+            (2, 3, 7, 6),  # front
+            (0, 2, 6, 4),  # left
+            (0, 4, 5, 1),  # back
+            (4, 6, 7, 5),  # bottom
+        ]
+        return Mesh(corners, faces)
+
+    @staticmethod
+    def from_obj(text: str) -> 'Mesh':
+        """Parse the `v` and `f` records of a Wavefront OBJ, and fit the model
+        in the cube's [-1, 1] box. OBJ is y-up, the panel y-down."""
+        vertices: list[tuple[float, float, float]] = []
+        faces: list[tuple[int, ...]] = []
+        for line in text.splitlines():
+            fields = line.split()
+            if not fields:
+                continue
+            if fields[0] == 'v':
+                x, y, z = (float(v) for v in fields[1:4])
+                vertices.append((x, -y, z))
+            elif fields[0] == 'f':
+                ixs = [int(v.split('/')[0]) for v in fields[1:]]
+                ixs = [i - 1 if i > 0 else len(vertices) + i for i in ixs]
+                faces.append(tuple(reversed(ixs)))  # y flip mirrors the winding
+        v = np.array(vertices)
+        center = (v.min(axis=0) + v.max(axis=0)) / 2
+        v = (v - center) / np.abs(v - center).max()
+        return Mesh([tuple(p) for p in v], faces)
+
+    def project(self, rotation: Floats, scale: float, tx: float, ty: float) -> View:
+        p = self.vertices @ rotation.T
+
+        a, b, c = (p[self.face_normal_ix[:, i]] for i in range(3))
+        n = np.cross(b - a, c - a)
+        n /= np.linalg.norm(n, axis=1, keepdims=True)
+        visible = n[:, 2] > 0
+        shade = (n[:, 2] + n[:, 0]) * 2 / 3
+        depth = (a[:, 2] + b[:, 2] + c[:, 2]) / 3
+        usage = np.bincount(
+            self.fe_edge[visible[self.fe_face]], minlength=len(self.edges)
+        )
 
-@dataclass
-class Face:
-    edges: tuple[EdgeIndex, EdgeIndex, EdgeIndex, EdgeIndex]
-    normal: Edge
+        xy = p[:, :2]
+        if not ISOMETRIC:  # false perspective
+            xy = xy * (1.5 ** p[:, 2:3] * 0.6 + 0.25)
+        xy = (xy * scale + (tx, ty)).astype(int)
+        return View(xy, depth, visible, shade, usage)
 
 
 class Cube(App):
@@ -60,19 +171,12 @@ class Cube(App):
         super().__init__(board, auto_read=True)
 
     def _run(self) -> bool:
-        """Rotating Cube, by Al Sweigart al@inventwithpython.com A rotating
-        cube animation. Press Ctrl-C to stop.  This code is available
-        at https://nostarch.com/big-book-small-python-programming
-        Tags: large, artistic, math
-
-        https://inventwithpython.com/bigbookpython/project62.html"""
-
         # Set up the constants:
         SIZE = min(config.WIDTH, config.HEIGHT)
-        SCALE = SIZE // 4
+        self.SCALE = SIZE // 4
 
-        TRANSLATEX = (config.WIDTH - 4) // 2 + int(config.WIDTH / 8)
-        TRANSLATEY = (config.HEIGHT - 4) // 2 + 4 + 8
+        self.TRANSLATEX = (config.WIDTH - 4) // 2 + int(config.WIDTH / 8)
+        self.TRANSLATEY = (config.HEIGHT - 4) // 2 + 4 + 8
 
         # (!) Try setting two of these values to zero to rotate the cube only
         # along a single axis:
@@ -81,402 +185,51 @@ class Cube(App):
         Y_ROTATE_SPEED = 0.08 * K
         Z_ROTATE_SPEED = 0.13 * K
 
-        LINES_RGB = 96, 255, 96
-        TEXT_RGB = int(96 / 2), int(255 / 2), int(96 / 2)
-
-        hue = 0
-        mode = 0
-
-        def line(x1: float, y1: float, x2: float, y2: float, c: int) -> None:
-            self.gfx.draw_line(
-                int(x1 + 0.5), int(y1 + 0.5), int(x2 + 0.5), int(y2 + 0.5), c
-            )
-
-        def triangle(u: Point2, v: Point2, w: Point2, c: int) -> None:
-            self.gfx.fill_triangle(
-                int(u.x + 0.5),
-                int(u.y + 0.5),
-                int(v.x + 0.5),
-                int(v.y + 0.5),
-                int(w.x + 0.5),
-                int(w.y + 0.5),
-                c,
-            )
+        self.LINES_RGB = 96, 255, 96
+        self.TEXT_RGB = int(96 / 2), int(255 / 2), int(96 / 2)
 
-        def rotate_point(p: Point, a: Vector) -> Point:
-            """Returns an (x, y, z) tuple of the x, y, z arguments rotated.
-
-            The rotation happens around the 0, 0, 0 origin by angles
-            ax, ay, az (in radians).
-                Directions of each axis:
-                 -y
-                  |
-                  +-- +x
-                 /
-                +z
-            """
-
-            # Rotate around x axis:
-            rotated_x = p.x
-            rotated_y = (p.y * math.cos(a.x)) - (p.z * math.sin(a.x))
-            rotated_z = (p.y * math.sin(a.x)) + (p.z * math.cos(a.x))
-            x, y, z = rotated_x, rotated_y, rotated_z
-
-            # Rotate around y axis:
-            rotated_x = (z * math.sin(a.y)) + (x * math.cos(a.y))
-            rotated_y = y
-            rotated_z = (z * math.cos(a.y)) - (x * math.sin(a.y))
-            x, y, z = rotated_x, rotated_y, rotated_z
-
-            # Rotate around z axis:
-            rotated_x = (x * math.cos(a.z)) - (y * math.sin(a.z))
-            rotated_y = (x * math.sin(a.z)) + (y * math.cos(a.z))
-            rotated_z = z
-
-            # False perspective
-            k = 1 if ISOMETRIC else 1.5**z * 0.6 + 0.25
-
-            return Point(rotated_x * k, rotated_y * k, rotated_z)
-
-        def adjust_point(p: Point) -> Point2:
-            """Adjusts the 3D XYZ point to a 2D XY point fit for displaying on
-            the screen. This resizes this 2D point by a scale of SCALEX and
-            SCALEY, then moves the point by TRANSLATEX and TRANSLATEY."""
-            scale = (
-                SCALE * (0.8 + math.sin(hue / 360 * math.pi * 2) * 0.2)
-                if BOUNCE_SIZE
-                else SCALE
-            )
-            return Point2(int(p.x * scale + TRANSLATEX), int(p.y * scale + TRANSLATEY))
-
-        def cube(
-            corners: list[Point], rotation: Vector, lines: list[Line], clear: bool
-        ) -> None:
-            # apply rotations
-            for i, point in enumerate(CUBE_CORNERS):
-                corners[i] = rotate_point(point, rotation)
-
-            if clear:
-                self.gfx.clear()
-
-            match mode:
-                case 0:
-                    title = "Wireframe"
-                    cube_wireframe(corners, lines, False)
-                case 1:
-                    title = "Opaque"
-                    cube_wireframe(corners, lines, True)
-                case 2:
-                    title = "Shaded"
-                    cube_shaded(corners, False, False)
-                case 3:
-                    title = "No flicker"
-                    cube_shaded(corners, True, False)
-                case 4:
-                    title = "Contour"
-                    cube_shaded(corners, True, True)
-
-            if clear or mode == 2:
-                self.gfx.set_text_color(*TEXT_RGB)
-                self.gfx.home()
-                self.gfx.set_text_size(1, 1.5)
-                self.gfx.print(title)
-
-        def cube_wireframe(
-            corners: list[Point],
-            lines: list[Line],
-            hidden: bool,
-        ) -> None:
-
-            # Erase old
-            for ln in lines:
-                line(ln.x1, ln.y1, ln.x2, ln.y2, 0)
-            lines.clear()
-
-            # Find farthest point to omit hidden edges
-            min_z: float = 0
-            if hidden:
-                for edge in CUBE_EDGES:
-                    from_corner_index, to_corner_index = edge.a, edge.b
-                    from_point = corners[from_corner_index]
-                    to_point = corners[to_corner_index]
-                    min_z = min(min_z, from_point.z)
-                    min_z = min(min_z, to_point.z)
-
-            # Get the points of the cube lines:
-            for edge in CUBE_EDGES:
-                from_corner_index, to_corner_index = edge.a, edge.b
-                from_point = corners[from_corner_index]
-                to_point = corners[to_corner_index]
-                src = adjust_point(from_point)
-                dst = adjust_point(to_point)
-                if ISOMETRIC and hidden:
-                    if from_point.z == min_z or to_point.z == min_z:
-                        continue  # bound to farthest point: hidden edge
-                lines.append(Line(src.x, src.y, dst.x, dst.y))
-
-            # Draw
-            self.gfx.set_fg_color(*LINES_RGB)
-            for ln in lines:
-                line(ln.x1, ln.y1, ln.x2, ln.y2, 1)
+        if config.APP_CUBE_MESH:
+            with open(config.APP_CUBE_MESH) as f:
+                self.mesh = Mesh.from_obj(f.read())
+        else:
+            self.mesh = Mesh.cube()
 
+        self.hue = 0
+        self.mode = 0
+        self.lines: NDArray[np.int_] = np.empty((0, 4), dtype=int)
         self.last_x0 = self.last_x1 = self.last_y0 = self.last_y1 = 0
         self.has_last = False
 
-        def cube_shaded(
-            corners: list[Point],
-            smart_erase: bool,
-            contour: bool,
-        ) -> None:
-            def extrema(
-                point: Point2,
-                top: Point2,
-                bottom: Point2,
-                left: Point2,
-                right: Point2,
-            ) -> tuple[Point2, Point2, Point2, Point2]:
-                if point.y < top.y:
-                    top = point
-                if point.y > bottom.y:
-                    bottom = point
-                if point.x < left.x:
-                    left = point
-                if point.x > right.x:
-                    right = point
-                return top, bottom, left, right
-
-            # determine visible faces
-            visible_faces_indices: set[int] = set()
-            value_by_face_index: dict[int, float] = {}
-            for i, face in enumerate(CUBE_FACES):
-                src = corners[face.normal.a]
-                dst = corners[face.normal.b]
-                dx, _, dz = dst.x - src.x, dst.y - src.y, dst.z - src.z
-                if dz > 0:
-                    visible_faces_indices.add(i)
-                    value_by_face_index[i] = (dz + dx) / 3
-
-            # determine outer edges
-            usage_by_edge_index: dict[int, int] = {}
-            for i in visible_faces_indices:
-                face = CUBE_FACES[i]
-                for j in face.edges:
-                    usage_by_edge_index.setdefault(j, 0)
-                    usage_by_edge_index[j] += 1
-            outer_edges_indices = [k for k, v in usage_by_edge_index.items() if v == 1]
-
-            # find enclosing rectangle
-            outer_points_ixs: set[int] = set()
-            for i in outer_edges_indices:
-                edge = CUBE_EDGES[i]
-                outer_points_ixs.add(edge.a)
-                outer_points_ixs.add(edge.b)
-            outer_points_2d: list[Point2] = []
-            for ix in outer_points_ixs:
-                outer_points_2d.append(adjust_point(corners[ix]))
-            top = bottom = left = right = outer_points_2d[0]
-            for point in outer_points_2d[1:]:
-                top, bottom, left, right = extrema(point, top, bottom, left, right)
-            x0, y0 = left.x, top.y
-            x1, y1 = right.x, bottom.y
-            top_left = Point2(x0, y0)
-            top_right = Point2(x1, y0)
-            bot_left = Point2(x0, y1)
-            bot_right = Point2(x1, y1)
-
-            if smart_erase:
-                # erase frame (between enclosing rectangle and last enclosing rectangle)
-                if self.has_last:
-                    if self.last_x0 < x0:
-                        u0, u1 = self.last_x0, x0
-                        v0 = min(self.last_y0, y0)
-                        v1 = max(self.last_y1, y1)
-                        self.gfx.fill_rect(u0, v0, u1 - u0, v1 - v0, 0)
-                    if self.last_x1 > x1:
-                        u0, u1 = x1, self.last_x1
-                        v0 = min(self.last_y0, y0)
-                        v1 = max(self.last_y1, y1)
-                        self.gfx.fill_rect(u0, v0, u1 - u0, v1 - v0, 0)
-                    if self.last_y0 < y0:
-                        v0, v1 = self.last_y0, y0
-                        u0 = min(self.last_x0, x0)
-                        u1 = max(self.last_x1, x1)
-                        self.gfx.fill_rect(u0, v0, u1 - u0, v1 - v0, 0)
-                    if self.last_y1 > y1:
-                        v0, v1 = y1, self.last_y1
-                        u0 = min(self.last_x0, x0)
-                        u1 = max(self.last_x1, x1)
-                        self.gfx.fill_rect(u0, v0, u1 - u0, v1 - v0, 0)
-                self.has_last = True
-                self.last_x0, self.last_y0, self.last_x1, self.last_y1 = (
-                    x0 - 1,
-                    y0 - 1,
-                    x1 + 1,
-                    y1 + 1,
-                )
-
-                # erase outer edges to enclosing rectangle
-                for i in outer_edges_indices:
-                    edge = CUBE_EDGES[i]
-                    from_point_ix, to_point_ix = edge.a, edge.b
-                    from_point = corners[from_point_ix]
-                    to_point = corners[to_point_ix]
-                    src2 = adjust_point(from_point)
-                    dst2 = adjust_point(to_point)
-
-                    # right
-                    if src2.x == x1 and src2.y < dst2.y:
-                        triangle(src2, dst2, bot_right, 0)
-                    elif dst2.x == x1 and src2.y > dst2.y:
-                        triangle(src2, dst2, bot_right, 0)
-
-                    elif src2.x == x1 and src2.y > dst2.y:
-                        triangle(src2, dst2, top_right, 0)
-                    elif dst2.x == x1 and src2.y < dst2.y:
-                        triangle(src2, dst2, top_right, 0)
-
-                    # left
-                    elif src2.x == x0 and src2.y < dst2.y:
-                        triangle(src2, dst2, bot_left, 0)
-                    elif dst2.x == x0 and src2.y > dst2.y:
-                        triangle(src2, dst2, bot_left, 0)
-
-                    elif src2.x == x0 and src2.y > dst2.y:
-                        triangle(src2, dst2, top_left, 0)
-                    elif dst2.x == x0 and src2.y < dst2.y:
-                        triangle(src2, dst2, top_left, 0)
-
-                    # top
-                    if src2.y == y0 and src2.x < dst2.x:
-                        triangle(src2, dst2, top_right, 0)
-                    elif dst2.y == y0 and src2.x > dst2.x:
-                        triangle(src2, dst2, top_right, 0)
-
-                    if src2.y == y0 and src2.x > dst2.x:
-                        triangle(src2, dst2, top_left, 0)
-                    elif dst2.y == y0 and src2.x < dst2.x:
-                        triangle(src2, dst2, top_left, 0)
-
-                    # bottom
-                    if src2.y == y1 and src2.x < dst2.x:
-                        triangle(src2, dst2, bot_right, 0)
-                    elif dst2.y == y1 and src2.x > dst2.x:
-                        triangle(src2, dst2, bot_right, 0)
-
-                    if src2.y == y1 and src2.x > dst2.x:
-                        triangle(src2, dst2, bot_left, 0)
-                    elif dst2.y == y1 and src2.x < dst2.x:
-                        triangle(src2, dst2, bot_left, 0)
-            else:
-                self.gfx.clear()
-
-            # draw visible faces
-            for i in visible_faces_indices:
-                face = CUBE_FACES[i]
-                point_indices: set[int] = set()
-                for j in face.edges:
-                    edge = CUBE_EDGES[j]
-                    point_indices.add(edge.a)
-                    point_indices.add(edge.b)
-                    usage_by_edge_index.setdefault(j, 0)
-                    usage_by_edge_index[j] += 1
-                points = [adjust_point(corners[k]) for k in point_indices]
-                a, b, c, d = points[0], points[1], points[2], points[3]
-
-                mag2 = 50
-                v = int(value_by_face_index[i] * mag2 + mag2)
-                rgb = self.gfx.hsv_to_rgb(hue, 60, v)
-                self.gfx.set_fg_color(*rgb)
-                triangle(a, b, c, 1)
-                triangle(b, c, d, 1)
-
-            # draw contour
-            if contour:
-                self.gfx.set_fg_color(*LINES_RGB)
-                for i in outer_edges_indices:
-                    edge = CUBE_EDGES[i]
-                    from_point_ix, to_point_ix = edge.a, edge.b
-                    from_point = corners[from_point_ix]
-                    to_point = corners[to_point_ix]
-                    src2 = adjust_point(from_point)
-                    dst2 = adjust_point(to_point)
-                    self.gfx.draw_line(src2.x, src2.y, dst2.x, dst2.y, 1)
-
-            # done
-            self.gfx.set_fg_color(*LINES_RGB)
-
-        """CUBE_CORNERS stores the XYZ coordinates of the corners of a cube.
-        The indexes for each corner in CUBE_CORNERS are marked in this diagram:
-              0------1
-             /|     /|
-            2------3 |
-            | 4----|-5
-            |/     |/
-            6------7
-        """
-
-        CUBE_CORNERS: list[Point] = [
-            Point(-1, -1, -1),  # Point 0
-            Point(+1, -1, -1),  # Point 1
-            Point(-1, -1, +1),  # Point 2
-            Point(+1, -1, +1),  # Point 3
-            Point(-1, +1, -1),  # Point 4
-            Point(+1, +1, -1),  # Point 5
-            Point(-1, +1, +1),  # Point 6
-            Point(+1, +1, +1),  # Point 7
-        ]
-
-        CUBE_EDGES: tuple[
-            Edge, Edge, Edge, Edge, Edge, Edge, Edge, Edge, Edge, Edge, Edge, Edge
-        ] = (
-            Edge(0, 1),  # edge 0
-            Edge(1, 3),  # edge 1
-            Edge(3, 2),  # edge 2
-            Edge(2, 0),  # edge 3
-            Edge(0, 4),  # edge 4
-            Edge(1, 5),  # edge 5
-            Edge(2, 6),  # edge 6
-            Edge(3, 7),  # edge 7
-            Edge(4, 5),  # edge 8
-            Edge(5, 7),  # edge 9
-            Edge(7, 6),  # edge 10
-            Edge(6, 4),  # edge 11
-        )
-
-        CUBE_FACES: tuple[Face, Face, Face, Face, Face, Face] = (
-            Face((0, 1, 2, 3), Edge(4, 0)),
-            Face((5, 9, 7, 1), Edge(0, 1)),
-            Face((2, 7, 10, 6), Edge(0, 2)),
-            Face((4, 11, 6, 3), Edge(1, 0)),
-            Face((0, 5, 8, 4), Edge(2, 0)),
-            Face((8, 9, 10, 11), Edge(0, 4)),
-        )
-
-        # rotatedCorners stores the XYZ coordinates from CUBE_CORNERS after
-        # they've been rotated by rx, ry, and rz amounts:
-        unset = Point(0, 0, 0)
-        rotated_corners: list[Point] = [
-            unset,
-            unset,
-            unset,
-            unset,
-            unset,
-            unset,
-            unset,
-            unset,
-        ]
         # Rotation amounts for each axis:
-        rotation = Vector(0, 0, 0)
+        rx = ry = rz = 0.0
 
         escaper = TimeEscaper(self)
-        # self.gfx.reset()
-
-        lines: list[Line] = []
         clear = True
         nb_modes = 5
         hue_step = 8 if config.once else 5
+        scheduler = FrameScheduler[bool](self.gfx)
+
+        def update() -> bool | None:
+            nonlocal rx, ry, rz, clear
+
+            # Rotate the cube along different axes by different amounts:
+            rx += X_ROTATE_SPEED
+            ry += Y_ROTATE_SPEED
+            rz += Z_ROTATE_SPEED
+
+            new_hue = (self.hue + hue_step) % 360
+            if new_hue < self.hue:
+                self.mode = (self.mode + 1) % nb_modes
+                clear = True
+                #
+                if self.mode == 0 and config.once:
+                    return False
+            self.hue = new_hue
+            return None
+
+        def render(_alpha: float) -> bool | None:
+            nonlocal clear
 
-        while True:  # Main program loop.
             btns = self.board.auto_read_buttons()
             if 'R' in btns:
                 return True
@@ -485,34 +238,191 @@ class Cube(App):
             if 'B' in btns:
                 escaper.retrigger()
                 self.board.wait_button_up(0)
-                continue
+                scheduler.resync()
+                return None
             if 'C' in btns:
                 escaper.retrigger()
-                mode = (mode + 1) % nb_modes
+                self.mode = (self.mode + 1) % nb_modes
                 clear = True
-                hue = 0
+                self.hue = 0
                 self.board.wait_button_up(0)
+                scheduler.resync()
 
             if not config.once and escaper.check():
                 return False
 
-            # self.gfx.clear()
-
-            # Rotate the cube along different axes by different amounts:
-            rotation.x += X_ROTATE_SPEED
-            rotation.y += Y_ROTATE_SPEED
-            rotation.z += Z_ROTATE_SPEED
-
             # Compute, erase old and display new
-            cube(rotated_corners, rotation, lines, clear)
-            self.gfx.display()
+            self.draw(rotation_matrix(rx, ry, rz), clear)
             clear = False
+            return None
 
-            new_hue = (hue + hue_step) % 360
-            if new_hue < hue:
-                mode = (mode + 1) % nb_modes
-                clear = True
-                #
-                if mode == 0 and config.once:
-                    return False
-            hue = new_hue
+        return scheduler.run(update, render)
+
+    def draw(self, rotation: Floats, clear: bool) -> None:
+        scale = (
+            self.SCALE * (0.8 + math.sin(self.hue / 360 * math.pi * 2) * 0.2)
+            if BOUNCE_SIZE
+            else self.SCALE
+        )
+        view = self.mesh.project(rotation, scale, self.TRANSLATEX, self.TRANSLATEY)
+
+        if clear:
+            self.gfx.clear()
+
+        match self.mode:
+            case 0:
+                title = "Wireframe"
+                self.draw_wireframe(view, False)
+            case 1:
+                title = "Opaque"
+                self.draw_wireframe(view, True)
+            case 2:
+                title = "Shaded"
+                self.draw_shaded(view, False, False)
+            case 3:
+                title = "No flicker"
+                self.draw_shaded(view, True, False)
+            case 4:
+                title = "Contour"
+                self.draw_shaded(view, True, True)
+
+        if clear or self.mode == 2:
+            self.gfx.set_text_color(*self.TEXT_RGB)
+            self.gfx.home()
+            self.gfx.set_text_size(1, 1.5)
+            self.gfx.print(title)
+
+    def draw_wireframe(self, view: View, hidden: bool) -> None:
+        # Erase old
+        self.gfx.draw_lines(self.lines, 0)
+
+        # Edges not bordering any front face are hidden
+        edges = self.mesh.edges[view.usage > 0] if hidden else self.mesh.edges
+        self.lines = view.xy[edges].reshape(-1, 4)
+
+        # Draw
+        self.gfx.set_fg_color(*self.LINES_RGB)
+        self.gfx.draw_lines(self.lines, 1)
+
+    def draw_shaded(self, view: View, smart_erase: bool, contour: bool) -> None:
+        xy: list[Xy] = [(x, y) for x, y in view.xy.tolist()]
+        erased: list[tuple[Xy, Xy, Xy]] = []  # triangles, filled in one go
+
+        def erase_triangle(u: Xy, v: Xy, w: Xy) -> None:
+            erased.append((u, v, w))
+
+        outer_edges = self.mesh.edges[view.usage == 1]
+        if not len(outer_edges):  # an open mesh, seen from behind: no contour
+            smart_erase = contour = False
+            self.has_last = False
+
+        if smart_erase:
+            # enclosing rectangle of the outer edges
+            outer_xy = view.xy[outer_edges.ravel()]
+            x0, y0 = (int(v) for v in outer_xy.min(axis=0))
+            x1, y1 = (int(v) for v in outer_xy.max(axis=0))
+            top_left = x0, y0
+            top_right = x1, y0
+            bot_left = x0, y1
+            bot_right = x1, y1
+
+            # erase frame (between enclosing rectangle and last enclosing rectangle)
+            if self.has_last:
+                if self.last_x0 < x0:
+                    u0, u1 = self.last_x0, x0
+                    v0 = min(self.last_y0, y0)
+                    v1 = max(self.last_y1, y1)
+                    self.gfx.fill_rect(u0, v0, u1 - u0, v1 - v0, 0)
+                if self.last_x1 > x1:
+                    u0, u1 = x1, self.last_x1
+                    v0 = min(self.last_y0, y0)
+                    v1 = max(self.last_y1, y1)
+                    self.gfx.fill_rect(u0, v0, u1 - u0, v1 - v0, 0)
+                if self.last_y0 < y0:
+                    v0, v1 = self.last_y0, y0
+                    u0 = min(self.last_x0, x0)
+                    u1 = max(self.last_x1, x1)
+                    self.gfx.fill_rect(u0, v0, u1 - u0, v1 - v0, 0)
+                if self.last_y1 > y1:
+                    v0, v1 = y1, self.last_y1
+                    u0 = min(self.last_x0, x0)
+                    u1 = max(self.last_x1, x1)
+                    self.gfx.fill_rect(u0, v0, u1 - u0, v1 - v0, 0)
+            self.has_last = True
+            self.last_x0, self.last_y0, self.last_x1, self.last_y1 = (
+                x0 - 1,
+                y0 - 1,
+                x1 + 1,
+                y1 + 1,
+            )
+
+            # erase outer edges to enclosing rectangle
+            for a, b in outer_edges.tolist():
+                src2, dst2 = xy[a], xy[b]
+                sx, sy = src2
+                dx, dy = dst2
+
+                # right
+                if sx == x1 and sy < dy:
+                    erase_triangle(src2, dst2, bot_right)
+                elif dx == x1 and sy > dy:
+                    erase_triangle(src2, dst2, bot_right)
+
+                elif sx == x1 and sy > dy:
+                    erase_triangle(src2, dst2, top_right)
+                elif dx == x1 and sy < dy:
+                    erase_triangle(src2, dst2, top_right)
+
+                # left
+                elif sx == x0 and sy < dy:
+                    erase_triangle(src2, dst2, bot_left)
+                elif dx == x0 and sy > dy:
+                    erase_triangle(src2, dst2, bot_left)
+
+                elif sx == x0 and sy > dy:
+                    erase_triangle(src2, dst2, top_left)
+                elif dx == x0 and sy < dy:
+                    erase_triangle(src2, dst2, top_left)
+
+                # top
+                if sy == y0 and sx < dx:
+                    erase_triangle(src2, dst2, top_right)
+                elif dy == y0 and sx > dx:
+                    erase_triangle(src2, dst2, top_right)
+
+                if sy == y0 and sx > dx:
+                    erase_triangle(src2, dst2, top_left)
+                elif dy == y0 and sx < dx:
+                    erase_triangle(src2, dst2, top_left)
+
+                # bottom
+                if sy == y1 and sx < dx:
+                    erase_triangle(src2, dst2, bot_right)
+                elif dy == y1 and sx > dx:
+                    erase_triangle(src2, dst2, bot_right)
+
+                if sy == y1 and sx > dx:
+                    erase_triangle(src2, dst2, bot_left)
+                elif dy == y1 and sx < dx:
+                    erase_triangle(src2, dst2, bot_left)
+            self.gfx.fill_triangles(np.array(erased, dtype=int), 0)
+        else:
+            self.gfx.clear()
+
+        # draw visible faces, farthest first
+        faces = np.flatnonzero(view.visible)
+        faces = faces[np.argsort(view.depth[faces], kind='stable')]
+        mag2 = 50
+        values = (view.shade * mag2 + mag2).astype(int).tolist()
+        for i in faces.tolist():
+            rgb = self.gfx.hsv_to_rgb(self.hue, 60, values[i])
+            self.gfx.set_fg_color(*rgb)
+            self.gfx.fill_triangles(view.xy[np.array(self.mesh.face_tris[i])], 1)
+
+        # draw contour
+        if contour:
+            self.gfx.set_fg_color(*self.LINES_RGB)
+            self.gfx.draw_lines(view.xy[outer_edges], 1)
+
+        # done
+        self.gfx.set_fg_color(*self.LINES_RGB)
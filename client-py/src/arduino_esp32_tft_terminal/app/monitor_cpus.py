@@ -1,9 +1,9 @@
-import json
-
 from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.app import TimeEscaper
-from arduino_esp32_tft_terminal.app.monitor_host import MonitorBase
+from arduino_esp32_tft_terminal.app.monitor_host import COLOR_PANE, MonitorBase
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
 from arduino_esp32_tft_terminal.lib.board import Board
+from arduino_esp32_tft_terminal.lib.sampler import Sampler, Snapshot
 
 CHOICE_EXIT = 1
 CHOICE_NEXT = 2
@@ -18,50 +18,47 @@ class MonitorCpus(MonitorBase):
         self.chars_per_line = int(config.WIDTH / cw)
 
     def _run(self) -> bool:
-        title = 'CPU % and memory'
-        escaper = TimeEscaper(self)
+        self.escaper = TimeEscaper(self)
+        self.sampler = Sampler.get(config.MONITOR_SSH_AUTHORITY)
+        self.redraw = True
         self.gfx.set_auto_read_buttons_on()
-        while True:
-            btns = self.board.auto_read_buttons()
-            if 'R' in btns:
-                return True
-            if btns:
-                return False
-            if escaper.check():
-                return False
-
-            cpus = self.get_cpus_pcents()
-            mem = self.get_mem()
-
-            self.show_header(title)
+        scheduler = FrameScheduler[bool](self.gfx, fps=1 / config.MONITOR_CPU_INTERVAL)
+        return scheduler.run(lambda: None, self.render)
 
-            # CPUs
-            self.gfx.set_cursor(0, config.TEXT_SCALING * 12)
-            lines = cpus
-            for ln in lines:
-                self.gfx.print(f'{ln}\\n')
+    def render(self, _alpha: float) -> bool | None:
+        btns = self.board.auto_read_buttons()
+        if 'R' in btns:
+            return True
+        if btns:
+            return False
+        if self.escaper.check():
+            return False
 
-            # Mem
-            if len(lines) <= 4:
-                self.gfx.set_cursor(0, config.TEXT_SCALING * 6 * 8)
-                for ln in mem:
-                    self.gfx.print(f'{ln}\\n')
+        if self.redraw:
+            self.show_header('CPU % and memory')
+            self.cpus_grid = self.make_grid(config.TEXT_SCALING * 12)
+            self.mem_grid = self.make_grid(config.TEXT_SCALING * 6 * 8, 2)
+            self.redraw = False
 
-            self.gfx.display()
+        snap = self.sampler.snapshot()
+        cpus = self.get_cpus_pcents(snap)
+        mem = self.get_mem(snap)
 
-    def get_cpus_pcents(self) -> list[str]:
-        try:
-            out = self.shell_command(
-                (f'mpstat -P ALL {config.MONITOR_CPU_INTERVAL} 1 -o JSON').split()
-            )
-            data = json.loads(out)
-            loads = data['sysstat']['hosts'][0]['statistics'][0]['cpu-load']
-            cpus = [entry for entry in loads if entry['cpu'] not in ('all', '-1')]
-            pcents = [int(c['usr'] + 0.5) for c in cpus]
+        # CPUs, and Mem below if there is room; the grids overlap, so the
+        # one shrinking paints first
+        if len(cpus) <= 4:
+            self.cpus_grid.set_lines(cpus, COLOR_PANE)
+            self.mem_grid.set_lines(mem, COLOR_PANE)
+        else:
+            self.mem_grid.set_lines([], COLOR_PANE)
+            self.cpus_grid.set_lines(cpus, COLOR_PANE)
+        return None
 
-            pcents.sort(reverse=True)  # DEBATABLE
-        except Exception:
-            return ['<CPUs: mpstat error>']
+    def get_cpus_pcents(self, snap: Snapshot) -> list[str]:
+        if not len(snap) or 'cpu' in snap.errors:
+            return ['<CPUs: /proc/stat error>']
+        pcents = [int(p + 0.5) for p in snap.cpu[-1]]
+        pcents.sort(reverse=True)  # DEBATABLE
         lines = []
         line = ''
         for i, pcent in enumerate(pcents):
@@ -1,13 +1,15 @@
-import datetime
-import json
-import re
-import threading
+import math
 from dataclasses import dataclass
 
+import numpy as np
+from numpy.typing import NDArray
+
 from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.app import TimeEscaper
 from arduino_esp32_tft_terminal.app.monitor_host import MonitorBase
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
 from arduino_esp32_tft_terminal.lib.board import Board
+from arduino_esp32_tft_terminal.lib.sampler import Floats, Sampler, Snapshot
 
 DX = 4
 Y_MARGIN = 8 * config.TEXT_SCALING + 1
@@ -19,10 +21,76 @@ COLOR_AXIS = COLOR_LABELS = 96, 96, 96
 COLOR_MARKER = 192, 192, 192
 COLOR_ERROR = 255, 64, 64
 
-TRAFFIC_SCALING = 20 * 1000.0  # TODO: adaptative rescaling
+CPU_MIN_SCALE = 10.0  # %
+TRAFFIC_MIN_SCALE = 1000.0  # B/s
+SCALE_HALF_LIFE = 30.0  # secs for a past peak to weigh half
+SCALE_SHRINK = 0.25  # shrink once the peak is under this fraction of scale
+
+
+def nice_ceil(value: float) -> float:
+    """Smallest 1, 2 or 5 times a power of ten that is >= value (> 0)."""
+    exp = 10 ** math.floor(math.log10(value))
+    return next(m * exp for m in (1, 2, 5, 10) if m * exp >= value)
+
+
+def format_rate(rate: float) -> str:
+    if rate >= 10**6:
+        return f'{rate / 10**6:g}MB/s'
+    return f'{rate / 1000:g}kB/s'
+
+
+class AutoScale:
+    """Full scale of a plot following its data, updated in O(1) per sample.
+
+    A running peak decays with a half-life of SCALE_HALF_LIFE, and the scale
+    is the peak rounded up to a 1-2-5 value. The scale grows as soon as the
+    peak exceeds it, but shrinks only once the peak is under SCALE_SHRINK of
+    it, so that it does not flap around a boundary."""
+
+    def __init__(self, floor: float, ceiling: float = math.inf) -> None:
+        self.floor = floor
+        self.ceiling = ceiling
+        self.scale = floor
+        self.peak = 0.0
+        self.t: float | None = None
+
+    def update(self, t: float, value: float) -> bool:
+        """Account for a sample taken at time t; True if the scale changed."""
+        if self.t is not None:
+            self.peak *= 0.5 ** ((t - self.t) / SCALE_HALF_LIFE)
+        self.t = t
+        self.peak = max(self.peak, value)
+        if self.scale * SCALE_SHRINK <= self.peak <= self.scale:
+            return False
+        scale = nice_ceil(self.peak) if self.peak > 0 else self.floor
+        scale = min(max(scale, self.floor), self.ceiling)
+        changed = scale != self.scale
+        self.scale = scale
+        return changed
+
+
+Band = tuple[Floats, Floats, Floats]  # min, max and last of each line
+
+
+@dataclass
+class Column:
+    """The samples falling in one pixel column, decimated to a band per plot;
+    None where the column has no valid sample."""
+
+    cpu: Band | None  # per CPU rank, ascending
+    net: Band | None  # rx, tx
+
 
-RX_REGEX = re.compile('RX packets .*bytes ([0-9]+)')
-TX_REGEX = re.compile('TX packets .*bytes ([0-9]+)')
+def decimate(snap: Snapshot, rows: NDArray[np.int_]) -> Column:
+    def band(values: Floats) -> Band | None:
+        values = values[~np.isnan(values).any(axis=1)]
+        if not len(values) or not values.shape[1]:
+            return None
+        return values.min(axis=0), values.max(axis=0), values[-1]
+
+    cpu = np.sort(snap.cpu[rows], axis=1)
+    net = np.stack((snap.rx[rows], snap.tx[rows]), axis=1)
+    return Column(band(cpu), band(net))
 
 
 @dataclass
@@ -34,20 +102,14 @@ class CpuInfo:
 
 @dataclass
 class Traffic:
-    rx: int = 0
-    tx: int = 0
-    previous_rx: int | None = None
-    previous_tx: int | None = None
     previous_rx_scaled = 0
     previous_tx_scaled = 0
-    last_time: datetime.datetime | None = None
 
 
 class State:
     def __init__(self) -> None:
         self.last_bar_x: int | None = None
         self.last_cpus_ttl: int | None = None
-        self.pcents: list[int] = []
         self.cpu_infos: list[CpuInfo] = []
         self.nb_cpus: int = 0
         self.cpus_ttl: int = 0
@@ -63,10 +125,6 @@ class MonitorGraph(MonitorBase):
         self.chars_per_line = int(config.WIDTH / cw)
         self.lines = int(config.WIDTH / ch)
 
-        self.mutex = threading.Lock()
-        self.changed = False
-        self.stop = False
-
         self.ssh_authority_coords: tuple[int, int] | None = None
         if config.MONITOR_SSH_AUTHORITY:
             self.gfx.set_text_size(0.5, 1)
@@ -78,21 +136,18 @@ class MonitorGraph(MonitorBase):
         self.gfx.set_text_size(1, 1)
         self.gfx.set_text_color(128, 128, 128)
 
-    def make_cpu_infos(self, pcents: list[int] | None) -> list[CpuInfo]:
-        if not pcents:
-            return []
-        nb_cpus = len(pcents)
+    def make_cpu_infos(self, nb_cpus: int) -> list[CpuInfo]:
         cpu_infos: list[CpuInfo] = []
-        dhue = 360.0 / nb_cpus
-        for i, _ in enumerate(pcents):
+        dhue = 360.0 / max(nb_cpus, 1)
+        for i in range(nb_cpus):
             hue = 360 - dhue * i
             r, g, b = self.gfx.hsv_to_rgb(hue, 100, 100)
             cpu_infos.append(CpuInfo((r, g, b), 0, 0))
         return cpu_infos
 
-    def handle_cpus(self, cursor: int, state: State) -> None:
-        # get CPU percents
-        pcents, err = self.get_cpus_pcents()
+    def handle_cpus(
+        self, cursor: int, state: State, band: Band | None, err: str
+    ) -> None:
         if err:
             y = self.make_cpu_y(0) - config.TEXT_SCALING * 10
             self.gfx.set_cursor(00, y)
@@ -102,21 +157,19 @@ class MonitorGraph(MonitorBase):
             state.errors.add(1)
             return
         state.errors.discard(1)
+        if band is None:
+            return
 
+        lows, highs, pcents = (self.scale_cpus(v) for v in band)
         if len(pcents) != state.nb_cpus:
-            state.cpu_infos = self.make_cpu_infos(pcents)
+            state.cpu_infos = self.make_cpu_infos(len(pcents))
             state.nb_cpus = len(pcents)
         for i, pcent in enumerate(pcents):
             state.cpu_infos[i].pcent = pcent
 
         # total CPUs
-        state.cpus_ttl = int(
-            sum([cpu_graph.pcent / 100.0 for cpu_graph in state.cpu_infos])
-            / state.nb_cpus
-            * 100
-            + 0.5
-        )
-        print(f'CPUs: {state.cpus_ttl}%', pcents)
+        state.cpus_ttl = int(band[2].mean() + 0.5)
+        print(f'CPUs: {state.cpus_ttl}%', [int(p + 0.5) for p in band[2]])
 
         # erase prev values
         if cursor:
@@ -124,19 +177,24 @@ class MonitorGraph(MonitorBase):
         else:
             self.gfx.fill_rect(0, 0, DX + 1, config.HEIGHT - 1, 0)
 
-        # draw each CPUs
-        for cpu_graph in state.cpu_infos:
+        # draw each CPUs, with the range of the column's samples
+        for cpu_graph, low, high in zip(state.cpu_infos, lows, highs):
             x0 = cursor
             y0 = self.make_cpu_y(cpu_graph.previous_pcent)
             x1 = cursor + DX
             y1 = self.make_cpu_y(cpu_graph.pcent)
             self.gfx.set_fg_color(*cpu_graph.rgb)
             self.gfx.draw_line(x0, y0, x1, y1, 1)
+            if high > low:
+                self.gfx.draw_line(
+                    x1, self.make_cpu_y(low), x1, self.make_cpu_y(high), 1
+                )
             cpu_graph.previous_pcent = cpu_graph.pcent
 
-    def handle_traffic(self, cursor: int, state: State) -> None:
+    def handle_traffic(
+        self, cursor: int, state: State, band: Band | None, err: str
+    ) -> None:
         # draw traffic
-        state.traffic.rx, state.traffic.tx, err = self.get_traffic()
         if err:
             y = self.make_net_y(0) - config.TEXT_SCALING * 10
             self.gfx.set_cursor(00, y)
@@ -147,74 +205,117 @@ class MonitorGraph(MonitorBase):
             return
         state.errors.discard(2)
 
-        now = datetime.datetime.now()
+        if band is not None:
+            rx_rate, tx_rate = band[2]
+            print(f'traffic: rx={rx_rate:.0f}B/s tx={tx_rate:.0f}B/s')
 
-        if (
-            state.traffic.previous_rx is not None
-            and state.traffic.previous_tx is not None
-            and state.traffic.last_time is not None
-        ):
-            rx_delta = state.traffic.rx - state.traffic.previous_rx
-            tx_delta = state.traffic.tx - state.traffic.previous_tx
-
-            secs = (now - state.traffic.last_time).total_seconds()
-
-            print(f'traffic: rx={rx_delta} tx={tx_delta} interval={secs}s')
-
-            # rx_scaled = min(int(rx_delta/TRAFFIC_SCALING * 100/secs), 100)
-            # tx_scaled = min(int(tx_delta/TRAFFIC_SCALING * 100/secs), 100)
-            # self.draw_traffic(cursor, state.traffic, rx_scaled, tx_scaled)
-            k = 1.0 / TRAFFIC_SCALING * 100.0 / secs
-            rx_scaled = max(min(int(rx_delta * k), 100), 0)
-            tx_scaled = max(min(int(tx_delta * k), 100), 0)
-            self.draw_traffic(cursor, state.traffic, rx_scaled, tx_scaled)
+            lows, highs, (rx_scaled, tx_scaled) = (self.scale_traffic(v) for v in band)
+            self.draw_traffic(cursor, state.traffic, lows, highs, rx_scaled, tx_scaled)
 
             state.traffic.previous_rx_scaled = rx_scaled
             state.traffic.previous_tx_scaled = tx_scaled
 
-        state.traffic.previous_rx = state.traffic.rx
-        state.traffic.previous_tx = state.traffic.tx
-        state.traffic.last_time = now
+    def scale_cpus(self, pcents: Floats) -> list[int]:
+        k = 100.0 / self.cpu_scale.scale
+        return [max(min(int(p * k + 0.5), 100), 0) for p in pcents]
+
+    def scale_traffic(self, rates: Floats) -> list[int]:
+        k = 100.0 / self.net_scale.scale
+        return [max(min(int(r * k), 100), 0) for r in rates]
 
     def _run(self) -> bool:
-        escaper = TimeEscaper(self)
-        cursor = 0
-        state = State()
+        self.escaper = TimeEscaper(self)
+        self.sampler = Sampler.get(config.MONITOR_SSH_AUTHORITY)
+        self.seq = 0  # of the latest sample seen
+        self.cpu_scale = AutoScale(CPU_MIN_SCALE, 100.0)
+        self.net_scale = AutoScale(TRAFFIC_MIN_SCALE)
+        self.redraw = True
+        self.clear_pending = False
 
         self.gfx.set_auto_read_buttons_on()
 
-        while True:
-            btns = self.board.auto_read_buttons()
-            if 'R' in btns:
-                return True
-            if btns:
-                return False
-            if escaper.check():
-                return False
-
-            self.erase_marker(state)
-
-            errs: set[int] = set()
-            errs |= state.errors
-            self.handle_cpus(cursor, state)
-            self.handle_traffic(cursor, state)
-            errs_changed = errs != state.errors
-
-            # draw labels
-            self.draw_labels(state)
-            state.last_cpus_ttl = state.cpus_ttl
-
-            # draw axis and current time
-            self.draw_axis_and_marker(cursor, state)
-
-            # display
-            self.gfx.display()
-            if errs_changed:
-                self.gfx.clear()
+        fps = 1 / config.MONITOR_GRAPH_INTERVAL
+        return FrameScheduler[bool](self.gfx, fps=fps).run(lambda: None, self.render)
+
+    def render(self, _alpha: float) -> bool | None:
+        btns = self.board.auto_read_buttons()
+        if 'R' in btns:
+            return True
+        if btns:
+            return False
+        if self.escaper.check():
+            return False
+
+        # the first time, all the history warms the scales up
+        snap = self.sampler.snapshot()
+        new = np.arange(len(snap) - min(snap.seq - self.seq, len(snap)), len(snap))
+        rescaled = [self.update_scales(snap, i) for i in new]
+        self.seq = snap.seq
+
+        if self.redraw or any(rescaled):
+            self.replay(snap)
+            self.redraw = False
+        elif len(new):
+            self.draw_column(decimate(snap, new), snap.errors)
+        return None
+
+    def update_scales(self, snap: Snapshot, i: int) -> bool:
+        changed = False
+        cpu, net = snap.cpu[i], (snap.rx[i], snap.tx[i])
+        if len(cpu) and not np.isnan(cpu).any():
+            changed |= self.cpu_scale.update(snap.t[i], cpu.max())
+        if not np.isnan(net).any():
+            changed |= self.net_scale.update(snap.t[i], max(net))
+        return changed
+
+    def replay(self, snap: Snapshot) -> None:
+        """Repaint from scratch the history that fits on screen, the samples
+        bucketed by time into pixel columns."""
+        self.gfx.clear()
+        self.clear_pending = False
+        self.cursor = 0
+        self.state = State()
+        if not len(snap):
+            return
 
-            cursor += DX
-            if cursor + DX >= config.WIDTH:
-                cursor = 0
+        # a column lasts a frame, or a sample when they come slower
+        period = max(config.MONITOR_GRAPH_INTERVAL, config.MONITOR_SAMPLE_INTERVAL)
+        columns = (config.WIDTH - 1) // DX
+        age = np.floor((snap.t[-1] - snap.t) / period + 1e-6).astype(int)
+        index = columns - 1 - age  # the latest sample in the last column
+        for c in range(max(index.min(), 0), columns):
+            rows = np.flatnonzero(index == c)
+            self.draw_column(
+                decimate(snap, rows), snap.errors if c == columns - 1 else {}
+            )
+
+    def draw_column(self, column: Column, errors: dict[str, str]) -> None:
+        """Draw a column at the cursor; errors are of the latest sample."""
+        cursor, state = self.cursor, self.state
+        if self.clear_pending:
+            self.gfx.clear()
+            self.clear_pending = False
+
+        self.erase_marker(state)
+
+        errs: set[int] = set()
+        errs |= state.errors
+        err = '</proc/stat error>' if 'cpu' in errors else ''
+        self.handle_cpus(cursor, state, column.cpu, err)
+        err = '</proc/net/dev error>' if 'net' in errors else ''
+        self.handle_traffic(cursor, state, column.net, err)
+        self.clear_pending = errs != state.errors
+
+        # draw labels
+        self.draw_labels(state)
+        state.last_cpus_ttl = state.cpus_ttl
+
+        # draw axis and current time
+        self.draw_axis_and_marker(cursor, state)
+
+        self.cursor += DX
+        if self.cursor + DX >= config.WIDTH:
+            self.cursor = 0
 
     def erase_marker(self, state: State) -> None:
         # erase prev marker
@@ -249,7 +350,13 @@ class MonitorGraph(MonitorBase):
             state.last_bar_x = None
 
     def draw_traffic(
-        self, cursor: int, traffic: Traffic, rx_scaled: int, tx_scaled: int
+        self,
+        cursor: int,
+        traffic: Traffic,
+        lows: list[int],
+        highs: list[int],
+        rx_scaled: int,
+        tx_scaled: int,
     ) -> None:
         x0 = cursor
         x1 = cursor + DX
@@ -259,12 +366,20 @@ class MonitorGraph(MonitorBase):
         y1 = self.make_net_y(rx_scaled)
         self.gfx.set_fg_color(*COLOR_RX)
         self.gfx.draw_line(x0, y0, x1, y1, 1)
+        if highs[0] > lows[0]:
+            self.gfx.draw_line(
+                x1, self.make_net_y(lows[0]), x1, self.make_net_y(highs[0]), 1
+            )
 
         # tx
         y0 = self.make_net_y(traffic.previous_tx_scaled)
         y1 = self.make_net_y(tx_scaled)
         self.gfx.set_fg_color(*COLOR_TX)
         self.gfx.draw_line(x0, y0, x1, y1, 1)
+        if highs[1] > lows[1]:
+            self.gfx.draw_line(
+                x1, self.make_net_y(lows[1]), x1, self.make_net_y(highs[1]), 1
+            )
 
     def draw_labels(self, state: State) -> None:
         self.gfx.set_text_size(1, 1)
@@ -293,6 +408,7 @@ class MonitorGraph(MonitorBase):
         self.gfx.set_cursor(0, y + dy)
         self.gfx.print(cpus_label)
         self.gfx.print(f'{state.cpus_ttl}%')
+        self.draw_scale(f'{self.cpu_scale.scale:g}%', y + dy)
 
         # Net
         y = self.make_net_y(0)
@@ -310,6 +426,13 @@ class MonitorGraph(MonitorBase):
         self.gfx.print(' -')
         self.gfx.set_text_color(*COLOR_LABELS)
         self.gfx.print('rx')
+        self.draw_scale(format_rate(self.net_scale.scale), y + dy)
+
+    def draw_scale(self, label: str, y: int) -> None:
+        # full scale, right-aligned; changing it repaints all, so no erasing
+        w, _ = self.get_text_size(label)
+        self.gfx.set_cursor(config.WIDTH - w, y)
+        self.gfx.print(label)
 
     def make_cpu_y(self, pcent: int) -> int:
         h = (config.HEIGHT - Y_SPACING) / 2 - Y_MARGIN
@@ -318,26 +441,3 @@ class MonitorGraph(MonitorBase):
     def make_net_y(self, pcent: int) -> int:
         h = (config.HEIGHT - Y_SPACING) / 2 - Y_MARGIN
         return int(h * (2 - pcent / 100.0) + 0.5) + Y_MARGIN + Y_SPACING - 1
-
-    def get_cpus_pcents(self) -> tuple[list[int], str]:
-        try:
-            # interval = config.MONITOR_CPU_INTERVAL
-            interval = 1
-            out = self.shell_command((f'mpstat -P ALL {interval} 1 -o JSON').split())
-            data = json.loads(out)
-            loads = data['sysstat']['hosts'][0]['statistics'][0]['cpu-load']
-            cpus = [entry for entry in loads if entry['cpu'] not in ('all', '-1')]
-            pcents = [int(c['usr'] + 0.5) for c in cpus]
-            pcents = sorted(pcents)
-        except Exception:
-            return [], '<mpstat error>'
-        return pcents, ''
-
-    def get_traffic(self) -> tuple[int, int, str]:
-        try:
-            out = self.shell_command(['netstat', '-e', '-n', '-i'])
-            rx = sum([int(m) for m in RX_REGEX.findall(out)])
-            tx = sum([int(m) for m in TX_REGEX.findall(out)])
-            return rx, tx, ''
-        except Exception:
-            return 0, 0, '<netstat error>'
@@ -1,16 +1,36 @@
+import functools
+import math
 import socket
 import subprocess
 
 from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.app import App, TimeEscaper
+from arduino_esp32_tft_terminal.app.widgets import TextGrid
+from arduino_esp32_tft_terminal.lib import metrics
 from arduino_esp32_tft_terminal.lib.board import Board
+from arduino_esp32_tft_terminal.lib.sampler import Sampler, Snapshot
 
 CHOICE_EXIT = 1
 CHOICE_NEXT = 2
 CHOICE_RESET = 3
 
+COLOR_PANE = 128, 128, 128
+
 
 class MonitorBase(App):
+    def __init__(self, board: Board, auto_read: bool = False) -> None:
+        super().__init__(board, auto_read=auto_read)
+
+    @functools.cached_property
+    def reader(self) -> metrics.Reader:
+        # on first use: a monitor of other hosts (MonitorRack) must not open
+        # a session to MONITOR_SSH_AUTHORITY
+        return metrics.host_reader()
+
+    def init(self) -> None:
+        super().init()
+        self.redraw = True  # (re)started board: repaint the whole screen
+
     def show_header(
         self, title: str, menu: str | None = None, with_banner: bool = False
     ) -> None:
@@ -21,19 +41,23 @@ class MonitorBase(App):
 
     def set_pane_text_attr(self) -> None:
         self.gfx.set_text_size(1, 1)
-        self.gfx.set_text_color(128, 128, 128)
+        self.gfx.set_text_color(*COLOR_PANE)
 
-    def get_mem(self) -> list[str]:
-        try:
-            out = self.shell_command(['free', '--giga'])
-            stats = out.splitlines()[1].split()[1:]
+    def make_grid(self, y: int, rows: int | None = None) -> TextGrid:
+        # full-width pane text from y down, or `rows` lines
+        cw, ch = self.get_text_size('9')
+        rows = rows or (config.HEIGHT - y) // ch
+        return TextGrid(self.gfx, 0, y, rows, config.WIDTH // cw, cw, ch)
 
-            cols = 'Ttl Usd Fre Sha Buf Avg'.split()
-            head = '  ' + ''.join([f'{s:3}' for s in cols])
-            vals = '   ' + ' '.join([f'{int(v):2}' for v in stats])
-            return [head, vals]
-        except Exception:
+    def get_mem(self, snap: Snapshot) -> list[str]:
+        if not len(snap) or math.isnan(snap.mem[-1][0]):
             return ['mem unavailable']
+        stats = [int(v) // 10**9 for v in snap.mem[-1]]  # as `free --giga`
+
+        cols = 'Ttl Usd Fre Sha Buf Avg'.split()
+        head = '  ' + ''.join([f'{s:3}' for s in cols])
+        vals = '   ' + ' '.join([f'{v:2}' for v in stats])
+        return [head, vals]
 
     def shell_command(
         self, cmd: list[str], force_local: bool = False, check: bool = True
@@ -61,8 +85,13 @@ class MonitorHost(MonitorBase):
     def _run(self) -> bool:
         title = 'Host'
         escaper = TimeEscaper(self)
+        sampler = Sampler.get(config.MONITOR_SSH_AUTHORITY)
+        self.redraw = True
         while True:
-            self.show_header(title)
+            if self.redraw:
+                self.show_header(title)
+                grid = self.make_grid(self.get_text_size('9')[1])
+                self.redraw = False
 
             nb_users = self.get_nb_users()
             users = f'{nb_users or "???"} user' + ('' if nb_users == 1 else 's')
@@ -73,11 +102,9 @@ class MonitorHost(MonitorBase):
                 users,
                 date,
                 self.get_uptime(),
-            ] + self.get_mem()
+            ] + self.get_mem(sampler.snapshot())
 
-            for ln in lines:
-                ln = self.shorten(ln)
-                self.gfx.print(f'{ln}\\n')
+            grid.set_lines([self.shorten(ln) for ln in lines], COLOR_PANE)
             self.gfx.display()
 
             btns = self.board.wait_button(2)
@@ -90,7 +117,7 @@ class MonitorHost(MonitorBase):
 
     def get_hostname(self) -> str:
         try:
-            return self.shell_command(['hostname'])
+            return metrics.hostname(self.reader)
         except Exception:
             return '<hostname unavail>'
 
@@ -118,21 +145,19 @@ class MonitorHost(MonitorBase):
 
     def get_nb_users(self) -> int | None:
         try:
-            out = self.shell_command(['who'])
-            return len(out.splitlines())
+            return metrics.nb_users(self.reader)
         except Exception:
             return None
 
     def get_date(self) -> str:
         try:
-            out = self.shell_command(['date', '--rfc-3339=seconds'])
-            return out.split('+')[0]
+            return metrics.now(self.reader).strftime('%Y-%m-%d %H:%M:%S')
         except Exception:
             return '<date unavail>'
 
     def get_uptime(self) -> str:
         try:
-            uptime = self.shell_command(['uptime', '-p'])
+            uptime = metrics.format_uptime(metrics.uptime(self.reader))
         except Exception:
             return '<uptime unavail>'
         for unit in 'hour', 'minute', 'day', 'week', 'month', 'year':
@@ -140,15 +165,3 @@ class MonitorHost(MonitorBase):
             what = ' ' + unit
             uptime = uptime.replace(what + 's', initial).replace(what, initial)
         return uptime
-
-    def get_mem(self) -> list[str]:
-        try:
-            out = self.shell_command(['free', '--giga'])
-            stats = out.splitlines()[1].split()[1:]
-
-            cols = 'Ttl Usd Fre Sha Buf Avg'.split()
-            head = '  ' + ''.join([f'{s:3}' for s in cols])
-            vals = '   ' + ' '.join([f'{int(v):2}' for v in stats])
-            return [head, vals]
-        except Exception:
-            return ['mem unavailable']
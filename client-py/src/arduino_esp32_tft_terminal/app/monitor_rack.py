@@ -0,0 +1,168 @@
+"""Rack Monitor App
+
+One row per host of MONITOR_RACK_HOSTS: name, CPU and memory use, and a
+sparkline of the network traffic. Every host has its own shared `Sampler`
+thread, so they are all collected concurrently, and a slow or unreachable
+host only turns its own row stale (its latest sample ages beyond the remote
+session timeout) while the others keep refreshing. Rows are repainted field
+by field, and only what changed.
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.app import TimeEscaper
+from arduino_esp32_tft_terminal.app.monitor_host import MonitorBase
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
+from arduino_esp32_tft_terminal.lib.board import Board
+from arduino_esp32_tft_terminal.lib.sampler import Floats, Sampler, Snapshot
+
+NAME_CHARS = 8
+COLOR_NAME = 255, 255, 255
+COLOR_VALUES = 128, 128, 128
+COLOR_STALE = 255, 64, 64
+COLOR_SPARK = 64, 64, 255
+
+
+def parse_hosts(hosts: str) -> list[str]:
+    """Comma-separated ssh authorities; an empty entry is this host."""
+    return [h.strip() for h in hosts.split(',')] if hosts.strip() else ['']
+
+
+def host_label(authority: str) -> str:
+    return (authority.split('@')[-1] or 'local')[:NAME_CHARS]
+
+
+@dataclass
+class Summary:
+    cpu: int  # % averaged over the CPUs
+    mem: int  # % used
+    traffic: Floats  # rx + tx bytes/s, oldest first
+
+
+def summarize(snap: Snapshot, now: float, max_age: float) -> Summary | None:
+    """What a row shows of a host, or None if its data is stale."""
+    if not len(snap) or now - snap.t[-1] > max_age or snap.errors:
+        return None
+    total, used = snap.mem[-1][:2]
+    return Summary(
+        int(snap.cpu[-1].mean() + 0.5) if snap.cpu.shape[1] else 0,
+        int(100 * used / total + 0.5) if total else 0,
+        np.nan_to_num(snap.rx + snap.tx),
+    )
+
+
+def sparkline(values: Floats, x: int, y: int, w: int, h: int) -> NDArray[np.int_]:
+    """Segments plotting the last w values in the box (x, y, w, h), scaled to
+    their max, one pixel column per value."""
+    values = values[-w:]
+    if len(values) < 2:
+        return np.zeros((0, 4), dtype=int)
+    peak = values.max() or 1.0
+    xs = x + w - len(values) + np.arange(len(values))
+    ys = (y + h - 1 - values / peak * (h - 1) + 0.5).astype(int)
+    return np.stack((xs[:-1], ys[:-1], xs[1:], ys[1:]), axis=1)
+
+
+class Row:
+    def __init__(self, authority: str, y: int, h: int) -> None:
+        self.authority = authority
+        self.sampler = Sampler.get(authority)
+        self.y = y
+        self.h = h
+        self.seq = 0  # of the sparkline drawn, 0 if none
+        self.fields: dict[str, str] = {}  # texts on screen, by field
+
+
+class MonitorRack(MonitorBase):
+    def __init__(self, board: Board):
+        super().__init__(board, auto_read=True)
+        self.set_pane_text_attr()
+        self.cw, self.ch = self.gfx.get_text_bounds(0, 0, '9')
+
+    def _run(self) -> bool:
+        self.escaper = TimeEscaper(self)
+        self.gfx.set_auto_read_buttons_on()
+        self.max_age = config.MONITOR_SAMPLE_INTERVAL * 3 + config.SERIAL_TIMEOUT
+        self.redraw = True
+
+        fps = 1 / config.MONITOR_SAMPLE_INTERVAL
+        return FrameScheduler[bool](self.gfx, fps=fps).run(lambda: None, self.render)
+
+    def render(self, _alpha: float) -> bool | None:
+        btns = self.board.auto_read_buttons()
+        if 'R' in btns:
+            return True
+        if btns:
+            return False
+        if self.escaper.check():
+            return False
+
+        if self.redraw:
+            self.layout()
+            self.redraw = False
+
+        now = time.monotonic()
+        for row in self.rows:
+            self.draw_row(row, now)
+        return None
+
+    def layout(self) -> None:
+        self.show_header('Rack')
+        top = config.TEXT_SCALING * 8 + 2
+        hosts = parse_hosts(config.MONITOR_RACK_HOSTS)
+        h = max((config.HEIGHT - top) // len(hosts), self.ch + 2)
+        self.rows = [Row(a, top + i * h, h) for i, a in enumerate(hosts)]
+        self.rows = [r for r in self.rows if r.y + self.ch <= config.HEIGHT]
+
+        # columns: name, cpu%, mem%, then the sparkline
+        self.x_cpu = self.cw * (NAME_CHARS + 1)
+        self.x_mem = self.x_cpu + self.cw * 5
+        self.x_spark = self.x_mem + self.cw * 5
+        for row in self.rows:
+            self.draw_field(row, 'name', 0, host_label(row.authority), COLOR_NAME)
+
+    def draw_row(self, row: Row, now: float) -> None:
+        snap = row.sampler.snapshot()
+        summary = summarize(snap, now, self.max_age)
+        if summary is None:
+            self.draw_field(row, 'cpu', self.x_cpu, 'stale', COLOR_STALE)
+            self.draw_field(row, 'mem', self.x_mem, '', COLOR_VALUES)
+            if row.seq:
+                self.clear_spark(row)
+                row.seq = 0
+            return
+
+        self.draw_field(row, 'cpu', self.x_cpu, f'{summary.cpu:3}%', COLOR_VALUES)
+        self.draw_field(row, 'mem', self.x_mem, f'{summary.mem:3}%', COLOR_VALUES)
+        if row.seq == snap.seq:
+            return
+        row.seq = snap.seq
+
+        w = config.WIDTH - self.x_spark
+        self.clear_spark(row)
+        self.gfx.set_fg_color(*COLOR_SPARK)
+        segments = sparkline(summary.traffic, self.x_spark, row.y, w, row.h - 2)
+        self.gfx.draw_lines(segments, 1)
+
+    def draw_field(
+        self, row: Row, name: str, x: int, text: str, rgb: tuple[int, int, int]
+    ) -> None:
+        if row.fields.get(name) == text:
+            return
+        old = row.fields.get(name, '')
+        if old:
+            self.gfx.fill_rect(x, row.y, self.cw * len(old), self.ch, 0)
+        if text:
+            self.gfx.set_text_color(*rgb)
+            self.gfx.set_cursor(x, row.y)
+            self.gfx.print(text)
+        row.fields[name] = text
+
+    def clear_spark(self, row: Row) -> None:
+        w = config.WIDTH - self.x_spark
+        self.gfx.fill_rect(self.x_spark, row.y, w, row.h - 1, 0)
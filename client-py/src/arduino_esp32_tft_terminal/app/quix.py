@@ -2,6 +2,7 @@ import random
 from dataclasses import dataclass
 
 from arduino_esp32_tft_terminal.app import App, Bouncer, TimeEscaper
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
 from arduino_esp32_tft_terminal.lib.board import Board
 
 NB_LINES = 9
@@ -54,55 +55,67 @@ class Quix(App):
         super().__init__(board, auto_read=True)
 
     def _run(self) -> bool:
-        p1 = Bouncer(2, -1, -1)
-        p2 = Bouncer(2, +1, +1)
-        p3 = Bouncer(3, +1, -1)
+        self.p1 = Bouncer(2, -1, -1)
+        self.p2 = Bouncer(2, +1, +1)
+        self.p3 = Bouncer(3, +1, -1)
 
-        rgb = Color(
+        self.rgb = Color(
             ColorComponent(128, +15, 25, 64, 255),
             ColorComponent(128, -15, 25, 64, 255),
             ColorComponent(128, +25, 25, 64, 255),
         )
-
-        history: list[Segment | None] = [None] * NB_LINES
-        i = 0
-
-        escaper = TimeEscaper(self)
-        while True:
-            btns = self.board.auto_read_buttons()
-            if 'R' in btns:
-                return True
-            if btns:
-                return False
-            if escaper.check():
-                return False
-
-            p1.advance()
-            p2.advance()
-            p3.advance()
-            history[i] = Segment(p1.x, p1.y, p2.x, p2.y, p3.x, p3.y)
-
-            # erase
-            i = (i + 1) % NB_LINES
-            last = history[i]
-            if last is not None:
-                self.gfx.draw_triangle(
-                    last.ax, last.ay, last.bx, last.by, last.cx, last.cy, 0
-                )
-
-            # color
-            r, g, b = rgb.advance()
-            self.gfx.set_fg_color(r, g, b)
-
-            # draw
-            if REDRAW:
-                for j in range(NB_LINES - 1):
-                    last = history[(i - 1 - j) % NB_LINES]
-                    if last:
-                        self.gfx.draw_triangle(
-                            last.ax, last.ay, last.bx, last.by, last.cx, last.cy, 1
-                        )
-            else:
-                self.gfx.draw_triangle(p1.x, p1.y, p2.x, p2.y, p3.x, p3.y, 1)
-
-            self.gfx.display()
+        self.color = 128, 128, 128
+
+        self.history: list[Segment | None] = [None] * NB_LINES
+        self.i = 0
+        self.to_erase: list[Segment] = []
+
+        self.escaper = TimeEscaper(self)
+        return FrameScheduler[bool](self.gfx).run(self.update, self.render)
+
+    def update(self) -> None:
+        p1, p2, p3 = self.p1, self.p2, self.p3
+        p1.advance()
+        p2.advance()
+        p3.advance()
+        self.history[self.i] = Segment(p1.x, p1.y, p2.x, p2.y, p3.x, p3.y)
+
+        # oldest falls off; queued, as several steps may run per frame
+        self.i = (self.i + 1) % NB_LINES
+        last = self.history[self.i]
+        if last is not None:
+            self.to_erase.append(last)
+
+        self.color = self.rgb.advance()
+
+    def render(self, _alpha: float) -> bool | None:
+        btns = self.board.auto_read_buttons()
+        if 'R' in btns:
+            return True
+        if btns:
+            return False
+        if self.escaper.check():
+            return False
+
+        # erase
+        for last in self.to_erase:
+            self.gfx.draw_triangle(
+                last.ax, last.ay, last.bx, last.by, last.cx, last.cy, 0
+            )
+        self.to_erase = []
+
+        # color
+        self.gfx.set_fg_color(*self.color)
+
+        # draw
+        if REDRAW:
+            for j in range(NB_LINES - 1):
+                last = self.history[(self.i - 1 - j) % NB_LINES]
+                if last:
+                    self.gfx.draw_triangle(
+                        last.ax, last.ay, last.bx, last.by, last.cx, last.cy, 1
+                    )
+        else:
+            p1, p2, p3 = self.p1, self.p2, self.p3
+            self.gfx.draw_triangle(p1.x, p1.y, p2.x, p2.y, p3.x, p3.y, 1)
+        return None
@@ -0,0 +1,97 @@
+"""Fixed-timestep frame scheduler shared by the animated apps.
+
+The simulation advances in fixed steps of `1 / fps` seconds whatever the link
+speed: wall time (monotonic clock) feeds an accumulator, `update` runs once per
+elapsed step, then `render` draws one frame, which the scheduler displays.
+
+- Fast link: the loop sleeps until the next frame deadline (target FPS).
+- Slow link: several updates run before the next render, i.e. frames are
+  skipped but motion keeps its speed; past `max_skip` updates, or a frame
+  period of update CPU time, the backlog is dropped.
+
+Both callbacks return `None` to keep going; any other value ends the loop and
+is returned (an app's `_run` result, or an app-specific exit code).
+"""
+
+import time
+from typing import Callable, Generic, TypeVar
+
+from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.lib.gfx import Gfx
+
+T = TypeVar('T')
+
+
+class FrameScheduler(Generic[T]):
+    def __init__(
+        self,
+        gfx: Gfx,
+        fps: float | None = None,
+        max_skip: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.gfx = gfx
+        self.fps = fps or config.APPS_TARGET_FPS
+        self.step = 1.0 / self.fps
+        self.slack = self.step / 100  # a deadline wake-up is worth a step
+        self.max_skip = config.APPS_MAX_FRAME_SKIP if max_skip is None else max_skip
+        self.clock = clock
+        self.sleep = sleep
+        self.frames = 0  # rendered
+        self.updates = 0  # simulated
+        self.skipped = 0  # simulated but never rendered
+        self._resync = True
+
+    def resync(self) -> None:
+        """Restart the time base, e.g. after a blocking animation or a pause,
+        so the time spent there is not caught up with a burst of updates."""
+        self._resync = True
+
+    def run(
+        self,
+        update: Callable[[], T | None],
+        render: Callable[[float], T | None],
+    ) -> T:
+        acc = 0.0
+        last = deadline = self.clock()
+        while True:
+            now = self.clock()
+            if self._resync:
+                self._resync = False
+                acc = 0.0
+                last = deadline = now
+            acc += now - last
+            last = now
+
+            # simulate: one update per elapsed step, bounded both in count
+            # and in CPU time, lest a costly update feed its own backlog
+            n = 0
+            while acc + self.slack >= self.step and n <= self.max_skip:
+                if n and self.clock() - now >= self.step:
+                    break
+                res = update()
+                if res is not None:
+                    return res
+                acc -= self.step
+                n += 1
+            if acc >= self.step:  # hopelessly behind: drop the backlog
+                acc %= self.step
+            acc = max(acc, 0.0)
+            self.updates += n
+            self.skipped += max(n - 1, 0)
+
+            # render, interpolated by the unsimulated fraction of a step
+            res = render(acc / self.step)
+            if res is not None:
+                return res
+            self.gfx.display(pace=False)
+            self.frames += 1
+
+            # pace: sleep until the next deadline, never chase missed ones
+            deadline += self.step
+            now = self.clock()
+            if deadline > now:
+                self.sleep(deadline - now)
+            else:
+                deadline = now
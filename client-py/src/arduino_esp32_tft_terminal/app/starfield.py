@@ -1,71 +1,74 @@
-import random
+import numpy as np
+from numpy.typing import NDArray
 
 from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.app import App, TimeEscaper
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
 from arduino_esp32_tft_terminal.lib.board import Board
 
 K = 0.75
 
 
-class Star:
-    def __init__(self) -> None:
-        self.reset(0)
+class Stars:
+    """All stars as arrays: direction (vx, vy), speed k, and birth step t0.
+    A star's distance from the center grows as k ** (t - t0)."""
 
-    def reset(self, t: int) -> None:
-        self.vx = random.random() - 0.5
-        self.vy = random.random() - 0.5
-        self.t0 = t
-        self.k = (random.random() + 1.75) * K
+    def __init__(self, nb: int) -> None:
+        self.vx = np.zeros(nb)
+        self.vy = np.zeros(nb)
+        self.k = np.zeros(nb)
+        self.t0 = np.zeros(nb, dtype=int)
+        self.reset(np.ones(nb, dtype=bool), 0)
 
-    def compute(self, t: int, check: bool = False) -> tuple[int, int] | None:
-        dt = float(t - self.t0)
-        x = int(self.vx * self.k**dt + 0.5 + config.WIDTH / 2)
-        y = int(self.vy * self.k**dt + 0.5 + config.HEIGHT / 2)
-        if check:
-            if x > config.WIDTH or x < 0 or y > config.HEIGHT or y < 0:
-                return None
+    def reset(self, mask: NDArray[np.bool_], t: int) -> None:
+        n = int(mask.sum())
+        self.vx[mask] = np.random.random(n) - 0.5
+        self.vy[mask] = np.random.random(n) - 0.5
+        self.t0[mask] = t
+        self.k[mask] = (np.random.random(n) + 1.75) * K
+
+    def compute(self, t: int) -> tuple[NDArray[np.int_], NDArray[np.int_]]:
+        f = self.k ** (t - self.t0)
+        x = (self.vx * f + 0.5 + config.WIDTH / 2).astype(int)
+        y = (self.vy * f + 0.5 + config.HEIGHT / 2).astype(int)
         return x, y
 
+    def out(self, t: int) -> NDArray[np.bool_]:
+        x, y = self.compute(t)
+        return (x > config.WIDTH) | (x < 0) | (y > config.HEIGHT) | (y < 0)
 
-class Starfield(App):
-    NB_STARS = 6 * 3
 
+class Starfield(App):
     def __init__(self, board: Board):
         super().__init__(board, auto_read=True)
 
     def _run(self) -> bool:
-        stars = [Star() for i in range(self.NB_STARS)]
-        t = 0
-        escaper = TimeEscaper(self)
-        while True:
-            btns = self.board.auto_read_buttons()
-            if 'R' in btns:
-                return True
-            if btns:
-                return False
-            if escaper.check():
-                return False
+        self.stars = Stars(config.APP_STARFIELD_NB_STARS)
+        self.t = 0
+        self.drawn: NDArray[np.int_] | None = None
+        self.escaper = TimeEscaper(self)
+        return FrameScheduler[bool](self.gfx).run(self.update, self.render)
 
-            # erase
-            for star in stars:
-                pair0 = star.compute(t)
-                pair1 = star.compute(t + 1)
-                if pair0 and pair1:
-                    x0, y0 = pair0
-                    x1, y1 = pair1
-                    self.gfx.draw_line(x0, y0, x1, y1, 0)
+    def update(self) -> None:
+        self.t += 1
+        self.stars.reset(self.stars.out(self.t + 1), self.t)
 
-            # draw
-            for star in stars:
-                pair0 = star.compute(t + 1, True)
-                pair1 = star.compute(t + 2)
+    def render(self, _alpha: float) -> bool | None:
+        btns = self.board.auto_read_buttons()
+        if 'R' in btns:
+            return True
+        if btns:
+            return False
+        if self.escaper.check():
+            return False
 
-                if pair0 and pair1:
-                    x0, y0 = pair0
-                    x1, y1 = pair1
-                    self.gfx.draw_line(x0, y0, x1, y1, 1)
-                else:
-                    star.reset(t)
+        # erase what the previous frame drew, whatever the steps since
+        if self.drawn is not None:
+            self.gfx.draw_lines(self.drawn, 0)
 
-            self.gfx.display()
-            t += 1
+        # draw
+        x0, y0 = self.stars.compute(self.t + 1)
+        x1, y1 = self.stars.compute(self.t + 2)
+        self.drawn = np.stack((x0, y0, x1, y1), axis=1)
+        self.gfx.draw_lines(self.drawn, 1)
+        return None
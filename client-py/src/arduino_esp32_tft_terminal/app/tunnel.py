@@ -1,12 +1,42 @@
+import functools
 import math
 
+import numpy as np
+from numpy.typing import NDArray
+
 from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.app import App, TimeEscaper
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
 from arduino_esp32_tft_terminal.lib.board import Board
 
 K = 0.65
 NB = 12
-NB2 = 6
+PERIOD = NB * 26  # steps; a multiple of NB, close to the former sin(t/100)²
+
+
+@functools.lru_cache
+def frame_table(width: int, height: int, outline: bool) -> NDArray[np.int_]:
+    """Segments of the rectangle at every step of the period, as a
+    (PERIOD, edges, 4) array of `x0 y0 x1 y1`; 2 edges, or 4 if `outline`.
+
+    At step t the rectangle has size index t mod NB (zooming in), and is
+    rotated by sin(pi t / PERIOD)², so the whole animation loops on PERIOD."""
+    t = np.arange(PERIOD)
+    k = K ** (NB - 1 - t % NB) * 2
+    w = (width * k).astype(int) / 2
+    h = (height * k).astype(int) / 2
+    a = np.sin(math.pi * t / PERIOD) ** 2
+    cos, sin = np.cos(a), np.sin(a)
+
+    corners = np.array(
+        [
+            (width / 2 + cos * x - sin * y, height / 2 + sin * x + cos * y)
+            for x, y in ((w, h), (w, -h), (-w, -h), (-w, h))
+        ]
+    ).astype(int)  # (4, 2, PERIOD)
+    edges = ((0, 1), (1, 2), (2, 3), (3, 0)) if outline else ((1, 2), (3, 0))
+    segments = np.array([np.concatenate((corners[a], corners[b])) for a, b in edges])
+    return segments.transpose(2, 0, 1)
 
 
 class Tunnel(App):
@@ -14,89 +44,31 @@ class Tunnel(App):
         super().__init__(board, auto_read=True)
 
     def _run(self) -> bool:
-        escaper = TimeEscaper(self)
-
-        i = 0
-        while True:
-            btns = self.board.auto_read_buttons()
-            if 'R' in btns:
-                return True
-            if btns:
-                return False
-            if escaper.check():
-                return False
-
-            j = i
-            w, h = self.make(j)
-            x0, y0, x1, y1, x2, y2, x3, y3 = self.compute(w, h, j)
-            self.draw(x0, y0, x1, y1, x2, y2, x3, y3, 0)
-
-            j = i + NB2
-            w, h = self.make(j)
-            x0, y0, x1, y1, x2, y2, x3, y3 = self.compute(w, h, j)
-            self.draw(x0, y0, x1, y1, x2, y2, x3, y3, 0)
-
-            j = i + 1
-            w, h = self.make(j)
-            x0, y0, x1, y1, x2, y2, x3, y3 = self.compute(w, h, j)
-            self.draw(x0, y0, x1, y1, x2, y2, x3, y3, 1)
-
-            j = i + 1 + NB2
-            w, h = self.make(j)
-            x0, y0, x1, y1, x2, y2, x3, y3 = self.compute(w, h, j)
-            self.draw(x0, y0, x1, y1, x2, y2, x3, y3, 1)
-
-            self.gfx.display()
-            i += 1
-
-    def make(self, i: int) -> tuple[int, int]:
-        i = NB - 1 - (i % NB)
-        w = int(config.WIDTH * K**i * 2)
-        h = int(config.HEIGHT * K**i * 2)
-        return w, h
-
-    def compute(
-        self, w: int, h: int, t: int
-    ) -> tuple[int, int, int, int, int, int, int, int]:
-        a = math.sin(t / 100)
-        a = a * a
-        cos, sin = math.cos(a), math.sin(a)
-
-        x, y = w / 2, h / 2
-        x, y = cos * x - sin * y, sin * x + cos * y
-        x0 = int(config.WIDTH / 2 + x)
-        y0 = int(config.HEIGHT / 2 + y)
-
-        x, y = w / 2, -h / 2
-        x, y = cos * x - sin * y, sin * x + cos * y
-        x1 = int(config.WIDTH / 2 + x)
-        y1 = int(config.HEIGHT / 2 + y)
-
-        x, y = -w / 2, -h / 2
-        x, y = cos * x - sin * y, sin * x + cos * y
-        x2 = int(config.WIDTH / 2 + x)
-        y2 = int(config.HEIGHT / 2 + y)
-
-        x, y = -w / 2, h / 2
-        x, y = cos * x - sin * y, sin * x + cos * y
-        x3 = int(config.WIDTH / 2 + x)
-        y3 = int(config.HEIGHT / 2 + y)
-
-        return x0, y0, x1, y1, x2, y2, x3, y3
-
-    def draw(
-        self,
-        x0: int,
-        y0: int,
-        x1: int,
-        y1: int,
-        x2: int,
-        y2: int,
-        x3: int,
-        y3: int,
-        c: int,
-    ) -> None:
-        self.gfx.draw_line(x1, y1, x2, y2, c)
-        self.gfx.draw_line(x3, y3, x0, y0, c)
-
-        # self.command(f'drawRect {0} {0} {config.WIDTH} {config.HEIGHT} 1')
+        self.escaper = TimeEscaper(self)
+        self.table = frame_table(config.WIDTH, config.HEIGHT, config.APP_TUNNEL_OUTLINE)
+        nb = config.APP_TUNNEL_RINGS
+        self.offsets = np.array([NB * r // nb for r in range(nb)])
+        self.i = 0
+        self.drawn: NDArray[np.int_] | None = None
+        return FrameScheduler[bool](self.gfx).run(self.update, self.render)
+
+    def update(self) -> None:
+        self.i = (self.i + 1) % PERIOD
+
+    def render(self, _alpha: float) -> bool | None:
+        btns = self.board.auto_read_buttons()
+        if 'R' in btns:
+            return True
+        if btns:
+            return False
+        if self.escaper.check():
+            return False
+
+        # erase the rings of the previous frame, whatever the steps since
+        if self.drawn is not None:
+            self.gfx.draw_lines(self.drawn, 0)
+
+        rows = (self.i + 1 + self.offsets) % PERIOD
+        self.drawn = self.table[rows].reshape(-1, 4)
+        self.gfx.draw_lines(self.drawn, 1)
+        return None
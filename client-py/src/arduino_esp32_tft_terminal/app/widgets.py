@@ -0,0 +1,201 @@
+"""Reusable screen widgets for the apps."""
+
+from typing import Callable, Generic, Hashable, Sequence, TypeVar
+
+import numpy as np
+
+from arduino_esp32_tft_terminal.lib.font5x7 import Mask
+from arduino_esp32_tft_terminal.lib.gfx import Gfx
+
+T = TypeVar('T')
+
+RGB = tuple[int, int, int]
+Cell = tuple[str, RGB | None]  # blank cells have no color
+UNKNOWN: Cell = ('', None)  # content not known: always repainted
+MERGE_GAP = 3  # unchanged cells cheaper to repaint than to start a new run
+Rect = tuple[int, int, int, int]  # x, y, w, h
+
+
+class TextGrid:
+    """A block of monospace text lines that remembers what each character cell
+    shows, and repaints only the runs of cells that changed: each run is
+    filled with the background, then printed. No clear, no flicker, and a
+    clock ticking costs a few bytes per refresh.
+
+    The grid assumes the current text size matches its cell size, and that
+    the screen area starts blank (e.g. just cleared); call `invalidate()`
+    when something else drew over it, e.g. after a board reboot."""
+
+    def __init__(
+        self, gfx: Gfx, x: int, y: int, rows: int, cols: int, cw: int, ch: int
+    ) -> None:
+        self.gfx = gfx
+        self.x, self.y = x, y
+        self.rows, self.cols = rows, cols
+        self.cw, self.ch = cw, ch
+        self.cells: list[list[Cell]] = [[(' ', None)] * cols for _ in range(rows)]
+        self.rgb: RGB | None = None  # text color last set by the grid
+
+    def invalidate(self) -> None:
+        self.cells = [[UNKNOWN] * self.cols for _ in range(self.rows)]
+        self.rgb = None
+
+    def set_lines(self, lines: list[str], rgb: RGB, first: int = 0) -> None:
+        """Show `lines` from row `first` on, blanking the rows after them."""
+        for row in range(first, self.rows):
+            i = row - first
+            self.set_line(row, lines[i] if i < len(lines) else '', rgb)
+
+    def set_line(self, row: int, text: str, rgb: RGB) -> None:
+        if not 0 <= row < self.rows:
+            return
+        text = text[: self.cols].ljust(self.cols)
+        new: list[Cell] = [(c, None) if c == ' ' else (c, rgb) for c in text]
+        old = self.cells[row]
+        col = 0
+        while col < self.cols:
+            if old[col] == new[col]:
+                col += 1
+                continue
+            # extend the run over short stretches of unchanged cells
+            end = last = col
+            while end < self.cols and end - last <= MERGE_GAP:
+                if old[end] != new[end]:
+                    last = end
+                end += 1
+            self.paint(row, col, text[col : last + 1], rgb)
+            col = last + 1
+        self.cells[row] = new
+
+    def paint(self, row: int, col: int, text: str, rgb: RGB) -> None:
+        x, y = self.x + col * self.cw, self.y + row * self.ch
+        self.gfx.fill_rect(x, y, len(text) * self.cw, self.ch, 0)
+        stripped = text.rstrip()
+        lead = len(stripped) - len(stripped.lstrip())
+        stripped = stripped.lstrip()
+        if not stripped:
+            return
+        if rgb != self.rgb:
+            self.gfx.set_text_color(*rgb)
+            self.rgb = rgb
+        self.gfx.set_cursor(x + lead * self.cw, y)
+        self.gfx.print(stripped.replace('\\', '\\\\'))
+
+
+class ListView(Generic[T]):
+    """A window of `rows` fixed-height slots over a sequence of items, that
+    pages by buttons or by itself. Memory and per-frame work depend on the
+    slots only, however long the list: `render()` repaints, through the app's
+    `paint(y, item)` and `clear(y)`, just the slots whose item key (e.g. its
+    state and name) differs from what the slot shows."""
+
+    def __init__(
+        self,
+        y: int,
+        row_h: int,
+        rows: int,
+        paint: Callable[[int, T], None],
+        clear: Callable[[int], None],
+        key: Callable[[T], Hashable] = lambda item: item,
+    ) -> None:
+        self.y = y
+        self.row_h = row_h
+        self.rows = max(rows, 0)
+        self.paint = paint
+        self.clear = clear
+        self.key = key
+        self.items: Sequence[T] = ()
+        self.offset = 0
+        self.shown: list[Hashable] = [None] * self.rows  # None: blank slot
+
+    @property
+    def overflows(self) -> bool:
+        return len(self.items) > self.rows
+
+    def set_items(self, items: Sequence[T]) -> None:
+        self.items = items
+        self.offset = min(self.offset, self.max_offset())
+
+    def max_offset(self) -> int:
+        return max(len(self.items) - self.rows, 0)
+
+    def page(self, delta: int) -> None:
+        """Scroll by `delta` pages, within the list."""
+        offset = self.offset + delta * self.rows
+        self.offset = min(max(offset, 0), self.max_offset())
+
+    def auto_page(self) -> None:
+        """Next page, back to the top after the last one."""
+        if self.offset >= self.max_offset():
+            self.offset = 0
+        else:
+            self.page(1)
+
+    def invalidate(self) -> None:
+        self.shown = [object()] * self.rows  # matches no key: all repainted
+
+    def render(self) -> None:
+        for slot in range(self.rows):
+            i = self.offset + slot
+            item = self.items[i] if i < len(self.items) else None
+            key = None if item is None else self.key(item)
+            if key == self.shown[slot]:
+                continue
+            y = self.y + slot * self.row_h
+            if item is None:
+                self.clear(y)
+            else:
+                self.paint(y, item)
+            self.shown[slot] = key
+
+
+def mask_rects(mask: Mask) -> list[Rect]:
+    """Cover the set pixels of `mask` with rectangles: the runs of each row,
+    stacked over the next rows as long as they repeat there."""
+    rects: list[Rect] = []
+    stacking: dict[tuple[int, int], int] = {}  # run (x0, x1) -> first row
+    for y, row in enumerate(mask.tolist() + [[]]):  # empty row: flush all
+        padded = [False, *row, False]
+        edges = [x for x in range(len(padded) - 1) if padded[x] != padded[x + 1]]
+        runs = list(zip(edges[::2], edges[1::2]))
+        for run in [run for run in stacking if run not in runs]:
+            y0 = stacking.pop(run)
+            rects.append((run[0], y0, run[1] - run[0], y - y0))
+        for run in runs:
+            stacking.setdefault(run, y)
+    return sorted(rects, key=lambda r: (r[1], r[0]))
+
+
+class Sprite:
+    """A monochrome bitmap moved around by diffing: `show()` fills only the
+    pixels that differ from what the sprite drew last, in the fg color for
+    the lit ones and the bg color for the erased ones. The protocol has no
+    bitmap command, so the diff goes out as fillRect rectangles.
+
+    Call `forget()` when something wiped the sprite, e.g. a clear."""
+
+    def __init__(self, gfx: Gfx) -> None:
+        self.gfx = gfx
+        self.drawn: tuple[Mask, int, int] | None = None
+
+    def forget(self) -> None:
+        self.drawn = None
+
+    def show(self, mask: Mask, x: int, y: int) -> None:
+        if self.drawn is None:
+            x0, y0 = x, y
+            erase, draw = np.zeros_like(mask), mask
+        else:
+            old, ox, oy = self.drawn
+            x0, y0 = min(x, ox), min(y, oy)
+            w = max(x + mask.shape[1], ox + old.shape[1]) - x0
+            h = max(y + mask.shape[0], oy + old.shape[0]) - y0
+            before = np.zeros((h, w), dtype=bool)
+            after = np.zeros((h, w), dtype=bool)
+            before[oy - y0 :, ox - x0 :][: old.shape[0], : old.shape[1]] = old
+            after[y - y0 :, x - x0 :][: mask.shape[0], : mask.shape[1]] = mask
+            erase, draw = before & ~after, after & ~before
+        for fg, pixels in ((0, erase), (1, draw)):
+            for rx, ry, rw, rh in mask_rects(pixels):
+                self.gfx.fill_rect(x0 + rx, y0 + ry, rw, rh, fg)
+        self.drawn = mask, x, y
@@ -1,36 +1,27 @@
 #!/usr/bin/env python3
 """Program communicating with Arduino running oled-server.ino."""
 
+import os
+import threading
 import time
 import traceback
-from typing import Any, Type
+from typing import TYPE_CHECKING, Any, Callable
 
 from arduino_esp32_tft_terminal import config
-from arduino_esp32_tft_terminal.app import App
-from arduino_esp32_tft_terminal.app.asteriods import Asteriods
-from arduino_esp32_tft_terminal.app.claude_mon import ClaudeMonitor
-
-# from app.bumps import Bumps
-from arduino_esp32_tft_terminal.app.collisions import CollisionsElastic
-from arduino_esp32_tft_terminal.app.collisions2 import CollisionsGravity
-from arduino_esp32_tft_terminal.app.collisions3 import BubblesSoap
-from arduino_esp32_tft_terminal.app.collisions4 import BubblesAir
-from arduino_esp32_tft_terminal.app.cube import Cube
-from arduino_esp32_tft_terminal.app.fill import Fill
-from arduino_esp32_tft_terminal.app.monitor_cpus import MonitorCpus
-from arduino_esp32_tft_terminal.app.monitor_graph import MonitorGraph
-from arduino_esp32_tft_terminal.app.monitor_host import MonitorHost
-from arduino_esp32_tft_terminal.app.quix import Quix
-from arduino_esp32_tft_terminal.app.starfield import Starfield
-from arduino_esp32_tft_terminal.app.thats_all import ThatsAll
-from arduino_esp32_tft_terminal.app.tunnel import Tunnel
 from arduino_esp32_tft_terminal.lib import ArduinoCommExceptions, RebootedException
 from arduino_esp32_tft_terminal.lib.args import get_args
-from arduino_esp32_tft_terminal.lib.board import Board
-from arduino_esp32_tft_terminal.lib.channel import Channel
+from arduino_esp32_tft_terminal.lib.channel import Channel, serial_ports
+from arduino_esp32_tft_terminal.lib.registry import THATS_ALL, AppEntry, all_apps
 
+if TYPE_CHECKING:
+    from arduino_esp32_tft_terminal.lib.board import Board
+    from arduino_esp32_tft_terminal.lib.preview import PreviewServer
+
+
+def make_board(chan: Channel) -> 'Board':
+    # Imported here, after the args: the board pulls in NumPy.
+    from arduino_esp32_tft_terminal.lib.board import Board
 
-def make_board(chan: Channel) -> Board:
     try:
         board = Board(chan)
         # board.wait_configured()
@@ -44,10 +35,36 @@ def make_board(chan: Channel) -> Board:
         raise
 
 
-def make_all() -> tuple[Channel, Board]:
+def make_headless(
+    out_dir: str, preview: 'PreviewServer | None' = None
+) -> tuple[Channel, 'Board']:
+    from arduino_esp32_tft_terminal.lib.headless import HeadlessChannel
+
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    chan = HeadlessChannel(out_dir or None)
+    if preview:
+        chan.on_frame = preview.publish
+    return chan, make_board(chan)
+
+
+def make_mirror_tap(preview: 'PreviewServer | None') -> Callable[[bytes], None] | None:
+    """What a live board's channel should tap its writes into, to mirror the
+    board on the preview."""
+    if not preview:
+        return None
+    from arduino_esp32_tft_terminal.lib.preview import Mirror
+
+    return Mirror(preview).tap
+
+
+def make_all(
+    port: str | None = None, tap: Callable[[bytes], None] | None = None
+) -> tuple[Channel, 'Board']:
     while True:
         try:
-            chan = Channel()
+            chan = Channel(port=port)
+            chan.tap = tap
             board = make_board(chan)
             return chan, board
         except ArduinoCommExceptions as e:
@@ -58,28 +75,9 @@ def make_all() -> tuple[Channel, Board]:
 
 ### Here we go ###
 
-all_apps = [
-    ClaudeMonitor,
-    MonitorHost,
-    MonitorCpus,
-    MonitorGraph,
-    Asteriods,
-    Cube,
-    # Road,
-    Starfield,
-    Tunnel,
-    Quix,
-    # Bumps,
-    CollisionsElastic,
-    CollisionsGravity,
-    BubblesSoap,
-    BubblesAir,
-    Fill,
-]
-
-
-def start_app(cls: Type[App], only_me: bool, board: Board) -> bool:
-    instance = cls(board)
+
+def start_app(app: AppEntry, only_me: bool, board: 'Board') -> bool:
+    instance = app.load()(board)
     instance.only_me = only_me
 
     while True:
@@ -100,18 +98,15 @@ def suppress_ctrl_c() -> None:
     signal.signal(signal.SIGINT, handler)
 
 
-def main() -> None:
-    args, apps = get_args(all_apps)
-    _chan, board = make_all()
-
-    # Cycle through apps
+def run_board(board: 'Board', apps: list[AppEntry], once: bool) -> None:
+    """Cycle through `apps` on `board`, forever unless `once`."""
     while True:
         try:
             while True:
                 for app in apps:
                     start_app(app, len(apps) == 1, board)
 
-                if args.once:
+                if once:
                     break
 
         except RebootedException:
@@ -126,11 +121,118 @@ def main() -> None:
             msg = traceback.format_exc()
             board.fatal(msg)
 
-        if args.once:
+        if once:
             break
 
-    if args.once:
-        ThatsAll(board).run()
+    if once:
+        THATS_ALL.load()(board).run()
+
+
+def deal_apps(apps: list[AppEntry], nb_boards: int, mode: str) -> list[list[AppEntry]]:
+    """The apps of each board: all of them for 'each', else dealt out in turn
+    (a board left without any repeats one)."""
+    if mode == 'each':
+        return [apps] * nb_boards
+    return [apps[i::nb_boards] or [apps[i % len(apps)]] for i in range(nb_boards)]
+
+
+def fan_out(taps: list[Callable[[bytes], None] | None]) -> Callable[[bytes], None]:
+    live = [tap for tap in taps if tap]
+
+    def tap(data: bytes) -> None:
+        for t in live:
+            t(data)
+
+    return tap
+
+
+def run_mirrored(
+    ports: list[str],
+    apps: list[AppEntry],
+    once: bool,
+    tap: Callable[[bytes], None] | None = None,
+) -> None:
+    """Run the apps once, on the first board, and replay its writes on the
+    others (`Replica`): all the boards show the same."""
+    from arduino_esp32_tft_terminal.lib.replica import Replica
+
+    replicas = [Replica(Channel(port=port)) for port in ports[1:]]
+    _chan, board = make_all(ports[0], fan_out([r.tap for r in replicas] + [tap]))
+    try:
+        run_board(board, apps, once)
+    finally:  # the last frame, or the fatal message, shows on all
+        for replica in replicas:
+            replica.flush(config.SERIAL_TIMEOUT)
+
+
+def run_boards(
+    ports: list[str],
+    apps: list[AppEntry],
+    once: bool,
+    tap: Callable[[bytes], None] | None = None,
+) -> None:
+    """Drive several boards from one process, one thread per board: each
+    opens, configures, recovers and cycles through its apps on its own, so a
+    failing board does not stall the others. The host metrics are sampled
+    once for all (`Sampler.get`). The first board's writes go to `tap`.
+    Ctrl-C stops each board as it would the only one."""
+    if config.MULTI_BOARD == 'mirror':
+        run_mirrored(ports, apps, once, tap)
+        return
+
+    chans: list[Channel] = []
+
+    def drive(port: str, apps: list[AppEntry]) -> None:
+        chan, board = make_all(port, tap if port == ports[0] else None)
+        chans.append(chan)
+        try:
+            run_board(board, apps, once)
+        except SystemExit:  # board.fatal: this board is done, not the process
+            print(f'{port}: stopped')
+
+    threads = [
+        threading.Thread(target=drive, args=(port, board_apps), name=port, daemon=True)
+        for port, board_apps in zip(
+            ports, deal_apps(apps, len(ports), config.MULTI_BOARD)
+        )
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        print()
+        suppress_ctrl_c()
+        for chan in chans:
+            chan.interrupt()  # each thread shows it, and stops
+        for thread in threads:
+            thread.join(config.SERIAL_TIMEOUT)
+            if thread.is_alive():  # not writing: waiting on its board
+                print(f'{thread.name}: not stopped')
+        raise
+
+
+def main() -> None:
+    args, apps = get_args(all_apps())
+    preview = None
+    if config.PREVIEW_PORT:
+        from arduino_esp32_tft_terminal.lib.preview import PreviewServer
+
+        preview = PreviewServer(config.PREVIEW_PORT).start()
+
+    if config.HEADLESS or config.HEADLESS_DIR:
+        _chan, board = make_headless(config.HEADLESS_DIR, preview)
+        run_board(board, apps, args.once)
+        return
+
+    ports = serial_ports()
+    if len(ports) > 1:
+        run_boards(ports, apps, args.once, make_mirror_tap(preview))
+        return
+
+    _chan, board = make_all(ports[0] if ports else None, make_mirror_tap(preview))
+    run_board(board, apps, args.once)
 
 
 if __name__ == '__main__':
@@ -15,10 +15,17 @@ ROWS: int = 0
 
 # Communication setup
 SERIAL_PORT_BASE = "/dev/ttyACM"  # adapt dep on your OS
+SERIAL_PORTS = ''  # boards to drive: comma-separated ports, or 'all'; '' first found
+MULTI_BOARD = 'share'  # boards 'share' the apps, run 'each' all, or 'mirror' one
+HEADLESS = False  # no board: render in memory (for the preview, HEADLESS_DIR)
+HEADLESS_DIR = ''  # no board: render the frames to PNG files in this directory
+PREVIEW_PORT = 0  # mirror the display to a browser at http://localhost:PORT/
 SERIAL_BAUDRATE = 115200  # default baudrate of oled-server.ino
 SERIAL_ERROR_RETRY_DELAY = 0.2
 SERIAL_ERROR_RETRY_MAX_BACKOFF = 30
 SERIAL_TIMEOUT = 5.0
+SERIAL_PIPELINE_DEPTH = 16  # bulk-draw lines sent before reading their answers
+BUTTONS_STREAM_MS = 60000  # button event streams are renewed after this
 
 # Print buffer safety
 # Usable print-text chars per buffered action, used when the board is too old to
@@ -34,9 +41,16 @@ PRINT_WIRE_MAX = 190
 DEBUG = False
 
 MONITOR_CPU_INTERVAL = 2
+MONITOR_GRAPH_INTERVAL = 0.5
 MONITOR_SSH_AUTHORITY = ''
+MONITOR_REMOTE_INTERVAL = 0.5  # remote agent snapshot period
+MONITOR_SAMPLE_INTERVAL = 0.5  # background sampler period
+MONITOR_HISTORY = 512  # samples kept per host
+MONITOR_RACK_HOSTS = ''  # comma-separated ssh authorities; '' is this host
 
 APPS_INTERFRAME_DELAY_MS = 20
+APPS_TARGET_FPS = 30
+APPS_MAX_FRAME_SKIP = 4
 
 APPS_TIMEOUT = 60 * 3
 APPS_ONCE_TIMEOUT = 10
@@ -45,4 +59,14 @@ APPS_TITLE_DURATION = 2
 APP_ASTERIODS_AUTOPLAY = False
 APP_ASTERIODS_SHOOT_EVERY = 4
 
+APP_STARFIELD_NB_STARS = 18
+
+APP_TUNNEL_RINGS = 2
+APP_TUNNEL_OUTLINE = False  # all 4 edges of each ring, not just 2
+
+APP_CUBE_MESH = ''  # OBJ file to spin instead of the cube
+
+APP_CLAUDE_POLL_INTERVAL = 1.0  # secs between session discoveries
+APP_CLAUDE_PAGE_SECS = 5.0  # auto-paging period of long session lists; 0: off
+
 once = False
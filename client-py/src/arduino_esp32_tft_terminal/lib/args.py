@@ -1,9 +1,9 @@
 import argparse
 import importlib.metadata
-from typing import Any, Type
+from typing import Any
 
 from arduino_esp32_tft_terminal import config
-from arduino_esp32_tft_terminal.app import App, camel_to_kebab
+from arduino_esp32_tft_terminal.lib.registry import AppEntry
 
 
 def _package_version() -> str:
@@ -39,7 +39,7 @@ def get_config_args_specs() -> list[Arg]:
     return args
 
 
-def get_args(all_apps: list[Type[App]]) -> tuple[argparse.Namespace, list[Type[App]]]:
+def get_args(all_apps: list[AppEntry]) -> tuple[argparse.Namespace, list[AppEntry]]:
     specs = get_config_args_specs()
 
     parser = argparse.ArgumentParser(description=__doc__)
@@ -63,11 +63,7 @@ def get_args(all_apps: list[Type[App]]) -> tuple[argparse.Namespace, list[Type[A
             )
 
     # make --only arg
-    possible_apps: list[str] = []
-    names = sorted([a.__name__ for a in all_apps])
-    for name in names:
-        name = camel_to_kebab(name)
-        possible_apps.append(name)
+    possible_apps = sorted(a.id for a in all_apps)
     parser.add_argument(
         '--only',
         nargs='+',
@@ -90,10 +86,10 @@ def get_args(all_apps: list[Type[App]]) -> tuple[argparse.Namespace, list[Type[A
         config.APPS_TITLE_DURATION = 1
 
     # collect apps matching --only APP [APP...]
-    only_apps: list[type[App]] = []
+    only_apps: list[AppEntry] = []
     for name in args.only:
         for app in all_apps:
-            if camel_to_kebab(app.__name__) == name:
+            if app.id == name:
                 only_apps.append(app)
 
     # handle --once
@@ -1,16 +1,28 @@
-import datetime
+import contextlib
 import sys
 import time
-from typing import Any, Callable
+from typing import Any, Callable, Generator
 
 from arduino_esp32_tft_terminal import config
-from arduino_esp32_tft_terminal.lib import NONE, READY, chunkize, until
+from arduino_esp32_tft_terminal.lib import NONE, READY, chunkize
 from arduino_esp32_tft_terminal.lib.gfx import Gfx
 
+from .buttons import DOWN, UP, ButtonWatch
 from .channel import Channel
 from .command_executor import CommandExecutor
 
 
+def parse_buttons(ans: str) -> set[str]:
+    b: set[str] = set()
+    if ans != NONE:
+        for c in ans:
+            if c in 'ABCR':
+                b.add(c)
+            else:
+                return set()
+    return b
+
+
 class Board:
     def __init__(self, channel: Channel) -> None:
         self.app_comm_error_handler: Callable[[], None] | None = None
@@ -37,6 +49,7 @@ class Board:
 
     def board_comm_error_handler(self) -> None:
         self.boots += 1
+        self.configured = False  # the handler's prepare() does it all again
         if self.app_comm_error_handler:
             self.app_comm_error_handler()
 
@@ -68,7 +81,21 @@ class Board:
             self.reboot()
             self._configure()
 
+    def prepare(self) -> None:
+        """Ready the board for the next app. A configured session only gets
+        the display state an app may have changed reset; the full handshake of
+        `configure` (settle, queries) is for a new, rebooted or failed board."""
+        if not self.configured:
+            self.configure()
+            return
+        self.gfx.set_rotation(config.SCREEN_ROTATION)
+        self.gfx.set_auto_display_off()
+        self.gfx.reset()
+        if self.configure_callback:
+            self.configure_callback()
+
     def _configure(self) -> None:
+        self.configured = False
         time.sleep(0.1)
         self.chan.clear()
         self.gfx.set_rotation(config.SCREEN_ROTATION)
@@ -77,6 +104,9 @@ class Board:
 
         w = self.gfx.get_width()
         h = self.gfx.get_height()
+        if config.WIDTH and (w, h) != (config.WIDTH, config.HEIGHT):
+            # The panel size is process-wide: boards driven together must match.
+            print(f'WARNING: {w} x {h} board, apps laid out for the first one')
         if not config.WIDTH:
             config.WIDTH = w
             config.HEIGHT = h
@@ -135,20 +165,39 @@ class Board:
         return val
 
     def wait_no_button(self, timeout: int | None = None) -> bool:
+        """Without timeout, wait for all buttons to be released; else wait for
+        `timeout` secs, unless a button is or gets pressed."""
         self.chan.flush_in()
         if timeout == 0:
             return False
-        elif timeout is None:
-            while self.gfx.read_buttons() != NONE:
-                pass
-        else:
-            start = datetime.datetime.now()
-            until = start + datetime.timedelta(seconds=timeout)
-            while datetime.datetime.now() < until:
-                if self.gfx.read_buttons() != NONE:
+        held = parse_buttons(self.gfx.read_buttons()) - {'R'}
+        if bool(held) == (timeout is not None):
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.button_events() as events:
+            while bool(held) == (timeout is None):
+                left = None if deadline is None else deadline - time.monotonic()
+                if left is not None and left <= 0:
                     break
+                event = events.get(left)
+                if event is None:
+                    continue
+                if event.kind == UP:
+                    held.discard(event.button)
+                else:
+                    held.add(event.button)
         return False
 
+    @contextlib.contextmanager
+    def button_events(self) -> Generator[ButtonWatch, None, None]:
+        """Stream the button events while the host sends no commands."""
+        watch = ButtonWatch(self.command)
+        watch.start()
+        try:
+            yield watch
+        finally:
+            watch.stop()
+
     def begin_auto_read_buttons(self) -> None:
         self.gfx.set_auto_read_buttons_on()
         if config.DEBUG:
@@ -183,34 +232,50 @@ class Board:
     def wait_button(
         self, timeout: int | None = None, wait_released: bool = False
     ) -> set[str]:
-        self.wait_no_button()
+        """Wait for the buttons held on entry to be released, then up to
+        `timeout` secs for a press, then (if `wait_released`) for the pressed
+        buttons to be released. One readButtons, then pushed events only."""
+        self.chan.flush_in()
+        held = self.read_buttons()
+        if 'R' in held:
+            return {'R'}
         b: set[str] = set()
-        with until(timeout) as done:
-            while not done():
-                b = self.read_buttons()
-                if b:
-                    break
-        if wait_released:
+        if not held and timeout == 0:
+            return b
+        deadline = None if timeout is None else time.monotonic() + timeout
+        settled = not held  # no button left from before
+        with self.button_events() as events:
             while True:
-                b2 = self.read_buttons()
-                if not b2:
+                if settled and not b:  # waiting for a press
+                    left = None if deadline is None else deadline - time.monotonic()
+                    if timeout == 0 or (left is not None and left <= 0):
+                        break
+                    event = events.get(left)
+                elif b and not (wait_released and held):
+                    break
+                else:  # waiting for releases
+                    event = events.get()
+                if self.boots:
                     break
-                b |= b2
+                if event is None:
+                    continue
+                if event.kind == UP:
+                    held.discard(event.button)
+                    settled = settled or not held
+                else:
+                    held.add(event.button)
+                    if event.kind == DOWN and settled:
+                        b.add(event.button)
+        if self.boots:
+            self.boots = 0
+            b.add('R')
         return b
 
     def read_buttons(self, flush: bool = False) -> set[str]:
         if flush:
             self.chan.flush_in()
 
-        ans = self.gfx.read_buttons()
-        b: set[str] = set()
-        if ans != NONE:
-            for c in ans:
-                if c in 'ABCR':
-                    b.add(c)
-                else:
-                    b = set()
-                    break
+        b = parse_buttons(self.gfx.read_buttons())
         if self.boots:
             self.boots = 0
             b.add('R')
@@ -0,0 +1,102 @@
+"""Button events pushed by the board.
+
+While the host sends nothing, `monitorButtons` makes the board stream a line
+per button edge (`DOWN A`, `UP A`), one per held button when it starts
+(`PRESSED A`), and `OK` when it ends. `ButtonWatch` reads that stream in a
+thread into a queue of timestamped `ButtonEvent`s, so waiting for a button is
+a blocking `get()`: no readButtons round trips, no busy loop, and no traffic
+while idle. Any command ends the stream; `stop()` sends one.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.lib import OK, ArduinoCommExceptions
+
+from .command_executor import CommandExecutor
+
+DOWN = 'DOWN'
+UP = 'UP'
+PRESSED = 'PRESSED'
+RENEW_MIN_SECS = 0.1  # a stream ending early is not renewed faster than this
+
+
+@dataclass(frozen=True)
+class ButtonEvent:
+    kind: str  # DOWN, UP or PRESSED
+    button: str  # A, B or C
+    t: float
+
+
+def parse_event(line: str, t: float) -> ButtonEvent | None:
+    kind, _, button = line.partition(' ')
+    if kind in (DOWN, UP, PRESSED) and button in ('A', 'B', 'C'):
+        return ButtonEvent(kind, button, t)
+    return None
+
+
+class ButtonWatch:
+    def __init__(
+        self, command: CommandExecutor, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.command = command
+        self.clock = clock
+        self.events: queue.Queue[ButtonEvent | None] = queue.Queue()  # None: end
+        self.thread: threading.Thread | None = None
+        self.started = 0.0
+        self.stopping = False
+        self.failed = False
+        self.tail: str | None = None  # a response read past the stream's end
+
+    def start(self) -> None:
+        ms = config.BUTTONS_STREAM_MS
+        self.started = self.clock()
+        # interval = duration: held buttons are reported once, at the start
+        self.command.command_send(f'monitorButtons {ms} {ms}')
+        self.thread = threading.Thread(target=self._read, daemon=True)
+        self.thread.start()
+
+    def _read(self) -> None:
+        try:
+            while True:
+                line = self.command.chan.read()
+                event = parse_event(line, self.clock())
+                if event:
+                    self.events.put(event)
+                elif line == OK or line.startswith(OK + ' '):
+                    break
+                elif line and not line.startswith('#') and self.stopping:
+                    self.tail = line
+                    break
+        except ArduinoCommExceptions:
+            self.failed = True
+        self.events.put(None)
+
+    def get(self, timeout: float | None = None) -> ButtonEvent | None:
+        """The next event; None on timeout, or when the stream was renewed."""
+        try:
+            event = self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if event is None:
+            if self.failed:
+                self.failed = False
+                self.command.recover()
+            else:
+                time.sleep(max(self.started + RENEW_MIN_SECS - self.clock(), 0))
+            self.start()
+        return event
+
+    def stop(self) -> None:
+        assert self.thread
+        self.stopping = True
+        interrupted = self.thread.is_alive()
+        if interrupted:
+            self.command.command_send('width')
+        self.thread.join(config.SERIAL_TIMEOUT)
+        if interrupted and self.tail is None:
+            self.command.command_response()
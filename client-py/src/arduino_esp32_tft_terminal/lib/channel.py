@@ -1,3 +1,5 @@
+import glob
+import re
 import time
 from typing import Any, Callable
 
@@ -7,30 +9,57 @@ from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.lib import ASCII, ArduinoCommExceptions
 
 
+def wire_text(line: str | bytes) -> str:
+    """A command line as text, for traces and error messages."""
+    if isinstance(line, str):
+        return line
+    return line.decode(errors='replace').rstrip('\n')
+
+
+def discover_ports(port_base: str = config.SERIAL_PORT_BASE) -> list[str]:
+    """The serial ports present under `port_base`, in numeric order."""
+    rx = re.compile(re.escape(port_base) + r'(\d+)$')
+    found = [(int(m[1]), p) for p in glob.glob(port_base + '*') if (m := rx.match(p))]
+    return [p for _, p in sorted(found)]
+
+
+def serial_ports() -> list[str]:
+    """The ports of the boards to drive, per SERIAL_PORTS: listed, or 'all'
+    those attached. Empty: open the first board found."""
+    if config.SERIAL_PORTS == 'all':
+        return discover_ports()
+    return [p.strip() for p in config.SERIAL_PORTS.split(',') if p.strip()]
+
+
 class Channel:
     def __init__(
         self,
         port_base: str = config.SERIAL_PORT_BASE,
         baudrate: int = config.SERIAL_BAUDRATE,
+        port: str | None = None,
     ) -> None:
         self.port_base = port_base
         self.baudrate = baudrate
+        self.port = port  # else the first of port_base0..24 that opens
         self.ser: serial.Serial | None = None
         self.on_message: str | None = None
         self.on_fn: Callable[[Any], None] | None = None
+        self.tap: Callable[[bytes], None] | None = None  # sees what is written
+        self.interrupted = False
 
     def open(self) -> None:
         port_nr = 0
         backoff = 1
         while True:
             try:
-                port = f'{self.port_base}{port_nr}'
+                port = self.port or f'{self.port_base}{port_nr}'
                 print('>open', port)
                 self.ser = serial.Serial(port, self.baudrate)
             # except ArduinoCommExceptions as e:
             except ArduinoCommExceptions as e:
                 print('>open>error:', e)
-                port_nr = (port_nr + 1) % 25
+                if not self.port:
+                    port_nr = (port_nr + 1) % 25
                 time.sleep(config.SERIAL_ERROR_RETRY_DELAY if port_nr else backoff)
                 if not port_nr:
                     backoff = min(backoff * 2, config.SERIAL_ERROR_RETRY_MAX_BACKOFF)
@@ -58,12 +87,26 @@ class Channel:
         self.on_message = message
         self.on_fn = fn
 
-    def write(self, s: str) -> None:
+    def interrupt(self) -> None:
+        """Make the next write raise KeyboardInterrupt, in the thread driving
+        this channel: Ctrl-C, for a board not driven by the main thread."""
+        self.interrupted = True
+
+    def write(self, s: str | bytes) -> None:
+        if self.interrupted:
+            self.interrupted = False
+            raise KeyboardInterrupt()
+        # Bytes come pre-encoded by the generated CommandLine, terminator
+        # included; text lines are encoded here.
         if config.DEBUG:
-            print('<<<', s)
+            print('<<<', wire_text(s))
         # self.ser.write(s.encode(ASCII) + b'\n')
         assert self.ser
-        self.ser.write(str.encode(s) + b'\n')
+        if isinstance(s, str):
+            s = str.encode(s) + b'\n'
+        self.ser.write(s)
+        if self.tap:
+            self.tap(s)
 
     def read(self) -> str:
         assert self.ser
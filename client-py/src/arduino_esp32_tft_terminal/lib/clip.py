@@ -0,0 +1,250 @@
+"""Client-side clipping of drawing primitives against the panel.
+
+The generated command methods call these for the commands protocol.yaml marks
+with `clip`. A `cull_*` function tells whether a primitive is entirely
+off-screen, so that it need not be sent at all; a `trim_*` function also cuts
+a visible one to the panel, returning its new geometry (or None when nothing
+is left). Each has a `*_many` variant for the bulk methods, which drops the
+invisible rows of a command table and trims the others; `cols` are the table
+columns holding the primitive's geometry, in the order of the scalar args.
+
+Shapes are normalised the way the firmware draws them (negative extents grow
+leftwards/upwards). Before the board is configured the panel size is unknown
+(`config.WIDTH` is 0) and nothing is clipped.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray
+
+from arduino_esp32_tft_terminal import config
+
+Table = NDArray[np.int64]
+
+
+def _panel() -> tuple[int, int] | None:
+    return (config.WIDTH, config.HEIGHT) if config.WIDTH and config.HEIGHT else None
+
+
+def _span(a: int, n: int) -> tuple[int, int]:
+    # [start, stop) of an extent n from a, as fillRect/drawFastHLine draw it.
+    return (a + n + 1, a + 1) if n < 0 else (a, a + n)
+
+
+def _spans(a: NDArray[np.int64], n: NDArray[np.int64]) -> tuple[Table, Table]:
+    neg = n < 0
+    return np.where(neg, a + n + 1, a), np.where(neg, a + 1, a + n)
+
+
+# --- cull: drop off-screen primitives ----------------------------------------
+
+
+def cull_point(x: int, y: int) -> bool:
+    panel = _panel()
+    return panel is not None and not (0 <= x < panel[0] and 0 <= y < panel[1])
+
+
+def cull_rect(x: int, y: int, w: int, h: int) -> bool:
+    panel = _panel()
+    if panel is None:
+        return False
+    (x0, x1), (y0, y1) = _span(x, w), _span(y, h)
+    return x1 <= max(x0, 0) or x0 >= panel[0] or y1 <= max(y0, 0) or y0 >= panel[1]
+
+
+def cull_circle(x: int, y: int, r: int) -> bool:
+    panel = _panel()
+    r = abs(r)
+    return panel is not None and (
+        x + r < 0 or x - r >= panel[0] or y + r < 0 or y - r >= panel[1]
+    )
+
+
+def cull_triangle(x0: int, y0: int, x1: int, y1: int, x2: int, y2: int) -> bool:
+    panel = _panel()
+    return panel is not None and (
+        max(x0, x1, x2) < 0
+        or min(x0, x1, x2) >= panel[0]
+        or max(y0, y1, y2) < 0
+        or min(y0, y1, y2) >= panel[1]
+    )
+
+
+def _visible_boxes(
+    x0: Table, y0: Table, x1: Table, y1: Table, panel: tuple[int, int]
+) -> NDArray[np.bool_]:
+    # Rows whose box [x0, x1] x [y0, y1] (inclusive) meets the panel.
+    return (x1 >= 0) & (x0 < panel[0]) & (y1 >= 0) & (y0 < panel[1])
+
+
+def cull_point_many(rows: Table, cols: tuple[int, ...]) -> Table:
+    panel = _panel()
+    if panel is None:
+        return rows
+    x, y = (rows[:, c] for c in cols)
+    return rows[_visible_boxes(x, y, x, y, panel)]
+
+
+def cull_rect_many(rows: Table, cols: tuple[int, ...]) -> Table:
+    panel = _panel()
+    if panel is None:
+        return rows
+    x, y, w, h = (rows[:, c] for c in cols)
+    (x0, x1), (y0, y1) = _spans(x, w), _spans(y, h)
+    keep = (x1 > x0) & (y1 > y0) & _visible_boxes(x0, y0, x1 - 1, y1 - 1, panel)
+    return rows[keep]
+
+
+def cull_circle_many(rows: Table, cols: tuple[int, ...]) -> Table:
+    panel = _panel()
+    if panel is None:
+        return rows
+    x, y, r = (rows[:, c] for c in cols)
+    r = np.abs(r)
+    return rows[_visible_boxes(x - r, y - r, x + r, y + r, panel)]
+
+
+def cull_triangle_many(rows: Table, cols: tuple[int, ...]) -> Table:
+    panel = _panel()
+    if panel is None:
+        return rows
+    xs, ys = rows[:, cols[0::2]], rows[:, cols[1::2]]
+    keep = _visible_boxes(xs.min(1), ys.min(1), xs.max(1), ys.max(1), panel)
+    return rows[keep]
+
+
+# --- trim: cut visible primitives to the panel -------------------------------
+
+
+def trim_hspan(x: int, y: int, w: int) -> tuple[int, int, int] | None:
+    panel = _panel()
+    if panel is None:
+        return x, y, w
+    if 0 <= x and 0 < w and x + w <= panel[0] and 0 <= y < panel[1]:
+        return x, y, w
+    x0, x1 = _span(x, w)
+    x0, x1 = max(x0, 0), min(x1, panel[0])
+    if x1 <= x0 or not 0 <= y < panel[1]:
+        return None
+    return x0, y, x1 - x0
+
+
+def trim_vspan(x: int, y: int, h: int) -> tuple[int, int, int] | None:
+    panel = _panel()
+    if panel is None:
+        return x, y, h
+    if 0 <= y and 0 < h and y + h <= panel[1] and 0 <= x < panel[0]:
+        return x, y, h
+    y0, y1 = _span(y, h)
+    y0, y1 = max(y0, 0), min(y1, panel[1])
+    if y1 <= y0 or not 0 <= x < panel[0]:
+        return None
+    return x, y0, y1 - y0
+
+
+def trim_rect(x: int, y: int, w: int, h: int) -> tuple[int, int, int, int] | None:
+    panel = _panel()
+    if panel is None:
+        return x, y, w, h
+    w_, h_ = panel
+    if 0 <= x and 0 < w and x + w <= w_ and 0 <= y and 0 < h and y + h <= h_:
+        return x, y, w, h
+    (x0, x1), (y0, y1) = _span(x, w), _span(y, h)
+    x0, x1 = max(x0, 0), min(x1, panel[0])
+    y0, y1 = max(y0, 0), min(y1, panel[1])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def trim_line(x0: int, y0: int, x1: int, y1: int) -> tuple[int, int, int, int] | None:
+    """Liang-Barsky: the part of the segment within the panel, its new ends
+    rounded to pixels; segments inside are returned as they are."""
+    panel = _panel()
+    if panel is None:
+        return x0, y0, x1, y1
+    w, h = panel
+    if 0 <= x0 < w and 0 <= x1 < w and 0 <= y0 < h and 0 <= y1 < h:
+        return x0, y0, x1, y1
+    dx, dy = x1 - x0, y1 - y0
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x0), (dx, w - 1 - x0), (-dy, y0), (dy, h - 1 - y0)):
+        if p == 0:
+            if q < 0:
+                return None
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+    if t0 > t1:
+        return None
+    return (
+        round(x0 + t0 * dx),
+        round(y0 + t0 * dy),
+        round(x0 + t1 * dx),
+        round(y0 + t1 * dy),
+    )
+
+
+def _trim_spans(rows: Table, cols: tuple[int, ...], axis: int) -> Table:
+    # hspan (axis 0) and vspan (axis 1): cut the extent along `axis`.
+    panel = _panel()
+    if panel is None:
+        return rows
+    ca, cn = cols[axis], cols[2]
+    a0, a1 = _spans(rows[:, ca], rows[:, cn])
+    a0, a1 = np.maximum(a0, 0), np.minimum(a1, panel[axis])
+    other = rows[:, cols[1 - axis]]
+    keep = (a1 > a0) & (other >= 0) & (other < panel[1 - axis])
+    rows = rows[keep].copy()
+    rows[:, ca], rows[:, cn] = a0[keep], (a1 - a0)[keep]
+    return rows
+
+
+def trim_hspan_many(rows: Table, cols: tuple[int, ...]) -> Table:
+    return _trim_spans(rows, cols, 0)
+
+
+def trim_vspan_many(rows: Table, cols: tuple[int, ...]) -> Table:
+    return _trim_spans(rows, cols, 1)
+
+
+def trim_rect_many(rows: Table, cols: tuple[int, ...]) -> Table:
+    panel = _panel()
+    if panel is None:
+        return rows
+    cx, cy, cw, ch = cols
+    x0, x1 = _spans(rows[:, cx], rows[:, cw])
+    y0, y1 = _spans(rows[:, cy], rows[:, ch])
+    x0, x1 = np.maximum(x0, 0), np.minimum(x1, panel[0])
+    y0, y1 = np.maximum(y0, 0), np.minimum(y1, panel[1])
+    keep = (x1 > x0) & (y1 > y0)
+    rows = rows[keep].copy()
+    rows[:, cx], rows[:, cy] = x0[keep], y0[keep]
+    rows[:, cw], rows[:, ch] = (x1 - x0)[keep], (y1 - y0)[keep]
+    return rows
+
+
+def trim_line_many(rows: Table, cols: tuple[int, ...]) -> Table:
+    panel = _panel()
+    if panel is None:
+        return rows
+    w, h = panel
+    x0, y0, x1, y1 = (rows[:, c].astype(float) for c in cols)
+    dx, dy = x1 - x0, y1 - y0
+    t0, t1 = np.zeros(len(rows)), np.ones(len(rows))
+    out = np.zeros(len(rows), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, q in ((-dx, x0), (dx, w - 1 - x0), (-dy, y0), (dy, h - 1 - y0)):
+            out |= (p == 0) & (q < 0)
+            t = q / p
+            t0 = np.where(p < 0, np.maximum(t0, t), t0)
+            t1 = np.where(p > 0, np.minimum(t1, t), t1)
+    keep = ~out & (t0 <= t1)
+    t0, t1 = t0[keep], t1[keep]
+    x0, y0, dx, dy = x0[keep], y0[keep], dx[keep], dy[keep]
+    rows = rows[keep].copy()
+    for c, v in zip(cols, (x0 + t0 * dx, y0 + t0 * dy, x0 + t1 * dx, y0 + t1 * dy)):
+        rows[:, c] = np.rint(v)
+    return rows
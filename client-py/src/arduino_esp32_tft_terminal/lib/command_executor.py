@@ -1,10 +1,13 @@
 import time
 from typing import Callable
 
+import numpy as np
+from numpy.typing import NDArray
+
 from arduino_esp32_tft_terminal import config
 from arduino_esp32_tft_terminal.lib import ERROR, NONE, UNKNOWN, ArduinoCommExceptions
 
-from .channel import Channel
+from .channel import Channel, wire_text
 
 
 class CommandExecutor:
@@ -26,7 +29,10 @@ class CommandExecutor:
         self.auto_btn_handler = handler
 
     def do_command(
-        self, cmd: str, ignore_error: bool = False, ignore_response: bool = False
+        self,
+        cmd: str | bytes,
+        ignore_error: bool = False,
+        ignore_response: bool = False,
     ) -> str:
         # Since the board may be rebooted in the middle of a command,
         # it is okay to retry once
@@ -36,8 +42,39 @@ class CommandExecutor:
             self.chan.clear()
             return self._send_command(cmd, ignore_error, ignore_response)
 
+    def do_many(self, fmt: bytes, rows: NDArray[np.int64]) -> None:
+        """Send a `fmt` command line per row of `rows`, pipelined: up to
+        SERIAL_PIPELINE_DEPTH lines go out in one write, then their answers
+        are read. Errors are handled per batch, as `do_command` does."""
+        depth = config.SERIAL_PIPELINE_DEPTH
+        k = rows.shape[1]
+        flat = rows.ravel().tolist()
+        for i in range(0, len(rows), depth):
+            values = flat[i * k : (i + depth) * k]
+            n = len(values) // k
+            lines = (fmt * n) % tuple(values)
+            try:
+                self._send_many(lines, n)
+            except Exception:
+                self.chan.clear()
+                self._send_many(lines, n)
+
+    def _send_many(self, lines: bytes, n: int) -> None:
+        while True:
+            try:
+                self.command_send(lines)
+                for _ in range(n):
+                    self.command_response()
+                return
+            except ArduinoCommExceptions as e:
+                print('Serial error:', e)
+                self.recover()
+
     def _send_command(
-        self, cmd: str, ignore_error: bool = False, ignore_response: bool = False
+        self,
+        cmd: str | bytes,
+        ignore_error: bool = False,
+        ignore_response: bool = False,
     ) -> str:
         while True:
             try:
@@ -69,7 +106,7 @@ class CommandExecutor:
             print('Re-init OK.')
             self.recoveries += 1
 
-    def command_send(self, cmd: str) -> None:
+    def command_send(self, cmd: str | bytes) -> None:
         self.chan.write(cmd)
         self.last_command = cmd
 
@@ -85,7 +122,7 @@ class CommandExecutor:
 
         if not config.DEBUG:
             if response.startswith(ERROR) or response.startswith(UNKNOWN):
-                print('<<<', self.last_command)
+                print('<<<', wire_text(self.last_command))
                 print('>>>', response)
         assert not response.startswith('ERROR')
         if response.startswith('OK '):
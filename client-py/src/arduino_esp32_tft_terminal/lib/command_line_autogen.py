@@ -2,72 +2,101 @@
 # Regenerate with: make protocol-gen
 """Typed command-line layer — one method per protocol command.
 
-Generated from protocol.yaml. Each method assembles the textual command line
-and parses the typed response, then defers to `CommandExecutor.do_command`.
+Generated from protocol.yaml. Each method encodes its command line straight to
+bytes, from a format specialised for its argument types, and parses the typed
+response; the round trip is `CommandExecutor.do_command`'s. Drawing commands
+(those with a `clip` mode) also get a `*_many` variant taking arrays: all the
+rows are checked and encoded in one go, and pipelined by
+`CommandExecutor.do_many`.
+Args with a spec'd `range` are checked before encoding, and the primitives of
+commands with a `clip` mode are culled or trimmed to the panel (see `clip`).
 App conveniences (text scaling, print slicing, HSV, recovery handling) live in
 the hand-written Gfx facade, not here.
 """
 
 from __future__ import annotations
 
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from . import clip
 from .command_executor import CommandExecutor
 
 
+def _table(
+    args: tuple[ArrayLike, ...], bounds: tuple[tuple[int, int], ...]
+) -> NDArray[np.int64]:
+    """Broadcast the args of a bulk call to an (N, len(args)) table of ints,
+    each column within its arg's range."""
+    cols = np.broadcast_arrays(*(np.asarray(a) for a in args))
+    table = np.stack([c.ravel() for c in cols], axis=1).astype(np.int64)
+    lo, hi = np.array(bounds).T
+    bad = (table < lo) | (table > hi)
+    if bad.any():
+        row, col = np.argwhere(bad)[0]
+        raise ValueError(
+            f'arg {col} of row {row} is {table[row, col]}, out of {bounds[col]}'
+        )
+    return table
+
+
 class CommandLine:
     def __init__(self, command: CommandExecutor) -> None:
         self._command = command
 
     def reboot(self) -> None:
         """Reboot the board; sends no response, so the client must not wait."""
-        self._command.do_command('reboot', ignore_response=True)
+        self._command.do_command(b'reboot\n', ignore_response=True)
 
     def reset(self) -> None:
         """Reset display state and clear the pending action buffer."""
-        self._command.do_command('reset')
+        self._command.do_command(b'reset\n')
 
     def display(self) -> None:
         """Flush the buffered draw actions to the screen."""
-        self._command.do_command('display')
+        self._command.do_command(b'display\n')
 
     def auto_display(self, on: bool) -> None:
         """If on=1 draw commands render immediately; if 0 they buffer until `display`."""
-        self._command.do_command(f'autoDisplay {int(on)}')
+        self._command.do_command(b'autoDisplay %d\n' % (on,))
 
     def auto_read_buttons(self, on: bool) -> None:
         """If on=1, every OK response carries the current button-state suffix."""
-        self._command.do_command(f'autoReadButtons {int(on)}')
+        self._command.do_command(b'autoReadButtons %d\n' % (on,))
 
     def version(self) -> str:
         """Firmware version string."""
-        return self._command.do_command('version')
+        return self._command.do_command(b'version\n')
 
     def width(self) -> int:
         """Display width in pixels."""
-        return int(self._command.do_command('width'))
+        return int(self._command.do_command(b'width\n'))
 
     def height(self) -> int:
         """Display height in pixels."""
-        return int(self._command.do_command('height'))
+        return int(self._command.do_command(b'height\n'))
 
     def get_print_max_length(self) -> int:
         """Maximum unescaped text length storable by one buffered `print`."""
-        return int(self._command.do_command('getPrintMaxLength'))
+        return int(self._command.do_command(b'getPrintMaxLength\n'))
 
     def get_rotation(self) -> int:
         """Current display rotation (0-3)."""
-        return int(self._command.do_command('getRotation'))
+        return int(self._command.do_command(b'getRotation\n'))
 
     def get_cursor_x(self) -> int:
         """Current text-cursor X coordinate."""
-        return int(self._command.do_command('getCursorX'))
+        return int(self._command.do_command(b'getCursorX\n'))
 
     def get_cursor_y(self) -> int:
         """Current text-cursor Y coordinate."""
-        return int(self._command.do_command('getCursorY'))
+        return int(self._command.do_command(b'getCursorY\n'))
 
     def get_text_bounds(self, x: int, y: int, text: str) -> tuple[int, int, int, int]:
         """Pixel bounding box (x1,y1,w,h) of `text` rendered at (x,y)."""
-        _ans = self._command.do_command(f'getTextBounds {x} {y} {text}')
+        _ans = self._command.do_command(
+            b'getTextBounds %d %d %s\n' % (x, y, text.encode())
+        )
         _parts = _ans.split()
         return (
             int(_parts[0]),
@@ -78,138 +107,428 @@ class CommandLine:
 
     def print(self, text: str) -> None:
         """Print text at the cursor; supports \\n, \\t and \\\\ escapes."""
-        self._command.do_command(f'print {text}')
+        self._command.do_command(b'print %s\n' % (text.encode(),))
 
     def clear_display(self) -> None:
         """Clear the screen to the background colour."""
-        self._command.do_command('clearDisplay')
+        self._command.do_command(b'clearDisplay\n')
 
     def clear(self) -> None:
         """Clear the screen to the background colour (alias of clearDisplay)."""
-        self._command.do_command('clear')
+        self._command.do_command(b'clear\n')
 
     def home(self) -> None:
         """Move the text cursor to (0,0)."""
-        self._command.do_command('home')
+        self._command.do_command(b'home\n')
 
     def set_fg_color(self, r: int, g: int, b: int) -> None:
         """Set the foreground (palette index 1) colour from RGB 0-255."""
-        self._command.do_command(f'setFgColor {r} {g} {b}')
+        if not 0 <= r <= 255:
+            raise ValueError(f'r is {r}, out of 0..255')
+        if not 0 <= g <= 255:
+            raise ValueError(f'g is {g}, out of 0..255')
+        if not 0 <= b <= 255:
+            raise ValueError(f'b is {b}, out of 0..255')
+        self._command.do_command(b'setFgColor %d %d %d\n' % (r, g, b))
 
     def set_bg_color(self, r: int, g: int, b: int) -> None:
         """Set the background (palette index 0) colour from RGB 0-255."""
-        self._command.do_command(f'setBgColor {r} {g} {b}')
+        if not 0 <= r <= 255:
+            raise ValueError(f'r is {r}, out of 0..255')
+        if not 0 <= g <= 255:
+            raise ValueError(f'g is {g}, out of 0..255')
+        if not 0 <= b <= 255:
+            raise ValueError(f'b is {b}, out of 0..255')
+        self._command.do_command(b'setBgColor %d %d %d\n' % (r, g, b))
 
     def draw_pixel(self, x: int, y: int, color: int) -> None:
         """Plot a pixel at (x,y) in palette `color`."""
-        self._command.do_command(f'drawPixel {x} {y} {color}')
+        if clip.cull_point(x, y):
+            return
+        self._command.do_command(b'drawPixel %d %d %d\n' % (x, y, color))
+
+    def draw_pixel_many(self, x: ArrayLike, y: ArrayLike, color: ArrayLike) -> None:
+        """Bulk `draw_pixel`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x, y, color), ((-32768, 32767), (-32768, 32767), (-32768, 32767))
+        )
+        _rows = clip.cull_point_many(_rows, (0, 1))
+        self._command.do_many(b'drawPixel %d %d %d\n', _rows)
 
     def set_rotation(self, m: int) -> None:
         """Set display rotation (0-3, in 90 degree steps)."""
-        self._command.do_command(f'setRotation {m}')
+        if not 0 <= m <= 3:
+            raise ValueError(f'm is {m}, out of 0..3')
+        self._command.do_command(b'setRotation %d\n' % (m,))
 
     def invert_display(self, inv: bool = True) -> None:
         """Invert display colours; inv defaults to 1 (on)."""
-        self._command.do_command(f'invertDisplay {int(inv)}')
+        self._command.do_command(b'invertDisplay %d\n' % (inv,))
 
     def draw_fast_v_line(self, x: int, y: int, h: int, color: int) -> None:
         """Vertical line from (x,y), height h, in palette `color`."""
-        self._command.do_command(f'drawFastVLine {x} {y} {h} {color}')
+        _geom = clip.trim_vspan(x, y, h)
+        if _geom is None:
+            return
+        x, y, h = _geom
+        self._command.do_command(b'drawFastVLine %d %d %d %d\n' % (x, y, h, color))
+
+    def draw_fast_v_line_many(
+        self, x: ArrayLike, y: ArrayLike, h: ArrayLike, color: ArrayLike
+    ) -> None:
+        """Bulk `draw_fast_v_line`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x, y, h, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.trim_vspan_many(_rows, (0, 1, 2))
+        self._command.do_many(b'drawFastVLine %d %d %d %d\n', _rows)
 
     def draw_fast_h_line(self, x: int, y: int, w: int, color: int) -> None:
         """Horizontal line from (x,y), width w, in palette `color`."""
-        self._command.do_command(f'drawFastHLine {x} {y} {w} {color}')
+        _geom = clip.trim_hspan(x, y, w)
+        if _geom is None:
+            return
+        x, y, w = _geom
+        self._command.do_command(b'drawFastHLine %d %d %d %d\n' % (x, y, w, color))
+
+    def draw_fast_h_line_many(
+        self, x: ArrayLike, y: ArrayLike, w: ArrayLike, color: ArrayLike
+    ) -> None:
+        """Bulk `draw_fast_h_line`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x, y, w, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.trim_hspan_many(_rows, (0, 1, 2))
+        self._command.do_many(b'drawFastHLine %d %d %d %d\n', _rows)
 
     def fill_screen(self, color: int) -> None:
         """Fill the whole screen with palette `color`."""
-        self._command.do_command(f'fillScreen {color}')
+        self._command.do_command(b'fillScreen %d\n' % (color,))
 
     def draw_line(self, x0: int, y0: int, x1: int, y1: int, color: int) -> None:
         """Line from (x0,y0) to (x1,y1) in palette `color`."""
-        self._command.do_command(f'drawLine {x0} {y0} {x1} {y1} {color}')
+        _geom = clip.trim_line(x0, y0, x1, y1)
+        if _geom is None:
+            return
+        x0, y0, x1, y1 = _geom
+        self._command.do_command(b'drawLine %d %d %d %d %d\n' % (x0, y0, x1, y1, color))
+
+    def draw_line_many(
+        self,
+        x0: ArrayLike,
+        y0: ArrayLike,
+        x1: ArrayLike,
+        y1: ArrayLike,
+        color: ArrayLike,
+    ) -> None:
+        """Bulk `draw_line`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x0, y0, x1, y1, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.trim_line_many(_rows, (0, 1, 2, 3))
+        self._command.do_many(b'drawLine %d %d %d %d %d\n', _rows)
 
     def draw_rect(self, x: int, y: int, w: int, h: int, color: int) -> None:
         """Outline rectangle at (x,y), size w x h, in palette `color`."""
-        self._command.do_command(f'drawRect {x} {y} {w} {h} {color}')
+        if clip.cull_rect(x, y, w, h):
+            return
+        self._command.do_command(b'drawRect %d %d %d %d %d\n' % (x, y, w, h, color))
+
+    def draw_rect_many(
+        self, x: ArrayLike, y: ArrayLike, w: ArrayLike, h: ArrayLike, color: ArrayLike
+    ) -> None:
+        """Bulk `draw_rect`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x, y, w, h, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.cull_rect_many(_rows, (0, 1, 2, 3))
+        self._command.do_many(b'drawRect %d %d %d %d %d\n', _rows)
 
     def fill_rect(self, x: int, y: int, w: int, h: int, color: int) -> None:
         """Filled rectangle at (x,y), size w x h, in palette `color`."""
-        self._command.do_command(f'fillRect {x} {y} {w} {h} {color}')
+        _geom = clip.trim_rect(x, y, w, h)
+        if _geom is None:
+            return
+        x, y, w, h = _geom
+        self._command.do_command(b'fillRect %d %d %d %d %d\n' % (x, y, w, h, color))
+
+    def fill_rect_many(
+        self, x: ArrayLike, y: ArrayLike, w: ArrayLike, h: ArrayLike, color: ArrayLike
+    ) -> None:
+        """Bulk `fill_rect`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x, y, w, h, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.trim_rect_many(_rows, (0, 1, 2, 3))
+        self._command.do_many(b'fillRect %d %d %d %d %d\n', _rows)
 
     def draw_circle(self, x: int, y: int, r: int, color: int) -> None:
         """Outline circle centred (x,y), radius r, in palette `color`."""
-        self._command.do_command(f'drawCircle {x} {y} {r} {color}')
+        if clip.cull_circle(x, y, r):
+            return
+        self._command.do_command(b'drawCircle %d %d %d %d\n' % (x, y, r, color))
+
+    def draw_circle_many(
+        self, x: ArrayLike, y: ArrayLike, r: ArrayLike, color: ArrayLike
+    ) -> None:
+        """Bulk `draw_circle`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x, y, r, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.cull_circle_many(_rows, (0, 1, 2))
+        self._command.do_many(b'drawCircle %d %d %d %d\n', _rows)
 
     def fill_circle(self, x: int, y: int, r: int, color: int) -> None:
         """Filled circle centred (x,y), radius r, in palette `color`."""
-        self._command.do_command(f'fillCircle {x} {y} {r} {color}')
+        if clip.cull_circle(x, y, r):
+            return
+        self._command.do_command(b'fillCircle %d %d %d %d\n' % (x, y, r, color))
+
+    def fill_circle_many(
+        self, x: ArrayLike, y: ArrayLike, r: ArrayLike, color: ArrayLike
+    ) -> None:
+        """Bulk `fill_circle`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x, y, r, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.cull_circle_many(_rows, (0, 1, 2))
+        self._command.do_many(b'fillCircle %d %d %d %d\n', _rows)
 
     def draw_triangle(
         self, x0: int, y0: int, x1: int, y1: int, x2: int, y2: int, color: int
     ) -> None:
         """Outline triangle through the three vertices, in palette `color`."""
-        self._command.do_command(f'drawTriangle {x0} {y0} {x1} {y1} {x2} {y2} {color}')
+        if clip.cull_triangle(x0, y0, x1, y1, x2, y2):
+            return
+        self._command.do_command(
+            b'drawTriangle %d %d %d %d %d %d %d\n' % (x0, y0, x1, y1, x2, y2, color)
+        )
+
+    def draw_triangle_many(
+        self,
+        x0: ArrayLike,
+        y0: ArrayLike,
+        x1: ArrayLike,
+        y1: ArrayLike,
+        x2: ArrayLike,
+        y2: ArrayLike,
+        color: ArrayLike,
+    ) -> None:
+        """Bulk `draw_triangle`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x0, y0, x1, y1, x2, y2, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.cull_triangle_many(_rows, (0, 1, 2, 3, 4, 5))
+        self._command.do_many(b'drawTriangle %d %d %d %d %d %d %d\n', _rows)
 
     def fill_triangle(
         self, x0: int, y0: int, x1: int, y1: int, x2: int, y2: int, color: int
     ) -> None:
         """Filled triangle through the three vertices, in palette `color`."""
-        self._command.do_command(f'fillTriangle {x0} {y0} {x1} {y1} {x2} {y2} {color}')
+        if clip.cull_triangle(x0, y0, x1, y1, x2, y2):
+            return
+        self._command.do_command(
+            b'fillTriangle %d %d %d %d %d %d %d\n' % (x0, y0, x1, y1, x2, y2, color)
+        )
+
+    def fill_triangle_many(
+        self,
+        x0: ArrayLike,
+        y0: ArrayLike,
+        x1: ArrayLike,
+        y1: ArrayLike,
+        x2: ArrayLike,
+        y2: ArrayLike,
+        color: ArrayLike,
+    ) -> None:
+        """Bulk `fill_triangle`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x0, y0, x1, y1, x2, y2, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.cull_triangle_many(_rows, (0, 1, 2, 3, 4, 5))
+        self._command.do_many(b'fillTriangle %d %d %d %d %d %d %d\n', _rows)
 
     def draw_round_rect(
         self, x: int, y: int, w: int, h: int, r: int, color: int
     ) -> None:
         """Outline rounded rectangle, corner radius r, in palette `color`."""
-        self._command.do_command(f'drawRoundRect {x} {y} {w} {h} {r} {color}')
+        if clip.cull_rect(x, y, w, h):
+            return
+        self._command.do_command(
+            b'drawRoundRect %d %d %d %d %d %d\n' % (x, y, w, h, r, color)
+        )
+
+    def draw_round_rect_many(
+        self,
+        x: ArrayLike,
+        y: ArrayLike,
+        w: ArrayLike,
+        h: ArrayLike,
+        r: ArrayLike,
+        color: ArrayLike,
+    ) -> None:
+        """Bulk `draw_round_rect`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x, y, w, h, r, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.cull_rect_many(_rows, (0, 1, 2, 3))
+        self._command.do_many(b'drawRoundRect %d %d %d %d %d %d\n', _rows)
 
     def fill_round_rect(
         self, x: int, y: int, w: int, h: int, r: int, color: int
     ) -> None:
         """Filled rounded rectangle, corner radius r, in palette `color`."""
-        self._command.do_command(f'fillRoundRect {x} {y} {w} {h} {r} {color}')
+        if clip.cull_rect(x, y, w, h):
+            return
+        self._command.do_command(
+            b'fillRoundRect %d %d %d %d %d %d\n' % (x, y, w, h, r, color)
+        )
+
+    def fill_round_rect_many(
+        self,
+        x: ArrayLike,
+        y: ArrayLike,
+        w: ArrayLike,
+        h: ArrayLike,
+        r: ArrayLike,
+        color: ArrayLike,
+    ) -> None:
+        """Bulk `fill_round_rect`: one command per row of the broadcast args."""
+        _rows = _table(
+            (x, y, w, h, r, color),
+            (
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-32768, 32767),
+                (-2147483648, 2147483647),
+            ),
+        )
+        _rows = clip.cull_rect_many(_rows, (0, 1, 2, 3))
+        self._command.do_many(b'fillRoundRect %d %d %d %d %d %d\n', _rows)
 
     def draw_char(self, x: int, y: int, c: int, fg: bool, bg: bool, size: int) -> None:
         """Draw character code c at (x,y) with fg/bg flags and magnification `size`."""
-        self._command.do_command(f'drawChar {x} {y} {c} {int(fg)} {int(bg)} {size}')
+        self._command.do_command(
+            b'drawChar %d %d %d %d %d %d\n' % (x, y, c, fg, bg, size)
+        )
 
     def set_text_size(self, sx: int, sy: int = -1) -> None:
         """Set text magnification; omit sy (default -1) for square."""
-        self._command.do_command(f'setTextSize {sx} {sy}')
+        self._command.do_command(b'setTextSize %d %d\n' % (sx, sy))
 
     def set_cursor(self, x: int, y: int) -> None:
         """Move the text cursor to (x,y)."""
-        self._command.do_command(f'setCursor {x} {y}')
+        self._command.do_command(b'setCursor %d %d\n' % (x, y))
 
     def set_text_color(self, r: int, g: int, b: int) -> None:
         """Set text colour from RGB 0-255."""
-        self._command.do_command(f'setTextColor {r} {g} {b}')
+        if not 0 <= r <= 255:
+            raise ValueError(f'r is {r}, out of 0..255')
+        if not 0 <= g <= 255:
+            raise ValueError(f'g is {g}, out of 0..255')
+        if not 0 <= b <= 255:
+            raise ValueError(f'b is {b}, out of 0..255')
+        self._command.do_command(b'setTextColor %d %d %d\n' % (r, g, b))
 
     def set_text_wrap(self, w: bool) -> None:
         """Enable (1) or disable (0) automatic text wrapping at the screen edge."""
-        self._command.do_command(f'setTextWrap {int(w)}')
+        self._command.do_command(b'setTextWrap %d\n' % (w,))
 
     def read_buttons(self) -> str:
         """Currently pressed buttons, e.g. "A", "AB", or "NONE"."""
-        return self._command.do_command('readButtons')
+        return self._command.do_command(b'readButtons\n')
 
     def wait_button(self, during: int, up: int) -> str:
         """Block up to `during` ms for a button event; up=1 waits for release, 0 for press."""
-        return self._command.do_command(f'waitButton {during} {up}')
+        return self._command.do_command(b'waitButton %d %d\n' % (during, up))
 
     def monitor_buttons(self, during: int, interval: int = 100) -> None:
         """Stream button states for `during` ms every `interval` ms (default 100), then OK."""
-        self._command.do_command(f'monitorButtons {during} {interval}')
+        self._command.do_command(b'monitorButtons %d %d\n' % (during, interval))
 
     def watch_buttons(self, during: int = 0, interval: int = 100) -> None:
         """Report button changes for `during` ms (0 = until reset) every `interval` ms; no terminating response."""
         self._command.do_command(
-            f'watchButtons {during} {interval}', ignore_response=True
+            b'watchButtons %d %d\n' % (during, interval), ignore_response=True
         )
 
     def test(self) -> str:
         """Run the built-in display diagnostic."""
-        return self._command.do_command('test')
+        return self._command.do_command(b'test\n')
 
     def hardcopy(self) -> str:
         """Screen capture (not implemented; returns an error)."""
-        return self._command.do_command('hardcopy')
+        return self._command.do_command(b'hardcopy\n')
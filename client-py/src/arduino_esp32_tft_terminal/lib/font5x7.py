@@ -0,0 +1,129 @@
+"""The classic 5x7 font of Adafruit GFX, to render text host-side.
+
+Each glyph is 5 columns of 8 bits, least significant bit on top, printed in a
+6x8 cell (as in `glcdfont.c`). The printable ASCII range is tabulated.
+"""
+
+import numpy as np
+from numpy.typing import NDArray
+
+Mask = NDArray[np.bool_]
+
+CELL_W, CELL_H = 6, 8
+
+GLYPHS: dict[str, tuple[int, ...]] = {
+    ' ': (0x00, 0x00, 0x00, 0x00, 0x00),
+    '!': (0x00, 0x00, 0x5F, 0x00, 0x00),
+    '"': (0x00, 0x07, 0x00, 0x07, 0x00),
+    '#': (0x14, 0x7F, 0x14, 0x7F, 0x14),
+    '$': (0x24, 0x2A, 0x7F, 0x2A, 0x12),
+    '%': (0x23, 0x13, 0x08, 0x64, 0x62),
+    '&': (0x36, 0x49, 0x56, 0x20, 0x50),
+    "'": (0x00, 0x08, 0x07, 0x03, 0x00),
+    '(': (0x00, 0x1C, 0x22, 0x41, 0x00),
+    ')': (0x00, 0x41, 0x22, 0x1C, 0x00),
+    '*': (0x2A, 0x1C, 0x7F, 0x1C, 0x2A),
+    '+': (0x08, 0x08, 0x3E, 0x08, 0x08),
+    ',': (0x00, 0x80, 0x70, 0x30, 0x00),
+    '-': (0x08, 0x08, 0x08, 0x08, 0x08),
+    '.': (0x00, 0x60, 0x60, 0x00, 0x00),
+    '/': (0x20, 0x10, 0x08, 0x04, 0x02),
+    '0': (0x3E, 0x51, 0x49, 0x45, 0x3E),
+    '1': (0x00, 0x42, 0x7F, 0x40, 0x00),
+    '2': (0x72, 0x49, 0x49, 0x49, 0x46),
+    '3': (0x21, 0x41, 0x49, 0x4D, 0x33),
+    '4': (0x18, 0x14, 0x12, 0x7F, 0x10),
+    '5': (0x27, 0x45, 0x45, 0x45, 0x39),
+    '6': (0x3C, 0x4A, 0x49, 0x49, 0x31),
+    '7': (0x41, 0x21, 0x11, 0x09, 0x07),
+    '8': (0x36, 0x49, 0x49, 0x49, 0x36),
+    '9': (0x46, 0x49, 0x49, 0x29, 0x1E),
+    ':': (0x00, 0x00, 0x14, 0x00, 0x00),
+    ';': (0x00, 0x40, 0x34, 0x00, 0x00),
+    '<': (0x00, 0x08, 0x14, 0x22, 0x41),
+    '=': (0x14, 0x14, 0x14, 0x14, 0x14),
+    '>': (0x00, 0x41, 0x22, 0x14, 0x08),
+    '?': (0x02, 0x01, 0x59, 0x09, 0x06),
+    '@': (0x3E, 0x41, 0x5D, 0x59, 0x4E),
+    'A': (0x7C, 0x12, 0x11, 0x12, 0x7C),
+    'B': (0x7F, 0x49, 0x49, 0x49, 0x36),
+    'C': (0x3E, 0x41, 0x41, 0x41, 0x22),
+    'D': (0x7F, 0x41, 0x41, 0x41, 0x3E),
+    'E': (0x7F, 0x49, 0x49, 0x49, 0x41),
+    'F': (0x7F, 0x09, 0x09, 0x09, 0x01),
+    'G': (0x3E, 0x41, 0x41, 0x51, 0x73),
+    'H': (0x7F, 0x08, 0x08, 0x08, 0x7F),
+    'I': (0x00, 0x41, 0x7F, 0x41, 0x00),
+    'J': (0x20, 0x40, 0x41, 0x3F, 0x01),
+    'K': (0x7F, 0x08, 0x14, 0x22, 0x41),
+    'L': (0x7F, 0x40, 0x40, 0x40, 0x40),
+    'M': (0x7F, 0x02, 0x1C, 0x02, 0x7F),
+    'N': (0x7F, 0x04, 0x08, 0x10, 0x7F),
+    'O': (0x3E, 0x41, 0x41, 0x41, 0x3E),
+    'P': (0x7F, 0x09, 0x09, 0x09, 0x06),
+    'Q': (0x3E, 0x41, 0x51, 0x21, 0x5E),
+    'R': (0x7F, 0x09, 0x19, 0x29, 0x46),
+    'S': (0x26, 0x49, 0x49, 0x49, 0x32),
+    'T': (0x03, 0x01, 0x7F, 0x01, 0x03),
+    'U': (0x3F, 0x40, 0x40, 0x40, 0x3F),
+    'V': (0x1F, 0x20, 0x40, 0x20, 0x1F),
+    'W': (0x3F, 0x40, 0x38, 0x40, 0x3F),
+    'X': (0x63, 0x14, 0x08, 0x14, 0x63),
+    'Y': (0x03, 0x04, 0x78, 0x04, 0x03),
+    'Z': (0x61, 0x59, 0x49, 0x4D, 0x43),
+    '[': (0x00, 0x7F, 0x41, 0x41, 0x41),
+    '\\': (0x02, 0x04, 0x08, 0x10, 0x20),
+    ']': (0x00, 0x41, 0x41, 0x41, 0x7F),
+    '^': (0x04, 0x02, 0x01, 0x02, 0x04),
+    '_': (0x40, 0x40, 0x40, 0x40, 0x40),
+    '`': (0x00, 0x03, 0x07, 0x08, 0x00),
+    'a': (0x20, 0x54, 0x54, 0x78, 0x40),
+    'b': (0x7F, 0x28, 0x44, 0x44, 0x38),
+    'c': (0x38, 0x44, 0x44, 0x44, 0x28),
+    'd': (0x38, 0x44, 0x44, 0x28, 0x7F),
+    'e': (0x38, 0x54, 0x54, 0x54, 0x18),
+    'f': (0x00, 0x08, 0x7E, 0x09, 0x02),
+    'g': (0x18, 0xA4, 0xA4, 0x9C, 0x78),
+    'h': (0x7F, 0x08, 0x04, 0x04, 0x78),
+    'i': (0x00, 0x44, 0x7D, 0x40, 0x00),
+    'j': (0x20, 0x40, 0x40, 0x3D, 0x00),
+    'k': (0x7F, 0x10, 0x28, 0x44, 0x00),
+    'l': (0x00, 0x41, 0x7F, 0x40, 0x00),
+    'm': (0x7C, 0x04, 0x78, 0x04, 0x78),
+    'n': (0x7C, 0x08, 0x04, 0x04, 0x78),
+    'o': (0x38, 0x44, 0x44, 0x44, 0x38),
+    'p': (0xFC, 0x18, 0x24, 0x24, 0x18),
+    'q': (0x18, 0x24, 0x24, 0x18, 0xFC),
+    'r': (0x7C, 0x08, 0x04, 0x04, 0x08),
+    's': (0x48, 0x54, 0x54, 0x54, 0x24),
+    't': (0x04, 0x04, 0x3F, 0x44, 0x24),
+    'u': (0x3C, 0x40, 0x40, 0x20, 0x7C),
+    'v': (0x1C, 0x20, 0x40, 0x20, 0x1C),
+    'w': (0x3C, 0x40, 0x30, 0x40, 0x3C),
+    'x': (0x44, 0x28, 0x10, 0x28, 0x44),
+    'y': (0x4C, 0x90, 0x90, 0x90, 0x7C),
+    'z': (0x44, 0x64, 0x54, 0x4C, 0x44),
+    '{': (0x00, 0x08, 0x36, 0x41, 0x00),
+    '|': (0x00, 0x00, 0x77, 0x00, 0x00),  # the classic font's broken bar
+    '}': (0x00, 0x41, 0x36, 0x08, 0x00),
+    '~': (0x02, 0x01, 0x02, 0x04, 0x02),
+}
+
+
+def text_size(text: str, sx: int = 1, sy: int = 1) -> tuple[int, int]:
+    """Width and height of `text` printed on one line at text size (sx, sy),
+    as the board's getTextBounds measures them."""
+    return CELL_W * len(text) * sx, CELL_H * sy
+
+
+def render(text: str, sx: int = 1, sy: int = 1) -> Mask:
+    """Pixels lit by printing `text` at text size (sx, sy), as a (rows, cols)
+    boolean mask whose origin is the cursor."""
+    mask = np.zeros((CELL_H, CELL_W * len(text)), dtype=bool)
+    for i, c in enumerate(text):
+        if c not in GLYPHS:
+            raise ValueError(f'No glyph for {c!r}')
+        for col, bits in enumerate(GLYPHS[c]):
+            for row in range(CELL_H):
+                mask[row, i * CELL_W + col] = bool(bits >> row & 1)
+    return mask.repeat(sy, axis=0).repeat(sx, axis=1)
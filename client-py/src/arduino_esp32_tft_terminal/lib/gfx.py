@@ -1,5 +1,8 @@
 import time
 
+import numpy as np
+from numpy.typing import NDArray
+
 from arduino_esp32_tft_terminal import config
 
 from .command_executor import CommandExecutor
@@ -73,9 +76,11 @@ class Gfx:
         for chunk in _slice_print(s, self.print_max, config.PRINT_WIRE_MAX):
             self.cmd.print(chunk)
 
-    def display(self) -> None:
+    def display(self, pace: bool = True) -> None:
+        # Unpaced when a FrameScheduler owns the frame timing.
         self.cmd.display()
-        time.sleep(self.APPS_INTERFRAME_DELAY)
+        if pace:
+            time.sleep(self.APPS_INTERFRAME_DELAY)
 
     def get_text_bounds(self, x: int, y: int, text: str) -> tuple[int, int]:
         # Bounds are measured at the origin; only width/height are returned.
@@ -122,6 +127,23 @@ class Gfx:
     def draw_line(self, x0: int, y0: int, x1: int, y1: int, fg: int) -> None:
         self.cmd.draw_line(x0, y0, x1, y1, fg)
 
+    # Batches of one primitive, one row per shape: a single bulk call each.
+
+    def draw_lines(self, segments: NDArray[np.int_], fg: int) -> None:
+        # (N, 4) rows of `x0 y0 x1 y1`
+        self.cmd.draw_line_many(*np.asarray(segments).reshape(-1, 4).T, fg)
+
+    def draw_circles(self, circles: NDArray[np.int_], fg: int) -> None:
+        # (N, 3) rows of `x y r`
+        self.cmd.draw_circle_many(*np.asarray(circles).reshape(-1, 3).T, fg)
+
+    def fill_circles(self, circles: NDArray[np.int_], fg: int) -> None:
+        self.cmd.fill_circle_many(*np.asarray(circles).reshape(-1, 3).T, fg)
+
+    def fill_triangles(self, triangles: NDArray[np.int_], fg: int) -> None:
+        # (N, 6) rows of `x0 y0 x1 y1 x2 y2`
+        self.cmd.fill_triangle_many(*np.asarray(triangles).reshape(-1, 6).T, fg)
+
     def fill_screen(self, fg: int) -> None:
         self.cmd.fill_screen(fg)
 
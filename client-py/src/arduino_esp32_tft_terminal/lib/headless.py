@@ -0,0 +1,660 @@
+"""Headless rendering: a `Channel` that draws into memory instead of a board.
+
+`HeadlessChannel` interprets the protocol's command lines the way the firmware
+does (command.cpp, transaction.cpp and esp32s3-display.h) into an RGB565
+framebuffer: colour args pick the fg or bg colour, text is printed in the
+classic 5x7 font (`font5x7`) in its own colour, drawing is buffered until
+`display` unless autoDisplay is on, and rotation turns the drawing
+coordinates, the panel staying landscape. Lines, circles, triangles and
+rounded rects follow Adafruit GFX's rasterisation, so frames match the
+panel's pixel for pixel (glyphs outside printable ASCII are left blank).
+
+Every `display` captures a frame, written as a PNG to `out_dir` if given,
+kept in memory if `keep` is set, and passed to `on_frame` (the web preview);
+`write_png` and `write_apng` save frames with the standard library only. Queries get the answers of an idle board: no
+button is ever pressed.
+"""
+
+from __future__ import annotations
+
+import collections
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from arduino_esp32_tft_terminal.lib.channel import Channel
+from arduino_esp32_tft_terminal.lib.font5x7 import CELL_H, CELL_W, GLYPHS
+
+Frame = NDArray[np.uint16]  # (rows, cols) of RGB565
+
+PANEL_WIDTH, PANEL_HEIGHT = 240, 135  # at rotation 3, as mounted
+PRINT_LENGTH = 128  # config.h
+VERSION = 'headless'
+
+WHITE, BLACK = 0xFFFF, 0x0000
+
+
+def rgb565(r: int, g: int, b: int) -> int:
+    """make_rgb() of the firmware."""
+    return (r >> 3) << 11 | (g >> 2) << 5 | b >> 3
+
+
+def _glyph_table() -> NDArray[np.bool_]:
+    # (256, CELL_H, 5) masks by char code; codes without a glyph stay blank.
+    table = np.zeros((256, CELL_H, CELL_W - 1), dtype=bool)
+    for c, cols in GLYPHS.items():
+        for i, bits in enumerate(cols):
+            table[ord(c), :, i] = [bits >> row & 1 for row in range(CELL_H)]
+    return table
+
+
+_GLYPHS = _glyph_table()
+
+
+def _unescape(line: str) -> str:
+    # unescape_inplace() of command.cpp: \n, \t and \\; any other escaped
+    # char stands for itself.
+    out, chars = [], iter(line)
+    for c in chars:
+        if c == '\\':
+            c = {'n': '\n', 't': '\t'}.get(e := next(chars, ''), e)
+        out.append(c)
+    return ''.join(out)
+
+
+def _div(a: int, b: int) -> int:
+    return int(a / b)  # C integer division truncates towards zero
+
+
+class HeadlessChannel(Channel):
+    def __init__(
+        self,
+        out_dir: str | Path | None = None,
+        keep: int = 0,
+        width: int = PANEL_WIDTH,
+        height: int = PANEL_HEIGHT,
+    ) -> None:
+        super().__init__(port='headless')
+        self.out_dir = Path(out_dir) if out_dir else None
+        self.frames: collections.deque[Frame] = collections.deque(maxlen=keep)
+        self.frame_count = 0
+        self.on_frame: Callable[[Frame], None] | None = None
+        self.panel: Frame = np.zeros((height, width), dtype=np.uint16)
+        self.responses: collections.deque[str] = collections.deque()
+        self.pending: list[Callable[[], None]] = []
+        self.auto_display = True
+        self.auto_read_buttons = False
+        self.inverted = False
+        self.handlers: dict[str, Callable[..., Any]] = {
+            name[4:]: getattr(self, name) for name in dir(self) if name[:4] == '_do_'
+        }
+        self._reset()
+
+    # --- Channel -------------------------------------------------------------
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        self.responses.clear()
+
+    def flush_in(self) -> None:
+        pass
+
+    def write(self, s: str | bytes) -> None:
+        # The firmware sees bytes: one char per byte, whatever the encoding.
+        data = s.encode() if isinstance(s, str) else s
+        for line in data.decode('latin-1').split('\n'):
+            if line:
+                self.interpret(line)
+
+    def read(self) -> str:
+        # An empty line is what a serial read times out with.
+        message = self.responses.popleft() if self.responses else ''
+        if message == self.on_message and self.on_fn:
+            self.on_fn(message)
+        return message
+
+    # --- the board -----------------------------------------------------------
+
+    def interpret(self, line: str) -> None:
+        """Run one command line, queueing its response (if any)."""
+        name, _, rest = _unescape(line).partition(' ')
+        handler = self.handlers.get(name)
+        if handler is None:
+            self.responses.append('ERROR unknown cmd')
+            return
+        response = handler(rest)
+        if response is not None:
+            self.responses.append(response)
+
+    def snapshot(self) -> Frame:
+        """The panel as it shows now (landscape), inversion applied."""
+        return ~self.panel if self.inverted else self.panel.copy()
+
+    def _ok(self) -> str:
+        return 'OK NONE' if self.auto_read_buttons else 'OK'
+
+    def _buffered(self, draw: Callable[[], None]) -> str:
+        if self.auto_display:
+            draw()
+        else:
+            self.pending.append(draw)
+        return self._ok()
+
+    def _commit(self) -> None:
+        pending, self.pending = self.pending, []
+        for draw in pending:
+            draw()
+
+    def _capture(self) -> None:
+        frame = self.snapshot()
+        self.frame_count += 1
+        if self.frames.maxlen:
+            self.frames.append(frame)
+        if self.out_dir:
+            write_png(self.out_dir / f'frame-{self.frame_count:06d}.png', frame)
+        if self.on_frame:
+            self.on_frame(frame)
+
+    def _reset(self) -> None:
+        # display_reset()
+        self.fg = WHITE
+        self.bg = BLACK
+        self.text_fg = self.text_bg = WHITE
+        self.text_size = (1, 1)
+        self.wrap = True
+        self._set_rotation(3)
+        self.cursor = (0, 0)
+        self.view[:] = self.bg
+
+    def _set_rotation(self, m: int) -> None:
+        self.rotation = m & 3
+        # a view of the panel in the rotation's coordinates (quarter turns
+        # from the landscape rotation 3)
+        self.view = np.rot90(self.panel, (3 - self.rotation) % 4)
+
+    # --- raster primitives (Adafruit GFX) ------------------------------------
+
+    def _pixel(self, x: int, y: int, c: int) -> None:
+        h, w = self.view.shape
+        if 0 <= x < w and 0 <= y < h:
+            self.view[y, x] = c
+
+    def _fill_rect(self, x: int, y: int, w: int, h: int, c: int) -> None:
+        # negative extents grow leftwards/upwards, as in Adafruit_SPITFT
+        if w < 0:
+            x, w = x + w + 1, -w
+        if h < 0:
+            y, h = y + h + 1, -h
+        vh, vw = self.view.shape
+        x0, x1 = max(x, 0), min(x + w, vw)
+        y0, y1 = max(y, 0), min(y + h, vh)
+        if x0 < x1 and y0 < y1:
+            self.view[y0:y1, x0:x1] = c
+
+    def _hline(self, x: int, y: int, w: int, c: int) -> None:
+        self._fill_rect(x, y, w, 1, c)
+
+    def _vline(self, x: int, y: int, h: int, c: int) -> None:
+        self._fill_rect(x, y, 1, h, c)
+
+    def _line(self, x0: int, y0: int, x1: int, y1: int, c: int) -> None:
+        if x0 == x1:
+            self._vline(x0, min(y0, y1), abs(y1 - y0) + 1, c)
+            return
+        if y0 == y1:
+            self._hline(min(x0, x1), y0, abs(x1 - x0) + 1, c)
+            return
+        steep = abs(y1 - y0) > abs(x1 - x0)
+        if steep:
+            x0, y0, x1, y1 = y0, x0, y1, x1
+        if x0 > x1:
+            x0, y0, x1, y1 = x1, y1, x0, y0
+        dx, dy = x1 - x0, abs(y1 - y0)
+        err = dx // 2
+        ystep = 1 if y0 < y1 else -1
+        for x in range(x0, x1 + 1):
+            if steep:
+                self._pixel(y0, x, c)
+            else:
+                self._pixel(x, y0, c)
+            err -= dy
+            if err < 0:
+                y0 += ystep
+                err += dx
+
+    @staticmethod
+    def _circle_steps(r: int) -> Iterable[tuple[int, int]]:
+        # the midpoint walk of the first octant, after the axis points
+        f, ddf_x, ddf_y, x, y = 1 - r, 1, -2 * r, 0, r
+        while x < y:
+            if f >= 0:
+                y -= 1
+                ddf_y += 2
+                f += ddf_y
+            x += 1
+            ddf_x += 2
+            f += ddf_x
+            yield x, y
+
+    def _circle_corners(self, x0: int, y0: int, r: int, corners: int, c: int) -> None:
+        for x, y in self._circle_steps(r):
+            if corners & 4:
+                self._pixel(x0 + x, y0 + y, c)
+                self._pixel(x0 + y, y0 + x, c)
+            if corners & 2:
+                self._pixel(x0 + x, y0 - y, c)
+                self._pixel(x0 + y, y0 - x, c)
+            if corners & 8:
+                self._pixel(x0 - y, y0 + x, c)
+                self._pixel(x0 - x, y0 + y, c)
+            if corners & 1:
+                self._pixel(x0 - y, y0 - x, c)
+                self._pixel(x0 - x, y0 - y, c)
+
+    def _fill_circle_halves(
+        self, x0: int, y0: int, r: int, corners: int, delta: int, c: int
+    ) -> None:
+        px, py = 0, r
+        delta += 1
+        for x, y in self._circle_steps(r):
+            if x < y + 1:
+                if corners & 1:
+                    self._vline(x0 + x, y0 - y, 2 * y + delta, c)
+                if corners & 2:
+                    self._vline(x0 - x, y0 - y, 2 * y + delta, c)
+            if y != py:
+                if corners & 1:
+                    self._vline(x0 + py, y0 - px, 2 * px + delta, c)
+                if corners & 2:
+                    self._vline(x0 - py, y0 - px, 2 * px + delta, c)
+                py = y
+            px = x
+
+    def _circle(self, x0: int, y0: int, r: int, c: int) -> None:
+        for x, y in ((0, r), (0, -r), (r, 0), (-r, 0)):
+            self._pixel(x0 + x, y0 + y, c)
+        for x, y in self._circle_steps(r):
+            for sx, sy in ((x, y), (y, x)):
+                for px, py in ((sx, sy), (-sx, sy), (sx, -sy), (-sx, -sy)):
+                    self._pixel(x0 + px, y0 + py, c)
+
+    def _fill_circle(self, x0: int, y0: int, r: int, c: int) -> None:
+        self._vline(x0, y0 - r, 2 * r + 1, c)
+        self._fill_circle_halves(x0, y0, r, 3, 0, c)
+
+    def _triangle(
+        self, x0: int, y0: int, x1: int, y1: int, x2: int, y2: int, c: int
+    ) -> None:
+        self._line(x0, y0, x1, y1, c)
+        self._line(x1, y1, x2, y2, c)
+        self._line(x2, y2, x0, y0, c)
+
+    def _fill_triangle(
+        self, x0: int, y0: int, x1: int, y1: int, x2: int, y2: int, c: int
+    ) -> None:
+        (x0, y0), (x1, y1), (x2, y2) = sorted(
+            ((x0, y0), (x1, y1), (x2, y2)), key=lambda p: p[1]
+        )
+        if y0 == y2:  # flat: one span
+            a, b = min(x0, x1, x2), max(x0, x1, x2)
+            self._hline(a, y0, b - a + 1, c)
+            return
+        dx01, dy01, dx02, dy02 = x1 - x0, y1 - y0, x2 - x0, y2 - y0
+        dx12, dy12 = x2 - x1, y2 - y1
+        last = y1 if y1 == y2 else y1 - 1
+        sa = sb = 0
+        y = y0
+        while y <= last:  # upper part: edges 0-1 and 0-2
+            a, b = x0 + _div(sa, dy01), x0 + _div(sb, dy02)
+            sa, sb = sa + dx01, sb + dx02
+            self._hline(min(a, b), y, abs(b - a) + 1, c)
+            y += 1
+        sa, sb = dx12 * (y - y1), dx02 * (y - y0)
+        while y <= y2:  # lower part: edges 1-2 and 0-2
+            a, b = x1 + _div(sa, dy12), x0 + _div(sb, dy02)
+            sa, sb = sa + dx12, sb + dx02
+            self._hline(min(a, b), y, abs(b - a) + 1, c)
+            y += 1
+
+    def _round_rect(self, x: int, y: int, w: int, h: int, r: int, c: int) -> None:
+        r = min(r, min(w, h) // 2)
+        self._hline(x + r, y, w - 2 * r, c)
+        self._hline(x + r, y + h - 1, w - 2 * r, c)
+        self._vline(x, y + r, h - 2 * r, c)
+        self._vline(x + w - 1, y + r, h - 2 * r, c)
+        self._circle_corners(x + r, y + r, r, 1, c)
+        self._circle_corners(x + w - r - 1, y + r, r, 2, c)
+        self._circle_corners(x + w - r - 1, y + h - r - 1, r, 4, c)
+        self._circle_corners(x + r, y + h - r - 1, r, 8, c)
+
+    def _fill_round_rect(self, x: int, y: int, w: int, h: int, r: int, c: int) -> None:
+        r = min(r, min(w, h) // 2)
+        self._fill_rect(x + r, y, w - 2 * r, h, c)
+        self._fill_circle_halves(x + w - r - 1, y + r, r, 1, h - 2 * r - 1, c)
+        self._fill_circle_halves(x + r, y + r, r, 2, h - 2 * r - 1, c)
+
+    def _char(
+        self, x: int, y: int, code: int, fg: int, bg: int, sx: int, sy: int
+    ) -> None:
+        # drawChar() with the classic font; fg == bg draws no background.
+        h, w = self.view.shape
+        if x >= w or y >= h or x + CELL_W * sx <= 0 or y + CELL_H * sy <= 0:
+            return
+        mask = np.zeros((CELL_H, CELL_W), dtype=bool)
+        mask[:, : CELL_W - 1] = _GLYPHS[code & 0xFF]
+        mask = mask.repeat(sy, axis=0).repeat(sx, axis=1)
+        # the cell, clipped to the view
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + mask.shape[1], w), min(y + mask.shape[0], h)
+        cell = self.view[y0:y1, x0:x1]
+        lit = mask[y0 - y : y1 - y, x0 - x : x1 - x]
+        if fg != bg:
+            cell[~lit] = bg
+        cell[lit] = fg
+
+    def _print(self, text: str) -> None:
+        sx, sy = self.text_size
+        w = self.view.shape[1]
+        x, y = self.cursor
+        for ch in text:
+            if ch == '\n':
+                x, y = 0, y + CELL_H * sy
+            elif ch != '\r':
+                if self.wrap and x + CELL_W * sx > w:
+                    x, y = 0, y + CELL_H * sy
+                self._char(x, y, ord(ch), self.text_fg, self.text_bg, sx, sy)
+                x += CELL_W * sx
+        self.cursor = (x, y)
+
+    def _text_bounds(self, x: int, y: int, text: str) -> tuple[int, int, int, int]:
+        # getTextBounds() with the classic font
+        sx, sy = self.text_size
+        w = self.view.shape[1]
+        min_x, min_y, max_x, max_y = w, self.view.shape[0], -1, -1
+        for ch in text:
+            if ch == '\n':
+                x, y = 0, y + CELL_H * sy
+            elif ch != '\r':
+                if self.wrap and x + CELL_W * sx > w:
+                    x, y = 0, y + CELL_H * sy
+                min_x, min_y = min(min_x, x), min(min_y, y)
+                max_x = max(max_x, x + CELL_W * sx - 1)
+                max_y = max(max_y, y + CELL_H * sy - 1)
+                x += CELL_W * sx
+        if max_x < min_x:
+            return x, y, 0, 0
+        return min_x, min_y, max_x - min_x + 1, max_y - min_y + 1
+
+    def _color(self, fg: int) -> int:
+        return self.fg if fg else self.bg
+
+    # --- command handlers: `_do_<name>(rest)` returns the response line ------
+
+    # control
+
+    def _do_reboot(self, rest: str) -> None:
+        self.pending = []
+        self.auto_display, self.auto_read_buttons, self.inverted = True, False, False
+        self._reset()
+
+    def _do_reset(self, rest: str) -> str:
+        self._reset()
+        self.pending = []
+        return self._ok()
+
+    def _do_display(self, rest: str) -> str:
+        self._commit()
+        self._capture()
+        return self._ok()
+
+    def _do_autoDisplay(self, rest: str) -> str:
+        self.auto_display = bool(int(rest))
+        return self._ok()
+
+    def _do_autoReadButtons(self, rest: str) -> str:
+        self.auto_read_buttons = bool(int(rest))
+        return self._ok()
+
+    # queries
+
+    def _do_version(self, rest: str) -> str:
+        return VERSION
+
+    def _do_width(self, rest: str) -> str:
+        return str(self.panel.shape[1])  # the board's config, whatever the rotation
+
+    def _do_height(self, rest: str) -> str:
+        return str(self.panel.shape[0])
+
+    def _do_getPrintMaxLength(self, rest: str) -> str:
+        return str(PRINT_LENGTH - 1)
+
+    def _do_getRotation(self, rest: str) -> str:
+        self._commit()
+        return str(self.rotation)
+
+    def _do_getCursorX(self, rest: str) -> str:
+        self._commit()
+        return str(self.cursor[0])
+
+    def _do_getCursorY(self, rest: str) -> str:
+        self._commit()
+        return str(self.cursor[1])
+
+    def _do_getTextBounds(self, rest: str) -> str:
+        self._commit()
+        x, y, text = (rest.split(' ', 2) + ['', ''])[:3]
+        return '%d %d %d %d' % self._text_bounds(int(x), int(y), text)
+
+    # buffered
+
+    def _do_print(self, rest: str) -> str:
+        return self._buffered(lambda: self._print(rest))
+
+    def _do_clearDisplay(self, rest: str) -> str:
+        return self._buffered(lambda: self._fill_rect(0, 0, 1 << 15, 1 << 15, self.bg))
+
+    _do_clear = _do_clearDisplay
+
+    def _do_home(self, rest: str) -> str:
+        return self._buffered(lambda: setattr(self, 'cursor', (0, 0)))
+
+    def _do_setFgColor(self, rest: str) -> str:
+        r, g, b = map(int, rest.split())
+        return self._buffered(lambda: setattr(self, 'fg', rgb565(r, g, b)))
+
+    def _do_setBgColor(self, rest: str) -> str:
+        r, g, b = map(int, rest.split())
+        return self._buffered(lambda: setattr(self, 'bg', rgb565(r, g, b)))
+
+    def _do_drawPixel(self, rest: str) -> str:
+        x, y, fg = map(int, rest.split())
+        return self._buffered(lambda: self._pixel(x, y, self._color(fg)))
+
+    def _do_setRotation(self, rest: str) -> str:
+        m = int(rest)
+        return self._buffered(lambda: self._set_rotation(m))
+
+    def _do_invertDisplay(self, rest: str) -> str:
+        inv = bool(int(rest))
+        return self._buffered(lambda: setattr(self, 'inverted', inv))
+
+    def _do_drawFastVLine(self, rest: str) -> str:
+        x, y, h, fg = map(int, rest.split())
+        return self._buffered(lambda: self._vline(x, y, h, self._color(fg)))
+
+    def _do_drawFastHLine(self, rest: str) -> str:
+        x, y, w, fg = map(int, rest.split())
+        return self._buffered(lambda: self._hline(x, y, w, self._color(fg)))
+
+    def _do_fillScreen(self, rest: str) -> str:
+        fg = int(rest)
+        return self._buffered(
+            lambda: self._fill_rect(0, 0, 1 << 15, 1 << 15, self._color(fg))
+        )
+
+    def _do_drawLine(self, rest: str) -> str:
+        x0, y0, x1, y1, fg = map(int, rest.split())
+        return self._buffered(lambda: self._line(x0, y0, x1, y1, self._color(fg)))
+
+    def _do_drawRect(self, rest: str) -> str:
+        x, y, w, h, fg = map(int, rest.split())
+
+        def draw() -> None:
+            c = self._color(fg)
+            self._hline(x, y, w, c)
+            self._hline(x, y + h - 1, w, c)
+            self._vline(x, y, h, c)
+            self._vline(x + w - 1, y, h, c)
+
+        return self._buffered(draw)
+
+    def _do_fillRect(self, rest: str) -> str:
+        x, y, w, h, fg = map(int, rest.split())
+        return self._buffered(lambda: self._fill_rect(x, y, w, h, self._color(fg)))
+
+    def _do_drawCircle(self, rest: str) -> str:
+        x, y, r, fg = map(int, rest.split())
+        return self._buffered(lambda: self._circle(x, y, r, self._color(fg)))
+
+    def _do_fillCircle(self, rest: str) -> str:
+        x, y, r, fg = map(int, rest.split())
+        return self._buffered(lambda: self._fill_circle(x, y, r, self._color(fg)))
+
+    def _do_drawTriangle(self, rest: str) -> str:
+        *xy, fg = map(int, rest.split())
+        return self._buffered(lambda: self._triangle(*xy, self._color(fg)))
+
+    def _do_fillTriangle(self, rest: str) -> str:
+        *xy, fg = map(int, rest.split())
+        return self._buffered(lambda: self._fill_triangle(*xy, self._color(fg)))
+
+    def _do_drawRoundRect(self, rest: str) -> str:
+        x, y, w, h, r, fg = map(int, rest.split())
+        return self._buffered(lambda: self._round_rect(x, y, w, h, r, self._color(fg)))
+
+    def _do_fillRoundRect(self, rest: str) -> str:
+        x, y, w, h, r, fg = map(int, rest.split())
+        return self._buffered(
+            lambda: self._fill_round_rect(x, y, w, h, r, self._color(fg))
+        )
+
+    def _do_drawChar(self, rest: str) -> str:
+        x, y, code, fg, bg, size = map(int, rest.split())
+        size = max(size, 1)
+        return self._buffered(
+            lambda: self._char(x, y, code, self._color(fg), self._color(bg), size, size)
+        )
+
+    def _do_setTextSize(self, rest: str) -> str:
+        sx, sy = map(int, rest.split())
+        return self._buffered(lambda: setattr(self, 'text_size', (sx or 1, sy or 1)))
+
+    def _do_setCursor(self, rest: str) -> str:
+        x, y = map(int, rest.split())
+        return self._buffered(lambda: setattr(self, 'cursor', (x, y)))
+
+    def _do_setTextColor(self, rest: str) -> str:
+        c = rgb565(*map(int, rest.split()))
+
+        def draw() -> None:
+            self.text_fg = self.text_bg = c  # no background
+
+        return self._buffered(draw)
+
+    def _do_setTextWrap(self, rest: str) -> str:
+        wrap = bool(int(rest))
+        return self._buffered(lambda: setattr(self, 'wrap', wrap))
+
+    # buttons: none is ever pressed
+
+    def _do_readButtons(self, rest: str) -> str:
+        return 'NONE'
+
+    def _do_waitButton(self, rest: str) -> str:
+        return 'NONE'
+
+    def _do_monitorButtons(self, rest: str) -> str:
+        return 'OK'  # the stream ends at once, with no event
+
+    def _do_watchButtons(self, rest: str) -> None:
+        pass
+
+    # misc
+
+    def _do_test(self, rest: str) -> str:
+        return 'OK'
+
+    def _do_hardcopy(self, rest: str) -> str:
+        self._commit()
+        return 'ERROR hardcopy not implemented'
+
+
+# --- PNG output -------------------------------------------------------------
+
+
+def to_rgb(frame: Frame) -> NDArray[np.uint8]:
+    """RGB565 to (rows, cols, 3) RGB888, the low bits replicating the high
+    ones so that white stays white."""
+    f = frame.astype(np.uint16)
+    r, g, b = f >> 11, f >> 5 & 0x3F, f & 0x1F
+    rgb = np.stack([r << 3 | r >> 2, g << 2 | g >> 4, b << 3 | b >> 2], axis=-1)
+    return rgb.astype(np.uint8)
+
+
+def _chunk(tag: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack('>I', len(data))
+        + tag
+        + data
+        + struct.pack('>I', zlib.crc32(tag + data))
+    )
+
+
+def _header(frame: Frame) -> bytes:
+    h, w = frame.shape
+    ihdr = struct.pack('>IIBBBBB', w, h, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return b'\x89PNG\r\n\x1a\n' + _chunk(b'IHDR', ihdr)
+
+
+def _image_data(frame: Frame) -> bytes:
+    rows = to_rgb(frame).reshape(frame.shape[0], -1)
+    filtered = np.hstack([np.zeros((len(rows), 1), dtype=np.uint8), rows])
+    return zlib.compress(filtered.tobytes())
+
+
+def write_png(path: str | Path, frame: Frame) -> None:
+    """Save one frame as a PNG."""
+    png = _header(frame) + _chunk(b'IDAT', _image_data(frame)) + _chunk(b'IEND', b'')
+    Path(path).write_bytes(png)
+
+
+def write_apng(path: str | Path, frames: Iterable[Frame], delay_ms: int = 50) -> None:
+    """Save frames as an animated PNG, looping, `delay_ms` apart (viewers
+    without APNG support show the first frame)."""
+    frames = list(frames)
+    if not frames:
+        raise ValueError('No frame to write')
+    h, w = frames[0].shape
+    out = [_header(frames[0]), _chunk(b'acTL', struct.pack('>II', len(frames), 0))]
+    seq = 0
+    for i, frame in enumerate(frames):
+        fctl = struct.pack('>IIIIIHHBB', seq, w, h, 0, 0, delay_ms, 1000, 0, 0)
+        out.append(_chunk(b'fcTL', fctl))
+        seq += 1
+        if i == 0:
+            out.append(_chunk(b'IDAT', _image_data(frame)))
+        else:
+            out.append(_chunk(b'fdAT', struct.pack('>I', seq) + _image_data(frame)))
+            seq += 1
+    out.append(_chunk(b'IEND', b''))
+    Path(path).write_bytes(b''.join(out))
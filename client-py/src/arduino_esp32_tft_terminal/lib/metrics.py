@@ -0,0 +1,188 @@
+"""Host metrics read straight from /proc and utmp, without subprocesses.
+
+Every collector takes a `reader(path) -> bytes`: `read_local` for this host,
+or a `RemoteSession` for the host of `MONITOR_SSH_AUTHORITY`. Counters
+(/proc/stat, /proc/net/dev) are turned into rates against the previous sample,
+so any sampling interval works and no collector ever sleeps.
+"""
+
+import datetime
+import struct
+from typing import Callable
+
+from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.lib.remote import RemoteSession
+
+Reader = Callable[[str], bytes]
+
+UTMP_PATH = '/var/run/utmp'
+UTMP_RECORD_SIZE = 384  # struct utmp on Linux (glibc, all 64-bit ABIs)
+UTMP_USER_PROCESS = 7
+
+# All the files the collectors read, i.e. what a remote agent must stream
+PATHS = (
+    '/proc/stat',
+    '/proc/net/dev',
+    '/proc/meminfo',
+    '/proc/uptime',
+    '/proc/sys/kernel/hostname',
+    UTMP_PATH,
+)
+
+
+def read_local(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def reader_for(authority: str) -> Reader:
+    """Reader for a host: local if `authority` is empty, else over ssh."""
+    if authority:
+        return RemoteSession.get(authority, PATHS).read
+    return read_local
+
+
+def host_reader() -> Reader:
+    """Reader for the monitored host: local, or `MONITOR_SSH_AUTHORITY`."""
+    return reader_for(config.MONITOR_SSH_AUTHORITY)
+
+
+class CpuCollector:
+    """Per-CPU user time (mpstat's %usr), in percent, over the interval since
+    the previous `sample()`; the first sample covers the time since boot.
+    Sampling again before the counters tick (e.g. a remote snapshot not yet
+    renewed) repeats the last result."""
+
+    def __init__(self, reader: Reader = read_local) -> None:
+        self.reader = reader
+        self.previous: list[tuple[int, int]] = []  # (usr, total) per CPU
+        self.last: list[float] = []
+
+    def sample(self) -> list[float]:
+        counters: list[tuple[int, int]] = []
+        for line in self.reader('/proc/stat').decode().splitlines():
+            if not line.startswith('cpu') or not line[3].isdigit():
+                continue
+            v = [int(f) for f in line.split()[1:]] + [0] * 10
+            # user nice system idle iowait irq softirq steal guest guest_nice
+            total = sum(v[:8])  # guest time is already counted in user
+            counters.append((v[0] - v[8], total))
+
+        previous = self.previous
+        if counters == previous and self.last:
+            return self.last
+        if len(previous) != len(counters):  # first sample, or CPU hotplug
+            previous = [(0, 0)] * len(counters)
+        self.previous = counters
+
+        pcents = []
+        for (usr, total), (usr0, total0) in zip(counters, previous):
+            dt = total - total0
+            pcents.append(100.0 * (usr - usr0) / dt if dt > 0 else 0.0)
+        self.last = pcents
+        return pcents
+
+
+class NetCollector:
+    """Received and transmitted bytes/s, summed over all interfaces, since the
+    previous `sample()`; None at the first sample (and after a reboot).
+    Intervals are timed by the host's own /proc/uptime, read with the
+    counters: sampling again before a remote snapshot is renewed repeats the
+    last rates, instead of a 0 followed by a doubled spike."""
+
+    def __init__(self, reader: Reader = read_local) -> None:
+        self.reader = reader
+        self.previous: tuple[int, int, float] | None = None
+        self.last: tuple[float, float] | None = None
+
+    def totals(self) -> tuple[int, int]:
+        rx = tx = 0
+        for line in self.reader('/proc/net/dev').decode().splitlines()[2:]:
+            _, _, fields = line.partition(':')
+            v = fields.split()
+            rx += int(v[0])
+            tx += int(v[8])
+        return rx, tx
+
+    def sample(self) -> tuple[float, float] | None:
+        now = uptime(self.reader)
+        rx, tx = self.totals()
+        previous = self.previous
+        if previous is not None and now == previous[2]:  # the same snapshot
+            return self.last
+        self.previous = rx, tx, now
+        if previous is None or now < previous[2]:
+            self.last = None
+        else:
+            rx0, tx0, t0 = previous
+            secs = now - t0
+            self.last = max(rx - rx0, 0) / secs, max(tx - tx0, 0) / secs
+        return self.last
+
+
+def meminfo(reader: Reader = read_local) -> dict[str, int]:
+    """/proc/meminfo, in bytes."""
+    info: dict[str, int] = {}
+    for line in reader('/proc/meminfo').decode().splitlines():
+        key, _, value = line.partition(':')
+        info[key] = int(value.split()[0]) * 1024
+    return info
+
+
+def memory(reader: Reader = read_local) -> dict[str, int]:
+    """What `free` shows: total, used, free, shared, buff/cache and available
+    bytes."""
+    m = meminfo(reader)
+    cache = m['Buffers'] + m['Cached'] + m.get('SReclaimable', 0)
+    used = m['MemTotal'] - m['MemFree'] - cache
+    return {
+        'total': m['MemTotal'],
+        'used': used if used >= 0 else m['MemTotal'] - m['MemFree'],
+        'free': m['MemFree'],
+        'shared': m.get('Shmem', 0),
+        'buff/cache': cache,
+        'available': m.get('MemAvailable', m['MemFree']),
+    }
+
+
+def uptime(reader: Reader = read_local) -> float:
+    return float(reader('/proc/uptime').split()[0])
+
+
+def format_uptime(secs: float) -> str:
+    """Like `uptime -p`, e.g. 'up 1 week, 2 days, 5 minutes'."""
+    minutes = int(secs) // 60
+    parts = []
+    for unit, size in ('week', 7 * 24 * 60), ('day', 24 * 60), ('hour', 60):
+        n, minutes = divmod(minutes, size)
+        if n:
+            parts.append(f'{n} {unit}' + ('s' if n > 1 else ''))
+    if minutes or not parts:
+        parts.append(f'{minutes} minute' + ('s' if minutes != 1 else ''))
+    return 'up ' + ', '.join(parts)
+
+
+def now(reader: Reader = read_local) -> datetime.datetime:
+    """The host's clock: its boot time (/proc/stat btime) plus its uptime."""
+    for line in reader('/proc/stat').decode().splitlines():
+        if line.startswith('btime '):
+            btime = int(line.split()[1])
+            break
+    else:
+        raise ValueError('no btime in /proc/stat')
+    return datetime.datetime.fromtimestamp(btime + uptime(reader))
+
+
+def nb_users(reader: Reader = read_local) -> int:
+    """Logged-in sessions, as `who` counts them (USER_PROCESS utmp records)."""
+    data = reader(UTMP_PATH)
+    n = 0
+    for offset in range(0, len(data) - UTMP_RECORD_SIZE + 1, UTMP_RECORD_SIZE):
+        (ut_type,) = struct.unpack_from('<i', data, offset)
+        if ut_type == UTMP_USER_PROCESS:
+            n += 1
+    return n
+
+
+def hostname(reader: Reader = read_local) -> str:
+    return reader('/proc/sys/kernel/hostname').decode().strip()
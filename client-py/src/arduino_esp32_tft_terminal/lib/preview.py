@@ -0,0 +1,233 @@
+"""Web preview: the display, mirrored to a browser canvas on localhost.
+
+`PreviewServer` serves a page at http://localhost:PORT/ whose canvas is fed
+over a WebSocket (`/ws`). Frames come from a `HeadlessChannel`: the renderer
+itself when there is no board, or a `Mirror` shadowing a live one. Each
+browser gets, per frame, only the rectangles that changed since the last one
+it was sent (one per band of rows); frames it is too slow for are skipped,
+not queued, so an idle display costs nothing and a slow browser never holds
+the host back.
+
+A `Mirror` replays the command bytes written to the board (`Channel.tap`)
+into its own `HeadlessChannel`, on a thread of its own: the serial path only
+pays for a queue put.
+
+Wire format of a WebSocket message (binary, little endian uint16s): panel
+width and height, then per rectangle x, y, w, h and its w*h RGB565 pixels.
+The server side of RFC 6455 is all that is implemented: the server sends
+binary messages and pings, and ignores what the browser sends. Only the
+preview page's own origin may connect: any page open in the browser could
+reach localhost, and the panel shows session names and host metrics.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import http.server
+import queue
+import struct
+import threading
+from typing import IO
+
+import numpy as np
+
+from arduino_esp32_tft_terminal.lib.headless import Frame, HeadlessChannel
+
+HOST = '127.0.0.1'  # never reachable from elsewhere
+BAND = 16  # rows per dirty-rectangle band
+PING_SECS = 10.0  # an idle stream is pinged, which also detects a gone browser
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+Rect = tuple[int, int, int, int]  # x, y, w, h
+
+PAGE = b'''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>TFT terminal preview</title>
+<style>
+  body { background: #222; margin: 2em; }
+  canvas { image-rendering: pixelated; width: 720px; border: 8px solid #000; }
+</style></head>
+<body><canvas id="panel" width="240" height="135"></canvas>
+<script>
+const canvas = document.getElementById('panel');
+const ctx = canvas.getContext('2d');
+
+function draw(buf) {
+  const v = new DataView(buf);
+  const [w, h] = [v.getUint16(0, true), v.getUint16(2, true)];
+  if (canvas.width !== w || canvas.height !== h) {
+    [canvas.width, canvas.height] = [w, h];
+    canvas.style.width = 3 * w + 'px';
+  }
+  let o = 4;
+  while (o < v.byteLength) {
+    const [x, y, rw, rh] = [0, 2, 4, 6].map(i => v.getUint16(o + i, true));
+    o += 8;
+    const img = ctx.createImageData(rw, rh);
+    for (let i = 0; i < rw * rh; i++, o += 2) {
+      const p = v.getUint16(o, true);
+      const r = p >> 11, g = p >> 5 & 63, b = p & 31;
+      img.data.set([r << 3 | r >> 2, g << 2 | g >> 4, b << 3 | b >> 2, 255], 4 * i);
+    }
+    ctx.putImageData(img, x, y);
+  }
+}
+
+function connect() {
+  const ws = new WebSocket(`ws://${location.host}/ws`);
+  ws.binaryType = 'arraybuffer';
+  ws.onmessage = e => draw(e.data);
+  ws.onclose = () => setTimeout(connect, 1000);  // the host restarted
+}
+connect();
+</script></body></html>
+'''
+
+
+def dirty_rects(prev: Frame | None, frame: Frame) -> list[Rect]:
+    """The rectangles to send to turn `prev` into `frame`: the box of the
+    changed pixels of each band of BAND rows; the whole frame if there is no
+    `prev`."""
+    h, w = frame.shape
+    if prev is None or prev.shape != frame.shape:
+        return [(0, 0, w, h)]
+    changed = prev != frame
+    rects = []
+    for y in range(0, h, BAND):
+        band = changed[y : y + BAND]
+        cols = np.flatnonzero(band.any(axis=0))
+        if len(cols):
+            rows = np.flatnonzero(band.any(axis=1))
+            x0, y0 = int(cols[0]), y + int(rows[0])
+            rects.append((x0, y0, int(cols[-1]) + 1 - x0, y + int(rows[-1]) + 1 - y0))
+    return rects
+
+
+def encode(frame: Frame, rects: list[Rect]) -> bytes:
+    h, w = frame.shape
+    out = [struct.pack('<HH', w, h)]
+    for x, y, rw, rh in rects:
+        out.append(struct.pack('<HHHH', x, y, rw, rh))
+        out.append(frame[y : y + rh, x : x + rw].astype('<u2').tobytes())
+    return b''.join(out)
+
+
+def ws_frame(payload: bytes, opcode: int = 0x2) -> bytes:
+    """A final, unmasked WebSocket frame (0x2: binary, 0x9: ping)."""
+    n = len(payload)
+    if n < 126:
+        head = struct.pack('!BB', 0x80 | opcode, n)
+    elif n < 1 << 16:
+        head = struct.pack('!BBH', 0x80 | opcode, 126, n)
+    else:
+        head = struct.pack('!BBQ', 0x80 | opcode, 127, n)
+    return head + payload
+
+
+def ws_accept(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+
+class PreviewServer:
+    def __init__(self, port: int) -> None:
+        self.frame: Frame | None = None
+        self.version = 0  # of self.frame
+        self.changed = threading.Condition()
+        self.httpd = http.server.ThreadingHTTPServer((HOST, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.preview = self  # type: ignore[attr-defined]
+        self.port = self.httpd.server_address[1]  # the one bound, if port was 0
+
+    def start(self) -> PreviewServer:
+        thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        thread.name = 'preview'
+        thread.start()
+        print(f'Preview on http://localhost:{self.port}/')
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def publish(self, frame: Frame) -> None:
+        """Make `frame` the one shown (cheap: the streams do the work)."""
+        with self.changed:
+            self.frame = frame
+            self.version += 1
+            self.changed.notify_all()
+
+    def stream(self, out: IO[bytes]) -> None:
+        """Send the frames to one browser, as deltas, until it is gone."""
+        sent: Frame | None = None
+        version = 0
+        while True:
+            with self.changed:
+                if not self.changed.wait_for(
+                    lambda: self.version != version, PING_SECS
+                ):
+                    frame = None
+                else:
+                    frame, version = self.frame, self.version
+            try:
+                if frame is None:
+                    out.write(ws_frame(b'', opcode=0x9))
+                elif rects := dirty_rects(sent, frame):
+                    out.write(ws_frame(encode(frame, rects)))
+                    sent = frame
+                out.flush()
+            except OSError:
+                return
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # that of a WebSocket handshake
+
+    def own_origin(self) -> bool:
+        port = self.server.server_address[1]
+        origins = (f'http://localhost:{port}', f'http://{HOST}:{port}')
+        return self.headers.get('Origin') in origins
+
+    def do_GET(self) -> None:
+        if self.path == '/':
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+        elif self.path == '/ws' and 'Sec-WebSocket-Key' in self.headers:
+            if not self.own_origin():
+                self.send_error(403)
+                return
+            self.send_response(101)
+            self.send_header('Upgrade', 'websocket')
+            self.send_header('Connection', 'Upgrade')
+            accept = ws_accept(self.headers['Sec-WebSocket-Key'])
+            self.send_header('Sec-WebSocket-Accept', accept)
+            self.end_headers()
+            self.server.preview.stream(self.wfile)  # type: ignore[attr-defined]
+            self.close_connection = True
+        else:
+            self.send_error(404)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass  # keep the console for the apps
+
+
+class Mirror:
+    """A `HeadlessChannel` shadowing a live board, fed from `Channel.tap`."""
+
+    def __init__(self, server: PreviewServer) -> None:
+        self.shadow = HeadlessChannel()
+        self.shadow.on_frame = server.publish
+        self.lines: queue.SimpleQueue[bytes] = queue.SimpleQueue()
+        thread = threading.Thread(target=self._replay, daemon=True)
+        thread.name = 'mirror'
+        thread.start()
+
+    def tap(self, data: bytes) -> None:
+        self.lines.put(data)
+
+    def _replay(self) -> None:
+        while True:
+            self.shadow.write(self.lines.get())
+            self.shadow.responses.clear()  # the board answers, not the shadow
@@ -0,0 +1,69 @@
+"""App registry: the ids of the apps and where they live, without importing
+them.
+
+The built-in apps are tabulated here, in cycle order. Installed packages can
+add theirs under the `arduino_esp32_tft_terminal.apps` entry-point group, as
+`<kebab-id> = "<module>:<AppClass>"`. An app's module (and whatever it pulls
+in: NumPy, the Claude monitor...) is only imported by `AppEntry.load`, when the
+app is about to run.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.metadata
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from arduino_esp32_tft_terminal.app import App
+
+ENTRY_POINT_GROUP = 'arduino_esp32_tft_terminal.apps'
+
+
+@dataclass(frozen=True)
+class AppEntry:
+    id: str  # kebab-case, as given to --only
+    target: str  # '<module>:<AppClass>'
+
+    def load(self) -> type[App]:
+        module, _, name = self.target.partition(':')
+        return getattr(importlib.import_module(module), name)
+
+
+_APP = 'arduino_esp32_tft_terminal.app.'
+
+BUILTIN_APPS = [
+    AppEntry('claude-monitor', _APP + 'claude_mon:ClaudeMonitor'),
+    AppEntry('monitor-host', _APP + 'monitor_host:MonitorHost'),
+    AppEntry('monitor-cpus', _APP + 'monitor_cpus:MonitorCpus'),
+    AppEntry('monitor-graph', _APP + 'monitor_graph:MonitorGraph'),
+    AppEntry('monitor-rack', _APP + 'monitor_rack:MonitorRack'),
+    AppEntry('asteriods', _APP + 'asteriods:Asteriods'),
+    AppEntry('cube', _APP + 'cube:Cube'),
+    # AppEntry('road', _APP + 'road:Road'),
+    AppEntry('starfield', _APP + 'starfield:Starfield'),
+    AppEntry('tunnel', _APP + 'tunnel:Tunnel'),
+    AppEntry('quix', _APP + 'quix:Quix'),
+    # AppEntry('bumps', _APP + 'bumps:Bumps'),
+    AppEntry('collisions-elastic', _APP + 'collisions:CollisionsElastic'),
+    AppEntry('collisions-gravity', _APP + 'collisions2:CollisionsGravity'),
+    AppEntry('bubbles-soap', _APP + 'collisions3:BubblesSoap'),
+    AppEntry('bubbles-air', _APP + 'collisions4:BubblesAir'),
+    AppEntry('fill', _APP + 'fill:Fill'),
+]
+
+# Shown once at the end of --once; not part of the cycle.
+THATS_ALL = AppEntry('thats-all', _APP + 'thats_all:ThatsAll')
+
+
+def all_apps() -> list[AppEntry]:
+    """The built-in apps, then the installed plugin apps (a plugin cannot
+    shadow a built-in id)."""
+    ids = {a.id for a in BUILTIN_APPS}
+    plugins = [
+        AppEntry(ep.name, ep.value)
+        for ep in importlib.metadata.entry_points(group=ENTRY_POINT_GROUP)
+        if ep.name not in ids
+    ]
+    return BUILTIN_APPS + plugins
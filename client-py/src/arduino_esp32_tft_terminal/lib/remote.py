@@ -0,0 +1,150 @@
+"""Long-lived metrics channel to a remote host, over a single ssh connection.
+
+Instead of one `ssh` (handshake, auth) per metric, one session per authority
+runs a tiny python3 agent on the host. The agent snapshots the watched files
+every interval and streams each snapshot back as one NDJSON line; `read()`
+serves file contents from the latest snapshot, so it plugs into the
+`lib.metrics` collectors as a reader. The session reconnects by itself, with
+exponential backoff, and reads fail (OSError) while the data is stale.
+"""
+
+import base64
+import json
+import shlex
+import subprocess
+import threading
+import time
+from typing import IO, Any, Callable
+
+from arduino_esp32_tft_terminal import config
+
+AGENT = r'''
+import base64, json, sys, time
+interval, paths = float(sys.argv[1]), sys.argv[2:]
+while True:
+    files = {}
+    for p in paths:
+        try:
+            with open(p, 'rb') as f:
+                files[p] = base64.b64encode(f.read()).decode()
+        except OSError:
+            pass
+    sys.stdout.write(json.dumps({'t': time.time(), 'files': files}) + '\n')
+    sys.stdout.flush()
+    time.sleep(interval)
+'''
+
+
+class RemoteSession:
+    _sessions: dict[str, 'RemoteSession'] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, authority: str, paths: tuple[str, ...]) -> 'RemoteSession':
+        """The shared, started session for `authority`."""
+        with cls._lock:
+            session = cls._sessions.get(authority)
+            if session is None:
+                session = cls._sessions[authority] = RemoteSession(authority, paths)
+                session.start()
+            return session
+
+    def __init__(
+        self,
+        authority: str,
+        paths: tuple[str, ...],
+        interval: float | None = None,
+        popen: Callable[..., Any] = subprocess.Popen,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.authority = authority
+        self.paths = paths
+        self.interval = interval or config.MONITOR_REMOTE_INTERVAL
+        self.popen = popen
+        self.sleep = sleep
+        self.clock = clock
+        self.files: dict[str, bytes] | None = None
+        self.received = 0.0  # clock() of the latest snapshot
+        self.connects = 0
+        self.cond = threading.Condition()
+        self.stopped = False
+        self.proc: Any = None
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+
+    def command(self) -> list[str]:
+        agent = ['python3', '-u', '-c', AGENT, str(self.interval), *self.paths]
+        return [
+            'ssh',
+            '-o',
+            'BatchMode=yes',
+            '-o',
+            'ServerAliveInterval=5',
+            self.authority,
+            shlex.join(agent),
+        ]
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def close(self) -> None:
+        self.stopped = True
+        if self.proc is not None:
+            self.proc.kill()
+
+    def read(self, path: str) -> bytes:
+        """Content of `path` in the latest snapshot; waits for the first one
+        up to SERIAL_TIMEOUT, and fails once the data is too old."""
+        max_age = self.interval * 3 + config.SERIAL_TIMEOUT
+        with self.cond:
+            if self.files is None:
+                self.cond.wait_for(
+                    lambda: self.files is not None, config.SERIAL_TIMEOUT
+                )
+            if self.files is None or self.clock() - self.received > max_age:
+                raise OSError(f'{self.authority}: no fresh metrics')
+            if path not in self.files:
+                raise FileNotFoundError(f'{self.authority}:{path}')
+            return self.files[path]
+
+    def _loop(self) -> None:
+        backoff = config.SERIAL_ERROR_RETRY_DELAY
+        while not self.stopped:
+            try:
+                proc = self.proc = self.popen(
+                    self.command(),
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+                self.connects += 1
+                try:
+                    if self._pump(proc.stdout):
+                        backoff = config.SERIAL_ERROR_RETRY_DELAY
+                finally:  # never leave a connection behind, whatever failed
+                    proc.kill()
+                    proc.wait()
+            except Exception as e:
+                print(f'Remote metrics {self.authority}:', e)
+            if self.stopped:
+                break
+            self.sleep(backoff)
+            backoff = min(backoff * 2, config.SERIAL_ERROR_RETRY_MAX_BACKOFF)
+
+    def _pump(self, stream: IO[bytes]) -> bool:
+        """Consume snapshots until the agent ends; True if any arrived. Lines
+        that are not snapshots (e.g. a banner from the remote shell's rc
+        files) are skipped."""
+        got = False
+        for line in stream:
+            try:
+                sample = json.loads(line)
+                files = {p: base64.b64decode(v) for p, v in sample['files'].items()}
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+            with self.cond:
+                self.files = files
+                self.received = self.clock()
+                self.cond.notify_all()
+            got = True
+        return got
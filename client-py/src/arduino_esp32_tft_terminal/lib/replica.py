@@ -0,0 +1,46 @@
+"""Replica boards: one app run, shown on several boards.
+
+The board running the apps (the first one) taps its writes (`Channel.tap`)
+into one `Replica` per other board, whose writer thread sends them on as they
+are: the apps run once, their CPU cost and random state shared, and the
+boards show the same frames. The first board answers the queries and reads
+the buttons; a replica's answers are discarded. A replica that fails is
+reopened, and shows the first board again from the next app on.
+"""
+
+import queue
+import threading
+import time
+
+from arduino_esp32_tft_terminal.lib import ArduinoCommExceptions
+from arduino_esp32_tft_terminal.lib.channel import Channel
+
+
+class Replica:
+    def __init__(self, chan: Channel) -> None:
+        self.chan = chan
+        self.lines: queue.SimpleQueue[bytes] = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.name = f'replica {chan.port}'
+        self.thread.start()
+
+    def tap(self, data: bytes) -> None:
+        self.lines.put(data)
+
+    def flush(self, timeout: float) -> None:
+        """Wait, up to `timeout`, for the writes tapped so far to be sent."""
+        deadline = time.monotonic() + timeout
+        while not self.lines.empty() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def _write(self) -> None:
+        self.chan.open()
+        while True:
+            data = self.lines.get()
+            try:
+                assert self.chan.ser
+                self.chan.ser.reset_input_buffer()  # the first board answers
+                self.chan.write(data)
+            except ArduinoCommExceptions as e:
+                print(f'{self.chan.port}: replica error:', e)
+                self.chan.open()
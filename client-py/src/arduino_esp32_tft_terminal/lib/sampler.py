@@ -0,0 +1,176 @@
+"""Background metrics sampling into fixed-size time series.
+
+A `Sampler` runs the `lib.metrics` collectors of one host every
+MONITOR_SAMPLE_INTERVAL in a daemon thread, and records the samples in
+preallocated NumPy ring buffers. After each sample it publishes a new
+immutable `Snapshot` (chronological copies of the rings) by swapping a single
+reference: readers never lock, never see a half-written sample, and render at
+their own pace. Samplers are shared per host, so the history outlives the
+apps showing it, and board reboots.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.lib import metrics
+
+Floats = NDArray[np.float64]
+
+MEM_FIELDS = ('total', 'used', 'free', 'shared', 'buff/cache', 'available')
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """The sampled history, oldest first; rates and percents are NaN where
+    unknown (first sample, or collector error)."""
+
+    seq: int = 0  # samples taken so far
+    t: Floats = field(default_factory=lambda: np.zeros(0))  # monotonic secs
+    cpu: Floats = field(default_factory=lambda: np.zeros((0, 0)))  # %usr/CPU
+    rx: Floats = field(default_factory=lambda: np.zeros(0))  # bytes/s
+    tx: Floats = field(default_factory=lambda: np.zeros(0))  # bytes/s
+    mem: Floats = field(default_factory=lambda: np.zeros((0, len(MEM_FIELDS))))
+    errors: dict[str, str] = field(default_factory=dict)  # collector -> text
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+
+class Ring:
+    """Preallocated ring buffer of fixed-shape rows."""
+
+    def __init__(self, capacity: int, shape: tuple[int, ...] = ()) -> None:
+        self.data = np.full((capacity, *shape), np.nan)
+        self.head = 0
+        self.count = 0
+
+    def push(self, row: float | Floats) -> None:
+        self.data[self.head] = row
+        self.head = (self.head + 1) % len(self.data)
+        self.count = min(self.count + 1, len(self.data))
+
+    def ordered(self) -> Floats:
+        """Copy of the rows, oldest first."""
+        if self.count < len(self.data):
+            return self.data[: self.count].copy()
+        return np.concatenate((self.data[self.head :], self.data[: self.head]))
+
+
+class Sampler:
+    _samplers: dict[str, 'Sampler'] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, authority: str = '') -> 'Sampler':
+        """The shared, started sampler of a host ('' for this one)."""
+        with cls._lock:
+            sampler = cls._samplers.get(authority)
+            if sampler is None:
+                sampler = Sampler(metrics.reader_for(authority))
+                cls._samplers[authority] = sampler
+                sampler.start()
+            return sampler
+
+    def __init__(
+        self,
+        reader: metrics.Reader,
+        interval: float | None = None,
+        capacity: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.cpu_collector = metrics.CpuCollector(reader)
+        self.net_collector = metrics.NetCollector(reader)
+        self.reader = reader
+        self.interval = interval or config.MONITOR_SAMPLE_INTERVAL
+        self.capacity = capacity or config.MONITOR_HISTORY
+        self.clock = clock
+        self.sleep = sleep
+
+        self.t = Ring(self.capacity)
+        self.cpu = Ring(self.capacity, (0,))
+        self.rx = Ring(self.capacity)
+        self.tx = Ring(self.capacity)
+        self.mem = Ring(self.capacity, (len(MEM_FIELDS),))
+        self.seq = 0
+        self._snapshot = Snapshot()
+
+        self.stopped = False
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    def sample_once(self) -> None:
+        errors: dict[str, str] = {}
+        nan = float('nan')
+
+        try:
+            cpu = np.array(self.cpu_collector.sample())
+        except Exception as e:
+            errors['cpu'] = str(e)
+            cpu = np.full(self.cpu.data.shape[1], nan)
+        if cpu.shape[0] != self.cpu.data.shape[1]:  # first sample, or hotplug
+            self.cpu = self._resized(self.cpu, cpu.shape)
+
+        try:
+            rates = self.net_collector.sample()
+        except Exception as e:
+            errors['net'] = str(e)
+            rates = None
+        rx, tx = rates if rates is not None else (nan, nan)
+
+        try:
+            m = metrics.memory(self.reader)
+            mem = np.array([m[f] for f in MEM_FIELDS], dtype=float)
+        except Exception as e:
+            errors['mem'] = str(e)
+            mem = np.full(len(MEM_FIELDS), nan)
+
+        self.t.push(self.clock())
+        self.cpu.push(cpu)
+        self.rx.push(rx)
+        self.tx.push(tx)
+        self.mem.push(mem)
+        self.seq += 1
+
+        # publish: a single reference swap
+        self._snapshot = Snapshot(
+            self.seq,
+            self.t.ordered(),
+            self.cpu.ordered(),
+            self.rx.ordered(),
+            self.tx.ordered(),
+            self.mem.ordered(),
+            errors,
+        )
+
+    def _resized(self, ring: Ring, shape: tuple[int, ...]) -> Ring:
+        # Rows of another shape are unknown (NaN) in the new ring, which stays
+        # in step with the others: snapshots index all series alike.
+        resized = Ring(self.capacity, shape)
+        resized.head, resized.count = self.t.head, self.t.count
+        return resized
+
+    def _loop(self) -> None:
+        deadline = self.clock()
+        while not self.stopped:
+            self.sample_once()
+            deadline += self.interval
+            now = self.clock()
+            if deadline > now:
+                self.sleep(deadline - now)
+            else:
+                deadline = now
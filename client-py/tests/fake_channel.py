@@ -0,0 +1,225 @@
+"""FakeChannel, the in-memory serial boundary the tests run the client on.
+
+The whole client talks to the board through a single serial boundary,
+`lib.channel.Channel`. `FakeChannel` stands in for it, so everything above
+(CommandExecutor, Gfx, Board) runs as real code with no hardware.
+
+It also models what the link costs, so that tests can pin performance
+budgets: the bytes each way at a baud rate, the firmware's time per command,
+the round trips (reads waiting on a write), all on a simulated clock that the
+frame schedulers can run on (`FakeChannel.drive_schedulers`).
+"""
+
+import collections
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import pytest
+
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
+from arduino_esp32_tft_terminal.lib.channel import wire_text
+
+FAKE_WIDTH = 240
+FAKE_HEIGHT = 135
+BITS_PER_BYTE = 10  # 8N1: start + 8 data + stop
+
+
+@dataclass
+class FrameCost:
+    """What the link spent on one frame: from after a `display`'s answer
+    through the next one."""
+
+    bytes: int  # written
+    round_trips: int
+    seconds: float  # simulated
+
+
+class FrameLimitReached(BaseException):
+    """Ends an app's loop at a FakeChannel's `frame_limit`. Not an Exception,
+    so that the retry and recovery paths let it through."""
+
+
+class FakeChannel:
+    """In-memory stand-in for `lib.channel.Channel`.
+
+    Records every command written, and answers the synchronous request/response
+    protocol. `responses` overrides the answer for an exact command string
+    (used to script button reads, errors, etc.); otherwise queries get canned
+    values and every other command gets `OK`. The first `monitorButtons`
+    streams `button_events` before its `OK`. Writes go to `tap`, and
+    `interrupt` works, as for a Channel.
+
+    Costs: each byte takes BITS_PER_BYTE / `baudrate` seconds on the
+    simulated `clock` (0: a free link), each command its `latency` (seconds,
+    or by command name). Counters run whatever `record`; with `record=False`
+    the lines are not kept in `written`, for long runs. Each `display` closes
+    a `FrameCost` in `frames`; the `frame_limit`-th raises FrameLimitReached.
+    """
+
+    def __init__(
+        self,
+        width: int = FAKE_WIDTH,
+        height: int = FAKE_HEIGHT,
+        responses: dict[str, str] | None = None,
+        button_events: list[str] | None = None,
+        baudrate: int = 0,
+        latency: float | dict[str, float] = 0.0,
+        record: bool = True,
+        frame_limit: int | None = None,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.responses = dict(responses or {})
+        self.ser: Any = object()  # truthy; never touched (methods overridden)
+        self.on_message: str | None = None
+        self.on_fn: Callable[[Any], None] | None = None
+        self.tap: Callable[[bytes], None] | None = None
+        self.interrupted = False
+        self.written: list[str] = []
+        self.writes = 0
+        self._response = 'OK'
+        self.button_events = list(button_events or [])
+        self.pending: list[str] = []  # lines read before the response
+        self.baudrate = baudrate
+        self.latency = latency
+        self.record = record
+        self.frame_limit = frame_limit
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        """Start counting afresh, e.g. past an app's set-up."""
+        self.clock = 0.0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.round_trips = 0
+        self.commands: collections.Counter[str] = collections.Counter()
+        self.frames: list[FrameCost] = []
+        self._frame_start = FrameCost(0, 0, 0.0)
+        self._awaited = False  # a write not answered yet
+        self._displayed = False  # a display not answered yet
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def flush_in(self) -> None:
+        pass
+
+    def set_callback(self, message: str, fn: Callable[[Any], None] | None) -> None:
+        self.on_message = message
+        self.on_fn = fn
+
+    def interrupt(self) -> None:
+        self.interrupted = True
+
+    def write(self, s: str | bytes) -> None:
+        # recorded as text lines, whatever the encoding path; a pipelined
+        # write holds several
+        if self.interrupted:
+            self.interrupted = False
+            raise KeyboardInterrupt()
+        self.writes += 1
+        if self.tap:
+            self.tap(s.encode() + b'\n' if isinstance(s, str) else s)
+        size = len(s) + 1 if isinstance(s, str) else len(s)
+        self.bytes_written += size
+        self._spend(size)
+        self._awaited = True
+        for line in wire_text(s).split('\n'):
+            name = line.partition(' ')[0]
+            self.commands[name] += 1
+            latency = self.latency
+            if isinstance(latency, dict):
+                latency = latency.get(name, 0.0)
+            self.clock += latency
+            if self.record:
+                self.written.append(line)
+            self._response = self._answer(line)
+            if line.startswith('monitorButtons'):
+                self.pending, self.button_events = self.button_events, []
+            self._displayed = self._displayed or name == 'display'
+
+    def read(self) -> str:
+        if self._awaited:
+            self.round_trips += 1
+            self._awaited = False
+        message = self.pending.pop(0) if self.pending else self._response
+        self.bytes_read += len(message) + 2  # println's CR LF
+        self._spend(len(message) + 2)
+        if self._displayed:
+            self._displayed = False
+            self._close_frame()
+        return message
+
+    def _spend(self, size: int) -> None:
+        if self.baudrate:
+            self.clock += size * BITS_PER_BYTE / self.baudrate
+
+    def _close_frame(self) -> None:
+        start = self._frame_start
+        self._frame_start = FrameCost(self.bytes_written, self.round_trips, self.clock)
+        self.frames.append(
+            FrameCost(
+                self.bytes_written - start.bytes,
+                self.round_trips - start.round_trips,
+                self.clock - start.seconds,
+            )
+        )
+        if self.frame_limit and len(self.frames) >= self.frame_limit:
+            raise FrameLimitReached()
+
+    # simulated time
+
+    def now(self) -> float:
+        return self.clock
+
+    def sleep(self, secs: float) -> None:
+        self.clock += max(secs, 0.0)
+
+    def drive_schedulers(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Run the apps' FrameSchedulers on the simulated clock: frames are
+        paced, and skipped, as the modelled link would have them."""
+        init = FrameScheduler.__init__
+
+        def simulated(
+            sched: FrameScheduler[Any], gfx: Any, *args: Any, **kw: Any
+        ) -> None:
+            init(sched, gfx, *args, **kw)
+            sched.clock, sched.sleep = self.now, self.sleep
+
+        monkeypatch.setattr(FrameScheduler, '__init__', simulated)
+
+    # budgets
+
+    def assert_round_trips(self, at_most: int) -> None:
+        assert self.round_trips <= at_most, (
+            f'{self.round_trips} round trips, budget {at_most}'
+        )
+
+    def assert_round_trips_per_frame(self, at_most: int) -> None:
+        worst = max((f.round_trips for f in self.frames), default=0)
+        assert worst <= at_most, f'{worst} round trips in a frame, budget {at_most}'
+
+    def assert_bytes_per_frame(self, at_most: int) -> None:
+        worst = max((f.bytes for f in self.frames), default=0)
+        assert worst <= at_most, f'{worst} bytes in a frame, budget {at_most}'
+
+    def _answer(self, s: str) -> str:
+        if s in self.responses:
+            return self.responses[s]
+        if s == 'width':
+            return str(self.width)
+        if s == 'height':
+            return str(self.height)
+        if s.startswith('getTextBounds'):
+            parts = s.split(' ', 3)
+            text = parts[3] if len(parts) > 3 else ''
+            return f'0 0 {len(text) * 6} 8'  # deterministic glyph metrics
+        if s == 'readButtons':
+            return 'NONE'
+        return 'OK'
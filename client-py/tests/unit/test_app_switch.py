@@ -0,0 +1,37 @@
+"""App switching — a configured board is only reset between apps."""
+
+from typing import Any, Callable
+
+import pytest
+
+from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.app.fill import Fill
+from arduino_esp32_tft_terminal.lib.board import Board
+
+MakeBoard = Callable[..., tuple[Board, Any]]
+HANDSHAKE = {'width', 'height'}
+
+
+def test_next_app_skips_the_handshake(
+    make_board: MakeBoard, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    board, chan = make_board()
+    monkeypatch.setattr(config, 'APPS_TITLE_DURATION', 1)
+    Fill(board)
+    assert HANDSHAKE <= set(chan.written)
+
+    chan.written.clear()
+    Fill(board)
+    assert chan.written[:3] == ['setRotation 3', 'autoDisplay 0', 'reset']
+    assert not HANDSHAKE & set(chan.written)
+    assert not [w for w in chan.written if w.startswith('getTextBounds')]
+    x = (240 - 4 * 6 * 2) // 2  # 'FILL' at text size 2x4, centred
+    assert f'setCursor {x} {(135 - 8 * 4 + 1) // 2}' in chan.written
+
+
+def test_comm_error_reconfigures(make_board: MakeBoard) -> None:
+    board, chan = make_board()
+    Fill(board)
+    chan.written.clear()
+    board.board_comm_error_handler()  # the app's init runs again
+    assert HANDSHAKE <= set(chan.written)
@@ -1,11 +1,20 @@
 """Tier 1 — CLI / config argument parsing."""
 
+import os
+import subprocess
 import sys
 
 import pytest
 
-from arduino_esp32_tft_terminal.app.cube import Cube
+from arduino_esp32_tft_terminal.app import camel_to_kebab
 from arduino_esp32_tft_terminal.lib.args import get_args, get_config_args_specs
+from arduino_esp32_tft_terminal.lib.registry import (
+    BUILTIN_APPS,
+    THATS_ALL,
+    AppEntry,
+)
+
+CUBE = AppEntry('cube', 'arduino_esp32_tft_terminal.app.cube:Cube')
 
 
 def test_config_specs_are_scalar() -> None:
@@ -17,18 +26,37 @@ def test_config_specs_are_scalar() -> None:
 
 def test_only_selects_app(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(sys, 'argv', ['prog', '--only', 'cube'])
-    _, apps = get_args([Cube])
-    assert apps == [Cube]
+    _, apps = get_args([CUBE])
+    assert apps == [CUBE]
 
 
 def test_unknown_app_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(sys, 'argv', ['prog', '--only', 'nope'])
     with pytest.raises(SystemExit):
-        get_args([Cube])
+        get_args([CUBE])
 
 
 def test_version_exits_zero(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(sys, 'argv', ['prog', '--version'])
     with pytest.raises(SystemExit) as exc:
-        get_args([Cube])
+        get_args([CUBE])
     assert exc.value.code == 0
+
+
+def test_registry_ids_match_the_app_classes() -> None:
+    for entry in BUILTIN_APPS + [THATS_ALL]:
+        assert camel_to_kebab(entry.load().__name__) == entry.id
+
+
+def test_cli_imports_no_app() -> None:
+    # --help/--version must not pay for NumPy or the Claude monitor.
+    code = (
+        'import sys, arduino_esp32_tft_terminal.cli; '
+        'print(sorted(m for m in sys.modules if m.startswith("numpy") '
+        'or ".app" in m or m.startswith("claude_busy_monitor")))'
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    out = subprocess.run(
+        [sys.executable, '-c', code], env=env, capture_output=True, text=True
+    )
+    assert out.stdout.strip() == '[]'
@@ -0,0 +1,63 @@
+"""Asteriods render list — only moved, changed or vanished objects are sent."""
+
+from typing import Any, Callable
+
+from arduino_esp32_tft_terminal.app.asteriods import (
+    COLOR_DEFAULT,
+    COLOR_STATUS_TEXT,
+    Render,
+    RenderList,
+)
+from arduino_esp32_tft_terminal.lib.board import Board
+
+MakeBoard = Callable[..., tuple[Board, Any]]
+
+
+def _scene(make_board: MakeBoard) -> tuple[RenderList, Any]:
+    board, chan = make_board()
+    chan.written.clear()
+    return RenderList(board.gfx), chan
+
+
+def test_unchanged_frame_sends_nothing(make_board: MakeBoard) -> None:
+    scene, chan = _scene(make_board)
+    for _ in range(2):
+        scene.add('rock', Render('circle', (50, 50, 5), COLOR_DEFAULT))
+        scene.add('score', Render('text', (0, 0), COLOR_STATUS_TEXT, '0042'))
+        scene.commit()
+    assert chan.written.count('drawCircle 50 50 5 1') == 1
+    assert [w for w in chan.written if w.startswith('print')] == ['print 0042']
+
+
+def test_moved_object_is_erased_then_drawn(make_board: MakeBoard) -> None:
+    scene, chan = _scene(make_board)
+    scene.add('rock', Render('circle', (50, 50, 5), COLOR_DEFAULT))
+    scene.commit()
+    chan.written.clear()
+    scene.add('rock', Render('circle', (52, 50, 5), COLOR_DEFAULT))
+    scene.commit()
+    assert chan.written == ['drawCircle 50 50 5 0', 'drawCircle 52 50 5 1']
+
+
+def test_vanished_object_is_erased(make_board: MakeBoard) -> None:
+    scene, chan = _scene(make_board)
+    scene.add(('shot', 1), Render('pixel', (10, 10), COLOR_DEFAULT))
+    scene.commit()
+    chan.written.clear()
+    scene.commit()
+    assert chan.written == ['drawPixel 10 10 0']
+
+
+def test_overlapped_neighbour_is_repaired(make_board: MakeBoard) -> None:
+    scene, chan = _scene(make_board)
+    scene.add('a', Render('circle', (50, 50, 10), COLOR_DEFAULT))
+    scene.add('b', Render('circle', (55, 50, 10), COLOR_DEFAULT))
+    scene.add('far', Render('pixel', (200, 100), COLOR_DEFAULT))
+    scene.commit()
+    chan.written.clear()
+    scene.add('a', Render('circle', (48, 50, 10), COLOR_DEFAULT))
+    scene.add('b', Render('circle', (55, 50, 10), COLOR_DEFAULT))
+    scene.add('far', Render('pixel', (200, 100), COLOR_DEFAULT))
+    scene.commit()
+    assert 'drawCircle 55 50 10 1' in chan.written  # repainted after the erase
+    assert not any(w.startswith('drawPixel') for w in chan.written)
@@ -3,6 +3,7 @@
 The board reports button state via `readButtons` and pushes events as
 `OK <codes>` on any response (auto-read mode). These tests script those
 answers through `FakeChannel` and assert the client decodes them correctly.
+Blocking waits follow the edge events `monitorButtons` streams instead.
 """
 
 from typing import Any, Callable
@@ -32,3 +33,24 @@ def test_auto_read_accumulates_events(make_board: MakeBoard) -> None:
     board, _ = make_board({'display': 'OK A'})
     board.gfx.display()
     assert board.auto_read_buttons() == {'A'}
+
+
+def test_wait_button_follows_pushed_events(make_board: MakeBoard) -> None:
+    events = ['DOWN B', 'DOWN A', 'UP B', 'UP A', 'DOWN C']
+    board, chan = make_board(button_events=events)
+    chan.written.clear()
+    assert board.wait_button_up(1) == {'A', 'B'}
+    assert chan.written[:2] == ['readButtons', 'monitorButtons 60000 60000']
+
+
+def test_wait_button_skips_buttons_held_on_entry(make_board: MakeBoard) -> None:
+    events = ['PRESSED A', 'DOWN B', 'UP A', 'UP B', 'DOWN C']
+    board, _ = make_board({'readButtons': 'A'}, button_events=events)
+    assert board.wait_button(1) == {'C'}
+
+
+def test_no_stream_when_nothing_to_wait_for(make_board: MakeBoard) -> None:
+    board, chan = make_board()
+    chan.written.clear()
+    assert board.wait_button_up(0) == set()
+    assert chan.written == ['readButtons']
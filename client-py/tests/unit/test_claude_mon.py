@@ -0,0 +1,58 @@
+"""ClaudeMonitor session poller — snapshots move only on visible changes."""
+
+import threading
+
+from claude_busy_monitor import ClaudeSession, ClaudeState
+
+from arduino_esp32_tft_terminal.app.claude_mon import SessionPoller
+
+
+def _session(name: str, state: ClaudeState) -> ClaudeSession:
+    return ClaudeSession(f'/src/{name}', name, f'id-{name}', state)
+
+
+def test_generation_moves_on_state_changes_only() -> None:
+    polls = iter(
+        [
+            [_session('a', ClaudeState.BUSY)],
+            [_session('a', ClaudeState.BUSY)],
+            [_session('a', ClaudeState.IDLE), _session('b', ClaudeState.BUSY)],
+        ]
+    )
+    poller = SessionPoller(lambda: next(polls), 1.0)
+    assert poller.snapshot().generation == 0
+
+    poller.poll_once()
+    first = poller.snapshot()
+    poller.poll_once()
+    assert poller.snapshot() is first  # nothing displayed changed
+
+    poller.poll_once()
+    snap = poller.snapshot()
+    assert snap.generation == 2
+    assert [s.name for s in snap.sessions] == ['a', 'b']
+    assert snap.counts[ClaudeState.BUSY] == 1 and snap.counts[ClaudeState.IDLE] == 1
+    assert first.counts[ClaudeState.BUSY] == 1  # published snapshots are frozen
+
+
+def test_thread_survives_discovery_errors() -> None:
+    done = threading.Event()
+    calls: list[int] = []
+
+    def fetch() -> list[ClaudeSession]:
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError('/proc vanished')
+        return [_session('a', ClaudeState.ASKING)]
+
+    poller = SessionPoller(fetch, 0.01)
+
+    def sleep(secs: float) -> None:
+        if len(calls) >= 2:
+            poller.stop()
+            done.set()
+
+    poller.sleep = sleep
+    poller.start()
+    assert done.wait(5)
+    assert poller.snapshot().generation == 1
@@ -0,0 +1,50 @@
+"""Clipping — the bulk variants agree with the scalar ones, row by row."""
+
+import numpy as np
+import pytest
+
+from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.lib import clip
+
+# (function, number of geometry args)
+CASES = [
+    ('cull_point', 2),
+    ('cull_rect', 4),
+    ('cull_circle', 3),
+    ('cull_triangle', 6),
+    ('trim_hspan', 3),
+    ('trim_vspan', 3),
+    ('trim_rect', 4),
+    ('trim_line', 4),
+]
+
+
+@pytest.fixture(autouse=True)
+def panel():
+    config.WIDTH, config.HEIGHT = 240, 135
+    yield
+    config.WIDTH = config.HEIGHT = 0
+
+
+@pytest.mark.parametrize('func, n', CASES)
+def test_many_matches_scalar(func: str, n: int) -> None:
+    scalar, many = getattr(clip, func), getattr(clip, f'{func}_many')
+    # Geometry around the panel, then a last column clipping leaves alone.
+    rows = np.random.default_rng(7).integers(-300, 400, (2000, n + 1))
+
+    expected = []
+    for row in rows.tolist():
+        geom = scalar(*row[:-1])
+        if geom is False:  # not culled
+            expected.append(row)
+        elif geom not in (True, None):
+            expected.append([*geom, row[-1]])
+    assert many(rows, tuple(range(n))).tolist() == expected
+
+
+def test_nothing_is_clipped_before_configure() -> None:
+    config.WIDTH = config.HEIGHT = 0
+    assert not clip.cull_point(-1, -1)
+    assert clip.trim_line(-5, 0, 500, 0) == (-5, 0, 500, 0)
+    rows = np.array([[-5, -5, 1, 1]])
+    assert clip.trim_rect_many(rows, (0, 1, 2, 3)) is rows
@@ -2,11 +2,15 @@
 
 Complements test_protocol.py (which drives the Gfx facade) by exercising the
 generated `CommandLine` directly: bool serialisation, optional-arg defaults,
-and int-tuple return parsing.
+int-tuple return parsing, the bulk `*_many` variants, spec'd arg ranges and
+clipping to the (fake, 240x135) panel.
 """
 
 from typing import Any, Callable
 
+import numpy as np
+import pytest
+
 from arduino_esp32_tft_terminal.lib.board import Board
 from arduino_esp32_tft_terminal.lib.command_line_autogen import CommandLine
 
@@ -43,3 +47,78 @@ def test_optional_defaults_are_sent(make_board: MakeBoard) -> None:
 def test_ints_return_is_a_tuple(make_board: MakeBoard) -> None:
     cmd, _ = _command_line(make_board, {'getTextBounds 1 2 Hi': '1 2 12 8'})
     assert cmd.get_text_bounds(1, 2, 'Hi') == (1, 2, 12, 8)
+
+
+def test_bulk_variant_pipelines_rows(make_board: MakeBoard) -> None:
+    cmd, chan = _command_line(make_board)
+    chan.written.clear()
+    writes = chan.writes
+    x = np.arange(20)
+    cmd.draw_line_many(x, 0, x + 1, [5] * 20, 1)  # arrays and scalars broadcast
+    assert chan.written[:2] == ['drawLine 0 0 1 5 1', 'drawLine 1 0 2 5 1']
+    assert len(chan.written) == 20
+    assert chan.writes - writes == 2  # 16 lines, then 4
+
+    cmd.draw_circle_many(np.empty(0), np.empty(0), np.empty(0), 1)
+    assert len(chan.written) == 20
+
+
+def test_bulk_variant_checks_ranges(make_board: MakeBoard) -> None:
+    cmd, chan = _command_line(make_board)
+    chan.written.clear()
+    with pytest.raises(ValueError, match='arg 0 of row 1 is 40000'):
+        cmd.draw_pixel_many([0, 40000], 0, 1)  # x is an int16
+    assert chan.written == []
+
+
+def test_ranged_args_are_checked(make_board: MakeBoard) -> None:
+    cmd, chan = _command_line(make_board)
+    chan.written.clear()
+    with pytest.raises(ValueError, match='g is 256, out of 0..255'):
+        cmd.set_fg_color(0, 256, 0)
+    assert chan.written == []
+
+
+def test_only_drawing_commands_have_a_bulk_variant() -> None:
+    assert hasattr(CommandLine, 'fill_rect_many')
+    for name in ('set_fg_color', 'set_rotation', 'fill_screen', 'set_cursor'):
+        assert hasattr(CommandLine, name) and not hasattr(CommandLine, f'{name}_many')
+
+
+def test_off_screen_primitives_are_culled_or_trimmed(make_board: MakeBoard) -> None:
+    board, chan = make_board()
+    board.configure()  # learns the panel size
+    cmd = CommandLine(board.command)
+    chan.written.clear()
+    cmd.draw_pixel(240, 0, 1)
+    cmd.draw_circle(-20, 50, 10, 1)
+    cmd.fill_triangle(0, -1, 100, -5, 50, -9, 1)
+    cmd.draw_line(-10, -10, -1, 200, 1)
+    assert chan.written == []
+
+    cmd.fill_rect(-5, 130, 20, -10, 0)  # negative height grows upwards
+    cmd.draw_fast_h_line(200, 3, 100, 1)
+    cmd.draw_line(-120, 0, 120, 120, 1)
+    cmd.draw_rect(-5, -5, 10, 10, 1)  # culled only: its edges must not move
+    assert chan.written == [
+        'fillRect 0 121 15 10 0',
+        'drawFastHLine 200 3 40 1',
+        'drawLine 0 60 120 120 1',
+        'drawRect -5 -5 10 10 1',
+    ]
+
+
+def test_bulk_variant_clips_rows(make_board: MakeBoard) -> None:
+    board, chan = make_board()
+    board.configure()
+    cmd = CommandLine(board.command)
+    chan.written.clear()
+    cmd.draw_line_many([-120, 300, 5], [0, 0, 5], [120, 400, 6], [120, 9, 6], 1)
+    cmd.fill_circle_many([-11, -10], 0, 10, 1)
+    cmd.fill_rect_many([230, 250], 0, 20, 5, 1)
+    assert chan.written == [
+        'drawLine 0 60 120 120 1',
+        'drawLine 5 5 6 6 1',
+        'fillCircle -10 0 10 1',
+        'fillRect 230 0 10 5 1',
+    ]
@@ -0,0 +1,108 @@
+"""Cube NumPy pipeline — rotation, visibility, and OBJ meshes."""
+
+import math
+from typing import Any, Callable
+
+import numpy as np
+
+from arduino_esp32_tft_terminal.app.cube import Cube, Mesh, rotation_matrix
+from arduino_esp32_tft_terminal.lib.board import Board
+
+MakeBoard = Callable[..., tuple[Board, Any]]
+
+OBJ_CUBE = """
+# unit cube, y-up, counter-clockwise faces
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+v 0 0 1
+v 1 0 1
+v 1 1 1
+v 0 1 1
+f 5/1 6/2 7/3 8/4
+f 1 4 3 2
+f 1 5 8 4
+f 2 3 7 6
+f 1 2 6 5
+f 4 8 7 3
+"""
+
+OBJ_QUAD = """
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+f 1 2 3 4
+"""
+
+
+def _rotate_point(p: tuple[float, float, float], a: tuple[float, float, float]):
+    # the former per-point rotation, x then y then z
+    x, y, z = p
+    x, y, z = (
+        x,
+        y * math.cos(a[0]) - z * math.sin(a[0]),
+        y * math.sin(a[0]) + z * math.cos(a[0]),
+    )
+    x, y, z = (
+        z * math.sin(a[1]) + x * math.cos(a[1]),
+        y,
+        z * math.cos(a[1]) - x * math.sin(a[1]),
+    )
+    x, y, z = (
+        x * math.cos(a[2]) - y * math.sin(a[2]),
+        x * math.sin(a[2]) + y * math.cos(a[2]),
+        z,
+    )
+    return x, y, z
+
+
+def test_composed_matrix_matches_per_axis_rotations() -> None:
+    angles = (0.3, -1.1, 2.4)
+    m = rotation_matrix(*angles)
+    for p in Mesh.cube().vertices.tolist():
+        assert np.allclose(m @ p, _rotate_point(p, angles))
+
+
+def test_cube_facing_viewer_shows_one_face() -> None:
+    mesh = Mesh.cube()
+    view = mesh.project(np.eye(3), 10, 100, 50)
+    assert view.visible.tolist() == [False, False, True, False, False, False]
+    front = {tuple(e) for e in mesh.edges[view.usage == 1].tolist()}
+    assert front == {(2, 3), (3, 7), (6, 7), (2, 6)}
+    assert view.xy[7].tolist() == [110, 60]
+
+
+def test_turned_cube_shows_three_faces_and_hides_three_edges() -> None:
+    mesh = Mesh.cube()
+    view = mesh.project(rotation_matrix(0.5, 0.6, 0.1), 10, 0, 0)
+    assert view.visible.sum() == 3
+    assert (view.usage == 0).sum() == 3  # the edges around the far corner
+    assert (view.usage == 1).sum() == 6  # the contour
+
+
+def test_obj_mesh_is_fitted_and_faces_outward() -> None:
+    mesh = Mesh.from_obj(OBJ_CUBE)
+    assert len(mesh.edges) == 12
+    assert np.allclose(np.abs(mesh.vertices), 1)
+    view = mesh.project(np.eye(3), 10, 0, 0)
+    assert view.visible.tolist() == [True, False, False, False, False, False]
+
+
+def test_open_mesh_seen_from_behind_is_cleared(make_board: MakeBoard) -> None:
+    board, chan = make_board()
+    app = Cube(board)
+    app.mesh = Mesh.from_obj(OBJ_QUAD)
+    app.has_last = True
+    app.last_x0 = app.last_y0 = app.last_x1 = app.last_y1 = 0
+    app.hue = 0
+    app.LINES_RGB = 96, 255, 96
+    view = app.mesh.project(rotation_matrix(0, math.pi, 0), 10, 100, 50)
+    assert view.visible.tolist() == [False] and not view.usage.any()
+
+    for smart_erase, contour in ((False, False), (True, False), (True, True)):
+        chan.written.clear()
+        app.draw_shaded(view, smart_erase, contour)
+        assert [w for w in chan.written if w.split()[0] != 'setFgColor'] == ['clear']
+    assert not app.has_last
@@ -0,0 +1,122 @@
+"""Headless rendering — protocol commands drawn into a framebuffer, saved as
+PNG."""
+
+import re
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.app.fill import Fill
+from arduino_esp32_tft_terminal.lib import command_line_autogen, font5x7
+from arduino_esp32_tft_terminal.lib.board import Board
+from arduino_esp32_tft_terminal.lib.headless import (
+    HeadlessChannel,
+    rgb565,
+    to_rgb,
+    write_apng,
+    write_png,
+)
+
+RED = rgb565(255, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def no_board_yet(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name, value in (('WIDTH', 0), ('HEIGHT', 0), ('APPS_TITLE_DURATION', 0)):
+        monkeypatch.setattr(config, name, value)
+    monkeypatch.setattr(config, 'APPS_INTERFRAME_DELAY_MS', 0)
+
+
+def make_headless(**kwargs: object) -> tuple[Board, HeadlessChannel]:
+    chan = HeadlessChannel(**kwargs)  # type: ignore[arg-type]
+    board = Board(chan)
+    board.configure()
+    return board, chan
+
+
+def chunks(png: bytes) -> list[tuple[bytes, bytes]]:
+    out, i = [], 8
+    while i < len(png):
+        (n,) = struct.unpack('>I', png[i : i + 4])
+        out.append((png[i + 4 : i + 8], png[i + 8 : i + 8 + n]))
+        i += 12 + n
+    return out
+
+
+def test_every_protocol_command_is_interpreted() -> None:
+    source = Path(command_line_autogen.__file__).read_text()
+    names = set(re.findall(r"do_(?:command|many)\(\s*b'(\w+)", source))
+    assert names <= set(HeadlessChannel().handlers)
+
+
+def test_drawing_shows_on_display() -> None:
+    board, chan = make_headless()
+    cmd = board.gfx.cmd
+    cmd.set_fg_color(255, 0, 0)
+    cmd.fill_rect(10, 20, 3, 2, 1)
+    cmd.draw_line(0, 0, 4, 2, 1)
+    assert not chan.snapshot().any()  # buffered until display
+
+    cmd.display()
+    frame = chan.snapshot()
+    assert (frame[20:22, 10:13] == RED).all()
+    assert [frame[y, x] for x, y in ((0, 0), (1, 0), (2, 1), (3, 1), (4, 2))] == [
+        RED
+    ] * 5
+    assert np.count_nonzero(frame) == 6 + 5
+    assert chan.frame_count == 1
+
+
+def test_text_is_printed_in_the_classic_font() -> None:
+    board, chan = make_headless()
+    cmd = board.gfx.cmd
+    cmd.set_text_size(1, 2)
+    cmd.set_cursor(3, 4)
+    cmd.print('Hi!')
+    cmd.display()
+    lit = chan.snapshot() != 0
+    assert (lit[4:20, 3:21] == font5x7.render('Hi!', 1, 2)).all()
+    assert lit.sum() == font5x7.render('Hi!', 1, 2).sum()
+    assert cmd.get_text_bounds(0, 0, 'Hi!') == (0, 0, 18, 16)
+    assert (cmd.get_cursor_x(), cmd.get_cursor_y()) == (21, 4)
+
+
+def test_rotation_turns_the_coordinates() -> None:
+    chan = HeadlessChannel()
+    # as wire lines: the client clips to the landscape panel
+    chan.write('setRotation 1\ndrawPixel 0 0 1\n')
+    chan.write('setRotation 0\nfillRect 5 0 1 240 1\n')  # a portrait column
+    assert chan.read() == 'OK'
+    frame = chan.snapshot()
+    assert frame[134, 239] == 0xFFFF  # half a turn from rotation 3
+    assert np.count_nonzero(frame) == 1 + 240
+    assert (frame != 0).all(axis=1).sum() == 1  # the column is a panel row
+
+
+def test_frames_are_saved_as_png(tmp_path: Path) -> None:
+    board, chan = make_headless(out_dir=tmp_path, keep=2)
+    board.gfx.cmd.fill_rect(0, 0, 2, 1, 1)
+    board.gfx.cmd.display()
+    png = (tmp_path / 'frame-000001.png').read_bytes()
+    (tag, ihdr), (_, idat) = chunks(png)[:2]
+    assert tag == b'IHDR' and struct.unpack('>II', ihdr[:8]) == (240, 135)
+    rows = np.frombuffer(zlib.decompress(idat), np.uint8).reshape(135, -1)
+    assert (rows[:, 1:].reshape(135, 240, 3) == to_rgb(chan.snapshot())).all()
+    assert rows[0, 1:7].tolist() == [255] * 6
+
+    write_png(tmp_path / 'last.png', chan.frames[-1])
+    write_apng(tmp_path / 'anim.png', [chan.frames[-1]] * 3)
+    tags = [t for t, _ in chunks((tmp_path / 'anim.png').read_bytes())]
+    assert tags.count(b'fcTL') == 3 and tags.count(b'fdAT') == 2
+
+
+def test_an_app_runs_headless(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    chan = HeadlessChannel(out_dir=tmp_path)
+    monkeypatch.setattr(config, 'APPS_TITLE_DURATION', 1)
+    Fill(Board(chan))
+    assert chan.frame_count and len(list(tmp_path.glob('*.png'))) == chan.frame_count
+    assert chan.snapshot().any()  # the title
@@ -0,0 +1,94 @@
+"""Tier 1 — /proc and utmp collectors, fed canned file contents."""
+
+import struct
+
+from arduino_esp32_tft_terminal.lib import metrics
+
+NET_DEV = b"""Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo: %d 10 0 0 0 0 0 0 %d 10 0 0 0 0 0 0
+  eth0: 1000 10 0 0 0 0 0 0 500 10 0 0 0 0 0 0
+"""
+
+MEMINFO = b"""MemTotal:        6158152 kB
+MemFree:         4840356 kB
+MemAvailable:    5633756 kB
+Buffers:           31760 kB
+Cached:           926136 kB
+SwapCached:            0 kB
+Shmem:              9484 kB
+SReclaimable:      65444 kB
+"""
+
+
+def test_cpu_percentages_are_deltas_between_samples() -> None:
+    stats = iter(
+        [
+            b'cpu  0 0 0 0\ncpu0 100 0 0 100 0 0 0 0 20 0\n',
+            b'cpu  0 0 0 0\ncpu0 150 0 0 150 0 0 0 0 30 0\n',
+        ]
+    )
+    cpu = metrics.CpuCollector(lambda path: next(stats))
+    assert cpu.sample() == [40.0]  # since boot: (100 - 20) / 200
+    assert cpu.sample() == [40.0]  # (50 - 10) / 100
+
+
+def snapshots(*files: dict[str, bytes]) -> metrics.Reader:
+    """A reader serving each snapshot until its /proc/net/dev is read."""
+    queue = list(files)
+
+    def read(path: str) -> bytes:
+        data = queue[0][path]
+        if path == '/proc/net/dev' and len(queue) > 1:
+            queue.pop(0)
+        return data
+
+    return read
+
+
+def test_net_rates_sum_all_interfaces() -> None:
+    net = metrics.NetCollector(
+        snapshots(
+            {'/proc/uptime': b'10.00 0\n', '/proc/net/dev': NET_DEV % (0, 0)},
+            {'/proc/uptime': b'12.00 0\n', '/proc/net/dev': NET_DEV % (4000, 2000)},
+        )
+    )
+    assert net.sample() is None
+    assert net.sample() == (2000.0, 1000.0)
+
+
+def test_net_rates_hold_over_a_repeated_snapshot() -> None:
+    first = {'/proc/uptime': b'10.00 0\n', '/proc/net/dev': NET_DEV % (0, 0)}
+    second = {'/proc/uptime': b'10.50 0\n', '/proc/net/dev': NET_DEV % (500, 0)}
+    third = {'/proc/uptime': b'11.00 0\n', '/proc/net/dev': NET_DEV % (1000, 0)}
+    net = metrics.NetCollector(snapshots(first, second, second, third))
+    assert net.sample() is None
+    assert net.sample() == (1000.0, 0.0)
+    assert net.sample() == (1000.0, 0.0)  # not 0, then a 2000 spike
+    assert net.sample() == (1000.0, 0.0)
+
+
+def test_memory_as_free_shows_it() -> None:
+    mem = metrics.memory(lambda path: MEMINFO)
+    assert list(mem) == ['total', 'used', 'free', 'shared', 'buff/cache', 'available']
+    gb = [v // 10**9 for v in mem.values()]
+    assert gb == [6, 0, 4, 0, 1, 5]
+
+
+def test_users_are_user_process_utmp_records() -> None:
+    def record(ut_type: int) -> bytes:
+        return struct.pack('<i', ut_type).ljust(metrics.UTMP_RECORD_SIZE, b'\0')
+
+    utmp = record(2) + record(7) + record(8) + record(7)  # boot, 2 users, dead
+    assert metrics.nb_users(lambda path: utmp) == 2
+
+
+def test_uptime_and_clock() -> None:
+    assert metrics.format_uptime(59) == 'up 0 minutes'
+    assert (
+        metrics.format_uptime(8 * 86400 + 3600 + 60)
+        == 'up 1 week, 1 day, 1 hour, 1 minute'
+    )
+    files = {'/proc/stat': b'cpu 0\nbtime 1700000000\n', '/proc/uptime': b'60.5 12.0\n'}
+    now = metrics.now(files.__getitem__)
+    assert now.timestamp() == 1700000060.5
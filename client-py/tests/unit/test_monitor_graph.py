@@ -0,0 +1,57 @@
+"""Tier 1 — MonitorGraph autoscaling and pixel-column decimation."""
+
+import numpy as np
+
+from arduino_esp32_tft_terminal.app.monitor_graph import (
+    SCALE_HALF_LIFE,
+    AutoScale,
+    decimate,
+    format_rate,
+    nice_ceil,
+)
+from arduino_esp32_tft_terminal.lib.sampler import Snapshot
+
+
+def test_nice_ceil_rounds_up_to_1_2_5() -> None:
+    values = [0.3, 1, 1.5, 3000, 5000.1, 99]
+    assert [nice_ceil(v) for v in values] == [0.5, 1, 2, 5000, 10000, 100]
+    assert format_rate(20000) == '20kB/s' and format_rate(2e6) == '2MB/s'
+
+
+def test_scale_grows_at_once_and_shrinks_with_hysteresis() -> None:
+    scale = AutoScale(1000.0)
+    assert not scale.update(0, 500)  # under the floor
+    assert scale.update(1, 30000) and scale.scale == 50000
+    assert not scale.update(2, 45000)  # within the band: no change
+
+    # the peak decays; no flapping while it is over a quarter of the scale
+    t = 2 + SCALE_HALF_LIFE
+    assert not scale.update(t, 0) and scale.scale == 50000
+    changed = [scale.update(t + n, 0) for n in range(1, 200)]
+    assert changed.count(True) == 4  # 50000 -> 20000 -> 5000 -> 2000 -> 1000
+    assert scale.scale == 1000
+
+
+def test_scale_is_capped() -> None:
+    scale = AutoScale(10.0, 100.0)
+    scale.update(0, 99.5)
+    assert scale.scale == 100
+
+
+def test_decimate_keeps_min_max_and_last_per_column() -> None:
+    nan = float('nan')
+    snap = Snapshot(
+        4,
+        np.arange(4.0),
+        np.array([[10.0, 50.0], [30.0, 20.0], [nan, nan], [40.0, 5.0]]),
+        np.array([100.0, 300.0, nan, 200.0]),
+        np.array([1.0, 2.0, 3.0, nan]),
+    )
+    column = decimate(snap, np.arange(4))
+    assert column.cpu is not None and column.net is not None
+    low, high, last = column.cpu  # per rank: CPUs are sorted in each sample
+    assert low.tolist() == [5, 30] and high.tolist() == [20, 50]
+    assert last.tolist() == [5, 40]
+    assert [v.tolist() for v in column.net] == [[100, 1], [300, 2], [300, 2]]
+
+    assert decimate(snap, np.array([2])) == decimate(Snapshot(), np.array([], int))
@@ -1,46 +1,46 @@
-"""Tier 1 — mpstat-JSON parsing in the CPU monitor.
+"""Tier 1 — /proc/stat parsing in the CPU monitor.
 
-The parse is exercised with captured-shape fixture output; the board is faked
-(via `fake_board`) and the shell call is monkeypatched, so neither hardware nor
-`mpstat` is needed.
+The parse is exercised with captured-shape fixture content; the board is faked
+(via `fake_board`) and the app reads a sampler fed with canned files, so
+neither hardware nor a particular host is needed.
 """
 
-import json
-
 import pytest
 
 from arduino_esp32_tft_terminal.app.monitor_cpus import MonitorCpus
 from arduino_esp32_tft_terminal.lib.board import Board
+from arduino_esp32_tft_terminal.lib.sampler import Sampler
 
-MPSTAT_JSON = json.dumps(
-    {
-        'sysstat': {
-            'hosts': [
-                {
-                    'statistics': [
-                        {
-                            'cpu-load': [
-                                {'cpu': 'all', 'usr': 30.0},
-                                {'cpu': '0', 'usr': 10.4},
-                                {'cpu': '1', 'usr': 50.6},
-                            ]
-                        }
-                    ]
-                }
-            ]
-        }
-    }
-)
+STAT_T0 = b"""cpu  100 0 100 800 0 0 0 0 0 0
+cpu0 50 0 50 400 0 0 0 0 0 0
+cpu1 50 0 50 400 0 0 0 0 0 0
+intr 12345
+btime 1700000000
+"""
+STAT_T1 = b"""cpu  300 0 100 1100 0 0 0 0 0 0
+cpu0 60 0 50 490 0 0 0 0 0 0
+cpu1 240 0 50 610 0 0 0 0 0 0
+intr 12399
+btime 1700000000
+"""
 
 
 def test_parses_per_cpu_percentages(
     fake_board: Board, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     app = MonitorCpus(fake_board)
-    monkeypatch.setattr(app, 'shell_command', lambda *a, **k: MPSTAT_JSON)
-    out = ' '.join(app.get_cpus_pcents())
-    assert '51' in out  # round(50.6)
-    assert '10' in out  # round(10.4)
+    stats = iter([STAT_T0, STAT_T1])
+
+    def reader(path: str) -> bytes:
+        if path != '/proc/stat':
+            raise FileNotFoundError(path)
+        return next(stats)
+
+    sampler = Sampler(reader, capacity=8)
+    sampler.sample_once()  # since boot
+    sampler.sample_once()
+    out = ' '.join(app.get_cpus_pcents(sampler.snapshot()))
+    assert out.split() == ['48', '10']  # 190/400 and 10/100, sorted
 
 
 def test_reports_error_on_failure(
@@ -48,8 +48,9 @@ def test_reports_error_on_failure(
 ) -> None:
     app = MonitorCpus(fake_board)
 
-    def boom(*a: object, **k: object) -> str:
-        raise RuntimeError('no mpstat')
+    def boom(path: str) -> bytes:
+        raise OSError('no /proc')
 
-    monkeypatch.setattr(app, 'shell_command', boom)
-    assert app.get_cpus_pcents() == ['<CPUs: mpstat error>']
+    sampler = Sampler(boom, capacity=8)
+    sampler.sample_once()
+    assert app.get_cpus_pcents(sampler.snapshot()) == ['<CPUs: /proc/stat error>']
@@ -0,0 +1,66 @@
+"""Tier 1 — MonitorRack host rows: parsing, staleness and sparklines."""
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.app.monitor_rack import (
+    MonitorRack,
+    host_label,
+    parse_hosts,
+    sparkline,
+    summarize,
+)
+from arduino_esp32_tft_terminal.lib import metrics
+from arduino_esp32_tft_terminal.lib.sampler import Snapshot
+
+GB = 10.0**9
+
+
+def _snapshot(t: float, errors: dict[str, str] | None = None) -> Snapshot:
+    nan = float('nan')
+    return Snapshot(
+        2,
+        np.array([t - 1, t]),
+        np.array([[10.0, 20.0], [30.0, 60.0]]),
+        np.array([nan, 1000.0]),
+        np.array([nan, 500.0]),
+        np.array([[8 * GB, 2 * GB, 0, 0, 0, 0]] * 2),
+        errors or {},
+    )
+
+
+def test_hosts_list() -> None:
+    assert parse_hosts('') == ['']
+    assert parse_hosts('pi@a, b') == ['pi@a', 'b']
+    assert [host_label(h) for h in ('', 'pi@rack-node-12')] == ['local', 'rack-nod']
+
+
+def test_rows_summarize_fresh_data_only() -> None:
+    summary = summarize(_snapshot(100.0), 101.0, 5.0)
+    assert summary is not None
+    assert (summary.cpu, summary.mem) == (45, 25)
+    assert summary.traffic.tolist() == [0, 1500]
+
+    assert summarize(Snapshot(), 0.0, 5.0) is None  # nothing yet
+    assert summarize(_snapshot(100.0), 106.0, 5.0) is None  # host hangs
+    assert summarize(_snapshot(100.0, {'cpu': 'down'}), 101.0, 5.0) is None
+
+
+def test_sparkline_fits_the_box() -> None:
+    segments = sparkline(np.array([0.0, 5.0, 10.0, 0.0, 5.0]), 100, 20, 3, 11)
+    assert segments.tolist() == [[100, 20, 101, 30], [101, 30, 102, 25]]
+    assert sparkline(np.zeros(1), 0, 0, 10, 10).shape == (0, 4)
+
+
+def test_rack_opens_no_session_to_the_monitored_host(
+    fake_board: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def host_reader() -> metrics.Reader:
+        raise AssertionError('ssh session to MONITOR_SSH_AUTHORITY')
+
+    monkeypatch.setattr(config, 'MONITOR_SSH_AUTHORITY', 'pi@elsewhere')
+    monkeypatch.setattr(metrics, 'host_reader', host_reader)
+    MonitorRack(fake_board)
@@ -0,0 +1,135 @@
+"""Multi-board fan-out — discovery, app dealing, mirroring, and per-board
+isolation."""
+
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from arduino_esp32_tft_terminal import cli, config
+from arduino_esp32_tft_terminal.app import App
+from arduino_esp32_tft_terminal.lib.board import Board
+from arduino_esp32_tft_terminal.lib.channel import discover_ports, serial_ports
+from arduino_esp32_tft_terminal.lib.registry import AppEntry
+
+
+class Probe(App):
+    boards: list[Board] = []
+
+    def _run(self) -> bool:
+        Probe.boards.append(self.board)
+        return False
+
+
+class Flaky(App):
+    def _run(self) -> bool:
+        raise RuntimeError('flaky cable')
+
+
+class Spinner(App):
+    def _run(self) -> bool:
+        while True:
+            self.gfx.fill_rect(0, 0, 1, 1, 1)
+
+
+PROBE = AppEntry('probe', f'{__name__}:Probe')
+FLAKY = AppEntry('flaky', f'{__name__}:Flaky')
+SPINNER = AppEntry('spinner', f'{__name__}:Spinner')
+
+
+def wait_for(condition: Any) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_ports_are_discovered_in_numeric_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ('ttyACM10', 'ttyACM2', 'ttyACMx', 'ttyUSB0'):
+        (tmp_path / name).touch()
+    base = str(tmp_path / 'ttyACM')
+    assert discover_ports(base) == [base + '2', base + '10']
+
+    monkeypatch.setattr(config, 'SERIAL_PORTS', '/dev/a, /dev/b')
+    assert serial_ports() == ['/dev/a', '/dev/b']
+    monkeypatch.setattr(config, 'SERIAL_PORTS', '')
+    assert serial_ports() == []
+
+
+def test_apps_are_shared_or_run_on_each() -> None:
+    a, b, c = (AppEntry(i, '') for i in 'abc')
+    assert cli.deal_apps([a, b, c], 2, 'share') == [[a, c], [b]]
+    assert cli.deal_apps([a], 3, 'share') == [[a], [a], [a]]
+    assert cli.deal_apps([a, b], 2, 'each') == [[a, b], [a, b]]
+
+
+def test_mirrored_boards_replay_the_first_one(
+    make_board: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    board, first = make_board()
+    replicas: list[Any] = []
+
+    def make_all(port: str, tap: Any = None) -> tuple[Any, Board]:
+        first.tap = tap
+        return first, board
+
+    def channel(port: str) -> Any:
+        chan = make_board()[1]
+        chan.port = port
+        chan.ser = SimpleNamespace(reset_input_buffer=lambda: None)
+        replicas.append(chan)
+        return chan
+
+    monkeypatch.setattr(config, 'MULTI_BOARD', 'mirror')
+    monkeypatch.setattr(cli, 'make_all', make_all)
+    monkeypatch.setattr(cli, 'Channel', channel)
+    Probe.boards = []
+
+    cli.run_boards(['p0', 'p1', 'p2'], [PROBE], once=True)
+
+    assert Probe.boards == [board]  # the app ran once
+    assert len(replicas) == 2
+    for replica in replicas:
+        wait_for(lambda: replica.written == first.written)
+
+
+def test_a_failing_board_does_not_stop_the_others(
+    make_board: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    made = {port: make_board() for port in ('p0', 'p1')}
+    monkeypatch.setattr(cli, 'make_all', lambda port, tap: made[port][::-1])
+    Probe.boards = []
+
+    cli.run_boards(['p0', 'p1'], [FLAKY, PROBE], once=True)
+
+    good, flaky = made['p1'], made['p0']
+    assert Probe.boards == [good[0]]
+    assert any('flaky cable' in w for w in flaky[1].written)  # shown by fatal
+    assert not any('flaky' in w for w in good[1].written)
+
+
+def test_ctrl_c_stops_every_board(
+    make_board: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    made = {port: make_board() for port in ('p0', 'p1')}
+    monkeypatch.setattr(cli, 'make_all', lambda port, tap: made[port][::-1])
+    monkeypatch.setattr(cli, 'suppress_ctrl_c', lambda: None)
+    join = threading.Thread.join
+
+    def ctrl_c(thread: threading.Thread, timeout: float | None = None) -> None:
+        if timeout is None:  # the wait for the boards: interrupt it
+            wait_for(lambda: all(chan.writes > 10 for _, chan in made.values()))
+            raise KeyboardInterrupt()
+        join(thread, timeout)
+
+    monkeypatch.setattr(threading.Thread, 'join', ctrl_c)
+    with pytest.raises(KeyboardInterrupt):
+        cli.run_boards(['p0', 'p1'], [SPINNER], once=True)
+
+    for _, chan in made.values():
+        assert any('Keyboard interrupt' in w for w in chan.written)  # by fatal
@@ -0,0 +1,78 @@
+"""Performance budgets — the link cost of the apps' frames, pinned.
+
+The apps run on FakeChannel's modelled link (115200 baud, simulated clock),
+seeded, for a few frames past their set-up. A change that adds round trips
+or bytes to a frame fails here; when one is worth it, raise the budget with
+it.
+"""
+
+import random
+from typing import Any, Callable
+
+import numpy as np
+import pytest
+from fake_channel import FakeChannel, FrameLimitReached
+
+from arduino_esp32_tft_terminal.app import App
+from arduino_esp32_tft_terminal.app.asteriods import Asteriods
+from arduino_esp32_tft_terminal.app.collisions import CollisionsElastic
+from arduino_esp32_tft_terminal.app.collisions2 import CollisionsGravity
+from arduino_esp32_tft_terminal.app.collisions3 import BubblesSoap
+from arduino_esp32_tft_terminal.app.cube import Cube
+from arduino_esp32_tft_terminal.app.quix import Quix
+from arduino_esp32_tft_terminal.app.starfield import Starfield
+from arduino_esp32_tft_terminal.app.tunnel import Tunnel
+from arduino_esp32_tft_terminal.lib.board import Board
+
+MakeBoard = Callable[..., tuple[Board, FakeChannel]]
+BAUDRATE = 115200
+
+# app: frames run, bytes written per frame, round trips per frame
+BUDGETS: dict[type[App], tuple[int, int, int]] = {
+    Asteriods: (30, 280, 12),
+    Cube: (30, 800, 10),
+    Starfield: (30, 1100, 6),
+    Tunnel: (30, 250, 4),
+    Quix: (30, 430, 12),
+    CollisionsElastic: (20, 900, 28),
+    CollisionsGravity: (20, 400, 15),
+    BubblesSoap: (10, 1700, 50),
+}
+
+
+def test_link_model(make_board: MakeBoard) -> None:
+    board, chan = make_board(baudrate=1000, latency={'display': 0.5}, record=False)
+    cmd = board.gfx.cmd
+    cmd.fill_rect(0, 0, 1, 1, 1)  # 'fillRect 0 0 1 1 1\n', 'OK\r\n'
+    assert chan.clock == pytest.approx((19 + 4) * 10 / 1000)
+
+    chan.reset_counters()
+    cmd.draw_pixel_many([1, 2, 3], 4, 1)  # pipelined: one round trip
+    cmd.display()
+    chan.assert_round_trips(2)
+    assert chan.commands == {'drawPixel': 3, 'display': 1}
+    assert chan.written == []  # counted, not kept
+    [frame] = chan.frames
+    assert frame.bytes == chan.bytes_written == 3 * 16 + 8
+    assert frame.seconds == pytest.approx(0.5 + (56 + 4 * 4) * 10 / 1000)
+
+
+@pytest.mark.parametrize('app_class', BUDGETS, ids=lambda c: c.__name__)
+def test_frame_budget(
+    app_class: type[Any], make_board: MakeBoard, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    frames, max_bytes, max_round_trips = BUDGETS[app_class]
+    random.seed(0)
+    np.random.seed(0)
+    board, chan = make_board(baudrate=BAUDRATE, record=False, frame_limit=frames + 1)
+    chan.drive_schedulers(monkeypatch)
+    app = app_class(board)
+
+    with pytest.raises(FrameLimitReached):
+        if app_class is Asteriods:
+            app.run_once(True)
+        else:
+            app._run()
+    chan.frames.pop(0)  # the set-up
+    chan.assert_bytes_per_frame(max_bytes)
+    chan.assert_round_trips_per_frame(max_round_trips)
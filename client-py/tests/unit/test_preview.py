@@ -0,0 +1,121 @@
+"""Web preview — dirty-rectangle deltas, streamed over a localhost WebSocket."""
+
+import base64
+import socket
+import struct
+import time
+import urllib.request
+from typing import IO, Iterator
+
+import numpy as np
+import pytest
+
+from arduino_esp32_tft_terminal.lib.preview import (
+    BAND,
+    Mirror,
+    PreviewServer,
+    dirty_rects,
+    ws_accept,
+)
+
+W, H = 240, 135
+
+
+def blank() -> np.ndarray:
+    return np.zeros((H, W), dtype=np.uint16)
+
+
+@pytest.fixture
+def server() -> Iterator[PreviewServer]:
+    server = PreviewServer(0).start()
+    yield server
+    server.stop()
+
+
+def upgrade(port: int, origin: str) -> tuple[bytes, IO[bytes]]:
+    sock = socket.create_connection(('127.0.0.1', port), timeout=5)
+    key = base64.b64encode(b'0123456789abcdef').decode()
+    sock.sendall(
+        f'GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n'
+        f'Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n'
+        f'Origin: {origin}\r\nSec-WebSocket-Version: 13\r\n\r\n'.encode()
+    )
+    f = sock.makefile('rb')
+    head = b''
+    while not head.endswith(b'\r\n\r\n'):
+        head += f.read(1)
+    return head, f
+
+
+def open_ws(port: int) -> IO[bytes]:
+    head, f = upgrade(port, f'http://localhost:{port}')
+    assert head.startswith(b'HTTP/1.1 101')
+    assert ws_accept(base64.b64encode(b'0123456789abcdef').decode()).encode() in head
+    return f
+
+
+def read_rects(f: IO[bytes]) -> list[tuple[int, int, int, int, np.ndarray]]:
+    b0, n = f.read(2)
+    assert b0 == 0x82  # final, binary
+    if n == 126:
+        (n,) = struct.unpack('!H', f.read(2))
+    elif n == 127:
+        (n,) = struct.unpack('!Q', f.read(8))
+    data = f.read(n)
+    assert struct.unpack('<HH', data[:4]) == (W, H)
+    rects, o = [], 4
+    while o < len(data):
+        x, y, w, h = struct.unpack('<HHHH', data[o : o + 8])
+        o += 8
+        pixels = np.frombuffer(data[o : o + 2 * w * h], '<u2').reshape(h, w)
+        o += 2 * w * h
+        rects.append((x, y, w, h, pixels))
+    return rects
+
+
+def test_only_the_changed_bands_are_sent() -> None:
+    a = blank()
+    assert dirty_rects(None, a) == [(0, 0, W, H)]
+    assert dirty_rects(a, a.copy()) == []
+
+    b = a.copy()
+    b[3, 10:13] = b[5, 20] = 1
+    b[BAND + 1, 0] = 1
+    assert dirty_rects(a, b) == [(10, 3, 11, 3), (0, BAND + 1, 1, 1)]
+
+
+def test_frames_stream_as_deltas(server: PreviewServer) -> None:
+    page = urllib.request.urlopen(f'http://127.0.0.1:{server.port}/').read()
+    assert b'<canvas' in page
+
+    f = open_ws(server.port)
+    frame = blank()
+    frame[0, 0] = 0xFFFF
+    server.publish(frame)
+    [(x, y, w, h, pixels)] = read_rects(f)
+    assert (x, y, w, h) == (0, 0, W, H) and (pixels == frame).all()
+
+    frame = frame.copy()
+    frame[100, 50] = 0xF800
+    server.publish(frame)
+    assert [r[:4] for r in read_rects(f)] == [(50, 100, 1, 1)]
+
+
+def test_other_origins_are_refused(server: PreviewServer) -> None:
+    for origin in ('http://evil.example', f'http://localhost:{server.port + 1}', ''):
+        head, _ = upgrade(server.port, origin)
+        assert head.startswith(b'HTTP/1.1 403'), origin
+    head, _ = upgrade(server.port, f'http://127.0.0.1:{server.port}')
+    assert head.startswith(b'HTTP/1.1 101')
+
+
+def test_a_live_board_is_mirrored(server: PreviewServer) -> None:
+    mirror = Mirror(server)
+    mirror.tap(b'setFgColor 255 0 0\nfillRect 1 2 3 4 1\n')
+    mirror.tap(b'display\n')
+    deadline = time.monotonic() + 5
+    while server.frame is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert server.frame is not None
+    assert (server.frame[2:6, 1:4] == 0xF800).all()
+    assert np.count_nonzero(server.frame) == 12
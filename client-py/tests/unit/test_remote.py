@@ -0,0 +1,96 @@
+"""Remote metrics session — agent snapshots over one connection, reconnects."""
+
+import io
+import subprocess
+from typing import Any
+
+import pytest
+
+from arduino_esp32_tft_terminal.lib import metrics
+from arduino_esp32_tft_terminal.lib.remote import RemoteSession
+
+
+def _local_ssh(cmd: list[str], **kwargs: Any) -> Any:
+    # run the remote command line here, as `ssh host <cmd>` would there
+    assert cmd[0] == 'ssh' and cmd[-2] == 'host'
+    return subprocess.Popen(['sh', '-c', cmd[-1]], **kwargs)
+
+
+class FakeProc:
+    def __init__(self, lines: list[bytes]) -> None:
+        self.stdout = io.BytesIO(b''.join(lines))
+        self.killed = self.waited = False
+
+    def wait(self) -> int:
+        self.waited = True
+        return 255
+
+    def kill(self) -> None:
+        self.killed = True
+
+
+def test_agent_streams_snapshots_the_collectors_can_read() -> None:
+    session = RemoteSession('host', metrics.PATHS, 0.05, popen=_local_ssh)
+    session.start()
+    try:
+        cpu = metrics.CpuCollector(session.read)
+        assert len(cpu.sample()) == len(metrics.CpuCollector().sample())
+        assert metrics.hostname(session.read) == metrics.hostname()
+        assert metrics.memory(session.read)['total'] == metrics.memory()['total']
+        assert session.connects == 1
+    finally:
+        session.close()
+
+
+def test_reconnects_with_backoff_and_serves_latest() -> None:
+    snap = b'{"t": 0, "files": {"/proc/uptime": "MTIuMCAzLjA="}}\n'  # 12.0 3.0
+    procs = [FakeProc([snap]), FakeProc([]), FakeProc([]), FakeProc([snap])]
+    sleeps: list[float] = []
+    session = RemoteSession(
+        'host', ('/proc/uptime',), 1, popen=lambda *a, **k: procs.pop(0)
+    )
+
+    def sleep(s: float) -> None:
+        sleeps.append(s)
+        if not procs:
+            session.close()
+
+    session.sleep = sleep
+    session._loop()
+    assert sleeps == [0.2, 0.4, 0.8, 0.2]  # reset once data flows again
+    assert metrics.uptime(session.read) == 12.0
+    with pytest.raises(FileNotFoundError):
+        session.read('/proc/stat')
+
+
+def test_stale_data_is_an_error() -> None:
+    now = [100.0]
+    session = RemoteSession('host', (), 1, clock=lambda: now[0])
+    session._pump(io.BytesIO(b'{"t": 0, "files": {}}\n'))
+    now[0] += 60
+    with pytest.raises(OSError, match='no fresh metrics'):
+        session.read('/proc/uptime')
+
+
+def test_garbage_lines_are_skipped_and_the_process_reaped() -> None:
+    snap = b'{"t": 0, "files": {"/proc/uptime": "MTIuMCAzLjA="}}\n'
+    garbage = [b'Welcome banner\n', b'42\n', b'{"t": 0}\n']
+    proc = FakeProc([*garbage, snap])
+    session = RemoteSession('host', ('/proc/uptime',), 1, popen=lambda *a, **k: proc)
+    session.sleep = lambda s: session.close()
+    session._loop()
+    assert metrics.uptime(session.read) == 12.0
+    assert proc.killed and proc.waited
+
+
+def test_a_failing_stream_still_reaps_the_process() -> None:
+    class Broken(io.RawIOBase):
+        def readinto(self, b: Any) -> int:
+            raise OSError('connection reset')
+
+    proc = FakeProc([])
+    proc.stdout = Broken()  # type: ignore[assignment]
+    session = RemoteSession('host', (), 1, popen=lambda *a, **k: proc)
+    session.sleep = lambda s: session.close()
+    session._loop()
+    assert proc.killed and proc.waited
@@ -0,0 +1,122 @@
+"""Background sampler — ring-buffer history and immutable snapshots."""
+
+import math
+import threading
+import time
+
+import numpy as np
+
+from arduino_esp32_tft_terminal.lib.sampler import MEM_FIELDS, Ring, Sampler
+
+MEMINFO = b"""MemTotal:        2000000 kB
+MemFree:         1000000 kB
+MemAvailable:    1500000 kB
+Buffers:               0 kB
+Cached:           500000 kB
+"""
+
+
+class FakeHost:
+    """/proc with counters advancing by one tick per read of /proc/stat."""
+
+    def __init__(self) -> None:
+        self.ticks = 0
+
+    def read(self, path: str) -> bytes:
+        if path == '/proc/stat':
+            self.ticks += 1
+            usr, idle = 30 * self.ticks, 70 * self.ticks
+            return f'cpu0 {usr} 0 0 {idle}\ncpu1 0 0 0 {usr + idle}\n'.encode()
+        if path == '/proc/net/dev':
+            rx = 1000 * self.ticks
+            return b'h1\nh2\n eth0: %d 0 0 0 0 0 0 0 %d 0\n' % (rx, rx // 2)
+        if path == '/proc/uptime':
+            return b'%d.00 0.00\n' % self.ticks
+        if path == '/proc/meminfo':
+            return MEMINFO
+        raise FileNotFoundError(path)
+
+
+def _sampler(capacity: int = 4) -> Sampler:
+    host = FakeHost()  # one tick per second
+    return Sampler(host.read, 1.0, capacity, clock=lambda: float(host.ticks))
+
+
+def test_ring_keeps_the_latest_rows_in_order() -> None:
+    ring = Ring(3, (2,))
+    for i in range(5):
+        ring.push(np.array([i, -i]))
+    assert ring.ordered()[:, 0].tolist() == [2, 3, 4]
+
+
+def test_snapshots_hold_history_and_never_change() -> None:
+    sampler = _sampler()
+    assert len(sampler.snapshot()) == 0
+    sampler.sample_once()
+    first = sampler.snapshot()
+    for _ in range(5):
+        sampler.sample_once()
+    snap = sampler.snapshot()
+
+    assert len(first) == 1 and first.seq == 1  # published copies are frozen
+    assert snap.seq == 6 and len(snap) == 4  # capacity bounds the history
+    assert snap.cpu.shape == (4, 2)
+    assert snap.cpu[-1].tolist() == [30.0, 0.0]
+    assert math.isnan(first.rx[0])  # no rate before a second sample
+    assert snap.rx[-1] == 1000.0 and snap.tx[-1] == 500.0
+    assert snap.mem.shape == (4, len(MEM_FIELDS))
+    assert snap.mem[-1][0] == 2000000 * 1024
+    assert snap.errors == {}
+
+
+def test_collector_errors_leave_gaps() -> None:
+    def reader(path: str) -> bytes:
+        if path == '/proc/meminfo':
+            return MEMINFO
+        raise OSError('down')
+
+    sampler = Sampler(reader, 1.0, 4)
+    sampler.sample_once()
+    snap = sampler.snapshot()
+    assert set(snap.errors) == {'cpu', 'net'}
+    assert snap.cpu.shape == (1, 0)
+    assert math.isnan(snap.rx[0]) and not math.isnan(snap.mem[0][0])
+
+
+def test_series_stay_in_step_when_the_cpu_count_changes() -> None:
+    host = FakeHost()
+    reads = []
+
+    def reader(path: str) -> bytes:
+        if path == '/proc/stat' and not reads:  # as a remote host, at first
+            reads.append(path)
+            raise OSError('no snapshot yet')
+        return host.read(path)
+
+    sampler = Sampler(reader, 1.0, 4)
+    for _ in range(3):
+        sampler.sample_once()
+    snap = sampler.snapshot()
+    assert snap.cpu.shape == (len(snap.t), 2)
+    assert np.isnan(snap.cpu[0]).all() and snap.cpu[-1].tolist() == [30.0, 0.0]
+
+    for _ in range(3):  # and once the ring has wrapped
+        sampler.sample_once()
+    assert sampler.snapshot().cpu.shape == (4, 2)
+
+
+def test_thread_samples_on_its_cadence() -> None:
+    done = threading.Event()
+    sampler = Sampler(FakeHost().read, 0.01, 8)
+
+    def sleep(secs: float) -> None:
+        assert 0 < secs <= 0.01
+        time.sleep(secs)
+        if sampler.seq >= 3:
+            sampler.stop()
+            done.set()
+
+    sampler.sleep = sleep
+    sampler.start()
+    assert done.wait(5)
+    assert sampler.snapshot().seq >= 3
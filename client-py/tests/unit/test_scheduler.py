@@ -0,0 +1,102 @@
+"""FrameScheduler — fixed timestep, frame pacing and frame skipping."""
+
+from typing import Any, Callable
+
+from arduino_esp32_tft_terminal.app.scheduler import FrameScheduler
+from arduino_esp32_tft_terminal.lib.board import Board
+
+MakeBoard = Callable[..., tuple[Board, Any]]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.slept = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, s: float) -> None:
+        self.slept += s
+        self.now += s
+
+
+def _run(
+    make_board: MakeBoard, render_cost: float, nb_frames: int, max_skip: int = 4
+) -> tuple[FrameScheduler[bool], FakeClock, list[int], Any]:
+    """Run at 10 FPS; each render costs `render_cost` seconds of link time.
+    Returns the per-frame update counts."""
+    board, chan = make_board()
+    chan.written.clear()
+    clock = FakeClock()
+    sched = FrameScheduler[bool](
+        board.gfx, fps=10, max_skip=max_skip, clock=clock, sleep=clock.sleep
+    )
+    per_frame: list[int] = []
+    updates = 0
+
+    def update() -> None:
+        nonlocal updates
+        updates += 1
+
+    def render(alpha: float) -> bool | None:
+        nonlocal updates
+        assert 0 <= alpha < 1
+        per_frame.append(updates)
+        updates = 0
+        clock.now += render_cost
+        return True if len(per_frame) == nb_frames else None
+
+    assert sched.run(update, render) is True
+    return sched, clock, per_frame, chan
+
+
+def test_fast_link_sleeps_to_target_fps(make_board: MakeBoard) -> None:
+    sched, clock, per_frame, chan = _run(make_board, 0.02, 21)
+    assert per_frame[1:] == [1] * 20
+    assert sched.skipped == 0
+    assert abs(clock.slept - 20 * 0.08) < 1e-6
+    assert chan.written.count('display') == 20
+
+
+def test_slow_link_skips_frames_but_keeps_speed(make_board: MakeBoard) -> None:
+    sched, clock, per_frame, _ = _run(make_board, 0.25, 41)
+    assert clock.slept == 0
+    assert set(per_frame[1:]) == {2, 3}
+    # simulated time keeps up with wall time
+    assert abs(sum(per_frame) * 0.1 - 40 * 0.25) <= 0.1
+    assert sched.skipped == sched.updates - sched.frames
+
+
+def test_backlog_beyond_max_skip_is_dropped(make_board: MakeBoard) -> None:
+    _, _, per_frame, _ = _run(make_board, 1.0, 5, max_skip=2)
+    assert per_frame[1:] == [3] * 4
+
+
+def test_update_result_ends_the_loop(make_board: MakeBoard) -> None:
+    board, chan = make_board()
+    clock = FakeClock()
+    sched = FrameScheduler[str](board.gfx, fps=10, clock=clock, sleep=clock.sleep)
+
+    def update() -> str | None:
+        return 'over' if sched.updates >= 3 else None
+
+    def render(alpha: float) -> None:
+        clock.now += 0.1
+
+    assert sched.run(update, render) == 'over'
+
+
+def test_costly_update_does_not_feed_its_own_backlog(make_board: MakeBoard) -> None:
+    board, _ = make_board()
+    clock = FakeClock()
+    sched = FrameScheduler[bool](board.gfx, fps=10, clock=clock, sleep=clock.sleep)
+
+    def update() -> None:
+        clock.now += 0.15
+
+    def render(alpha: float) -> bool | None:
+        return True if sched.frames == 10 else None
+
+    sched.run(update, render)
+    assert sched.updates == sched.frames  # one per frame, however late
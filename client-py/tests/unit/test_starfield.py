@@ -0,0 +1,46 @@
+"""Starfield star arrays — batched motion, resets and line emission."""
+
+from typing import Any, Callable
+
+import numpy as np
+
+from arduino_esp32_tft_terminal import config
+from arduino_esp32_tft_terminal.app import TimeEscaper
+from arduino_esp32_tft_terminal.app.starfield import Starfield, Stars
+from arduino_esp32_tft_terminal.lib.board import Board
+
+MakeBoard = Callable[..., tuple[Board, Any]]
+
+
+def test_out_of_bounds_stars_are_reset_together(monkeypatch: Any) -> None:
+    monkeypatch.setattr(config, 'WIDTH', 240)
+    monkeypatch.setattr(config, 'HEIGHT', 135)
+    stars = Stars(500)
+    t = 50  # every star has left the panel by now
+    assert stars.out(t).all()
+    stars.reset(stars.out(t), t)
+    assert not stars.out(t + 1).any()
+    assert (stars.t0 == t).all()
+
+
+def test_frame_erases_exactly_what_was_drawn(make_board: MakeBoard) -> None:
+    board, chan = make_board()
+    app = Starfield(board)
+    app.stars = Stars(300)
+    app.t = 0
+    app.drawn = None
+    app.escaper = TimeEscaper(app)
+
+    chan.written.clear()
+    app.render(0)
+    drawn = [w for w in chan.written if w.startswith('drawLine')]
+    assert len(drawn) == 300 and all(w.endswith(' 1') for w in drawn)
+    assert app.drawn is not None
+    first = app.drawn.copy()
+
+    app.update()
+    chan.written.clear()
+    app.render(0)
+    erased = [w for w in chan.written if w.endswith(' 0')]
+    assert erased == [f'drawLine {a} {b} {c} {d} 0' for a, b, c, d in first.tolist()]
+    assert not np.array_equal(first, app.drawn)
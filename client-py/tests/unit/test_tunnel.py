@@ -0,0 +1,45 @@
+"""Tunnel frame table — precomputed rectangles, cached per resolution."""
+
+import math
+
+from arduino_esp32_tft_terminal.app.tunnel import NB, PERIOD, K, frame_table
+
+
+def _rectangle(j: int, width: int, height: int) -> list[tuple[int, int]]:
+    # a direct recomputation of the same formula, one step at a time
+    i = NB - 1 - (j % NB)
+    w = int(width * K**i * 2)
+    h = int(height * K**i * 2)
+    a = math.sin(math.pi * j / PERIOD) ** 2
+    cos, sin = math.cos(a), math.sin(a)
+    return [
+        (int(width / 2 + cos * x - sin * y), int(height / 2 + sin * x + cos * y))
+        for x, y in ((w / 2, h / 2), (w / 2, -h / 2), (-w / 2, -h / 2), (-w / 2, h / 2))
+    ]
+
+
+def test_table_matches_direct_computation() -> None:
+    table = frame_table(240, 135, False)
+    assert table.shape == (PERIOD, 2, 4)
+    for j in range(0, PERIOD, 7):
+        p = _rectangle(j, 240, 135)
+        assert table[j].tolist() == [[*p[1], *p[2]], [*p[3], *p[0]]]
+
+
+def test_rotation_stays_close_to_the_former_one() -> None:
+    # sin(t/100)² before the table; PERIOD makes it loop, 0.7% faster
+    for t in range(PERIOD):
+        former = math.sin(t / 100) ** 2
+        assert abs(math.sin(math.pi * t / PERIOD) ** 2 - former) < 0.02
+
+
+def test_table_is_built_once_per_resolution() -> None:
+    assert frame_table(320, 170, False) is frame_table(320, 170, False)
+    assert frame_table(320, 170, True) is not frame_table(320, 170, False)
+
+
+def test_outline_closes_the_rectangle() -> None:
+    edges = frame_table(240, 135, True)[PERIOD // 3].tolist()
+    assert len(edges) == 4
+    for (_, _, x1, y1), (x2, y2, _, _) in zip(edges, edges[1:] + edges[:1]):
+        assert (x1, y1) == (x2, y2)
@@ -0,0 +1,149 @@
+"""Widgets — only the cells that changed reach the board."""
+
+from typing import Any, Callable
+
+import numpy as np
+
+from arduino_esp32_tft_terminal.app.widgets import (
+    ListView,
+    Sprite,
+    TextGrid,
+    mask_rects,
+)
+from arduino_esp32_tft_terminal.lib.board import Board
+from arduino_esp32_tft_terminal.lib.font5x7 import render
+
+MakeBoard = Callable[..., tuple[Board, Any]]
+GREY = 128, 128, 128
+
+
+def _grid(make_board: MakeBoard) -> tuple[TextGrid, Any]:
+    board, chan = make_board()
+    grid = TextGrid(board.gfx, 0, 16, 3, 10, 6, 8)
+    chan.written.clear()
+    return grid, chan
+
+
+def test_first_paint_skips_blanks(make_board: MakeBoard) -> None:
+    grid, chan = _grid(make_board)
+    grid.set_lines(['  up 2h'], GREY)
+    assert chan.written == [
+        'fillRect 12 16 30 8 0',
+        'setTextColor 128 128 128',
+        'setCursor 12 16',
+        'print up 2h',
+    ]
+
+
+def test_clock_tick_repaints_one_cell(make_board: MakeBoard) -> None:
+    grid, chan = _grid(make_board)
+    grid.set_lines(['host', '12:34:56'], GREY)
+    chan.written.clear()
+    grid.set_lines(['host', '12:34:57'], GREY)
+    assert chan.written == ['fillRect 42 24 6 8 0', 'setCursor 42 24', 'print 7']
+
+    chan.written.clear()
+    grid.set_lines(['host', '12:34:57'], GREY)
+    assert chan.written == []
+
+
+def test_shrinking_and_recoloring(make_board: MakeBoard) -> None:
+    grid, chan = _grid(make_board)
+    grid.set_lines(['abcdef', 'x'], GREY)
+    chan.written.clear()
+    grid.set_line(0, 'abc', GREY)  # tail erased, nothing printed
+    grid.set_lines(['abc'], (255, 0, 0))  # recolored, row 1 blanked
+    assert chan.written == [
+        'fillRect 18 16 18 8 0',
+        'fillRect 0 16 18 8 0',
+        'setTextColor 255 0 0',
+        'setCursor 0 16',
+        'print abc',
+        'fillRect 0 24 6 8 0',
+    ]
+
+
+def test_invalidate_repaints_everything(make_board: MakeBoard) -> None:
+    grid, chan = _grid(make_board)
+    grid.set_lines(['a\\b'], GREY)
+    assert chan.written[-1] == 'print a\\\\b'  # backslash escaped on the wire
+    grid.invalidate()
+    chan.written.clear()
+    grid.set_lines(['a\\b'], GREY)
+    assert len([w for w in chan.written if w.startswith('fillRect')]) == 3
+
+
+def _list(rows: int = 3) -> tuple[ListView[str], list[str]]:
+    calls: list[str] = []
+    view = ListView[str](
+        10,
+        20,
+        rows,
+        lambda y, item: calls.append(f'{y}:{item}'),
+        lambda y: calls.append(f'{y}:-'),
+        key=str.upper,
+    )
+    return view, calls
+
+
+def test_list_repaints_changed_slots_only() -> None:
+    view, calls = _list()
+    view.set_items(['a', 'b'])
+    view.render()
+    assert calls == ['10:a', '30:b']
+
+    calls.clear()
+    view.set_items(['a', 'c', 'd'])
+    view.render()
+    view.render()
+    assert calls == ['30:c', '50:d']
+
+    calls.clear()
+    view.set_items(['A'])  # same key: not repainted
+    view.render()
+    assert calls == ['30:-', '50:-']
+
+
+def test_list_pages_over_many_items() -> None:
+    view, calls = _list()
+    items = [str(i) for i in range(1000)]
+    view.set_items(items)
+    assert view.overflows
+    view.page(1)
+    view.render()
+    assert calls == ['10:3', '30:4', '50:5']
+
+    view.page(1000)
+    assert view.offset == 997  # the last page is full
+    view.auto_page()
+    assert view.offset == 0  # wraps to the top
+    view.page(-1)
+    assert view.offset == 0
+
+    view.set_items(items[:4])  # shrinking keeps the window within the list
+    view.page(1)
+    assert view.offset == 1
+    view.set_items(items[:2])
+    assert view.offset == 0 and not view.overflows
+
+
+def test_mask_rects_stack_repeated_runs() -> None:
+    mask = render('+', 2, 2)
+    assert mask.shape == (16, 12)
+    assert mask_rects(mask) == [(4, 2, 2, 4), (0, 6, 10, 2), (4, 8, 2, 4)]
+    assert mask_rects(np.zeros((3, 3), dtype=bool)) == []
+
+
+def test_sprite_repaints_the_difference(make_board: MakeBoard) -> None:
+    board, chan = make_board()
+    sprite = Sprite(board.gfx)
+    chan.written.clear()
+    sprite.show(render('-'), 10, 20)
+    assert chan.written == ['fillRect 10 23 5 1 1']
+
+    chan.written.clear()
+    sprite.show(render('-'), 10, 20)
+    assert chan.written == []
+
+    sprite.show(render('-'), 11, 20)  # one pixel to erase, one to light
+    assert chan.written == ['fillRect 10 23 1 1 0', 'fillRect 15 23 1 1 1']
@@ -3,7 +3,12 @@
 - `validate`: load `protocol.yaml`, run all schema + uniqueness checks,
   print a per-category summary.
 - `generate`: validate, then render the generated stubs into their target
-  subprojects.
+  subprojects, formatted, rewriting only the files whose content changed. Skips
+  everything when neither the spec, the generator, the formatters' versions nor
+  the stubs changed since the last run (see `is_up_to_date`), so that firmware
+  builds are not triggered by fresh mtimes.
+- `generate --check`: the drift gate — render in memory and fail if any
+  committed stub differs; writes nothing.
 """
 
 from __future__ import annotations
@@ -11,7 +16,14 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-from .generate import generate_all
+from .generate import (
+    TARGET_PATHS,
+    is_up_to_date,
+    render_targets,
+    save_cache,
+    stale_targets,
+    write_targets,
+)
 from .load import load_protocol
 
 DEFAULT_SPEC = Path(__file__).resolve().parents[2] / "protocol.yaml"
@@ -32,21 +44,49 @@ def _validate(spec_path: Path):
 
 def main(argv: list[str] | None = None) -> int:
     argv = sys.argv[1:] if argv is None else argv
-    command = argv[0] if argv else "validate"
-    spec_path = Path(argv[1]) if len(argv) > 1 else DEFAULT_SPEC
+    check = "--check" in argv
+    args = [a for a in argv if a != "--check"]
+    command = args[0] if args else "validate"
+    spec_path = Path(args[1]) if len(args) > 1 else DEFAULT_SPEC
 
     if command == "validate":
         _validate(spec_path)
         return 0
 
+    if command == "generate" and check:
+        targets = render_targets(_validate(spec_path))
+        stale = stale_targets(targets)
+        for path in stale:
+            print(f"  stale {path}")
+        if len(targets) < len(TARGET_PATHS):
+            print("ERROR: a formatter is missing, cannot check", file=sys.stderr)
+            return 1
+        if stale:
+            print(
+                "ERROR: stubs are stale — run 'make protocol-gen' and commit",
+                file=sys.stderr,
+            )
+            return 1
+        print("protocol stubs are up to date")
+        return 0
+
     if command == "generate":
-        proto = _validate(spec_path)
-        for path in generate_all(proto):
+        if is_up_to_date(spec_path):
+            print(f"{spec_path.name} and generator unchanged: stubs up to date")
+            return 0
+        targets = render_targets(_validate(spec_path))
+        written = write_targets(targets)
+        for path in written:
             print(f"  wrote {path}")
+        if not written:
+            print("  no stub changed")
+        if len(targets) == len(TARGET_PATHS):  # else the next run must retry
+            save_cache(spec_path)
         return 0
 
     print(
-        f"unknown command {command!r}; supported: validate, generate", file=sys.stderr
+        f"unknown command {command!r}; supported: validate, generate [--check]",
+        file=sys.stderr,
     )
     return 2
 
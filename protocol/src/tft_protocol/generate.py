@@ -7,17 +7,24 @@ App conveniences are NOT generated — they live in the hand-written facades.
 
 from __future__ import annotations
 
+import hashlib
+import json
 import re
+import shutil
+import subprocess
+import sys
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader, StrictUndefined
 
 from .schema import (
     CPP_TYPE,
+    INT_RANGE,
     PY_TYPE,
     TRAILING_TYPES,
     ArgType,
     Category,
+    ClipMode,
     Command,
     Protocol,
 )
@@ -53,6 +60,14 @@ SERVER_DISPATCH_PATH = "server-esp32s3-rtft/command_dispatch.autogen.inc"
 SERVER_REPLAY_PATH = "server-esp32s3-rtft/replay_dispatch.autogen.inc"
 SERVER_HANDLERS_PATH = "server-esp32s3-rtft/protocol_handlers.autogen.h"
 
+TARGET_PATHS = (
+    COMMAND_LINE_PATH,
+    README_PROTOCOL_PATH,
+    SERVER_DISPATCH_PATH,
+    SERVER_REPLAY_PATH,
+    SERVER_HANDLERS_PATH,
+)
+
 
 def _env() -> Environment:
     return Environment(
@@ -80,11 +95,17 @@ def _py_param(arg) -> str:
     return param
 
 
-def _wire_arg(arg) -> str:
-    # Expression embedded in the command f-string for one argument.
-    if arg.type == ArgType.BOOL:
-        return f"{{int({arg.name})}}"
-    return f"{{{arg.name}}}"
+def _wire_arg(arg) -> tuple[str, str]:
+    # Conversion in the command's bytes format, and the value it formats.
+    # %d takes ints and bools as they are: no int()/str() round trip.
+    if arg.type in TRAILING_TYPES:
+        return "%s", f"{arg.name}.encode()"
+    return "%d", arg.name
+
+
+def _tuple(items) -> str:
+    # Tuple display, without the trailing comma a formatter would explode.
+    return "(" + ", ".join(items) + ("," if len(items) == 1 else "") + ")"
 
 
 def _docstring(text: str) -> str:
@@ -96,11 +117,14 @@ def _docstring(text: str) -> str:
 def _client_method(cmd: Command) -> str:
     name = snake(cmd.name)
     params = ", ".join(["self"] + [_py_param(a) for a in cmd.args])
+    # The whole wire line, terminator included, as a bytes format compiled
+    # with the module: one %-formatting per call, straight to bytes.
     if cmd.args:
-        wire = " ".join([cmd.name] + [_wire_arg(a) for a in cmd.args])
-        cmd_expr = f"f'{wire}'"
+        convs, values = zip(*(_wire_arg(a) for a in cmd.args))
+        fmt = " ".join([cmd.name, *convs]) + "\n"
+        cmd_expr = f"b{fmt!r} % {_tuple(values)}"
     else:
-        cmd_expr = repr(cmd.name)
+        cmd_expr = f"b{cmd.name + chr(10)!r}"
 
     ints = cmd.returns_ints
     if ints is not None:
@@ -126,12 +150,84 @@ def _client_method(cmd: Command) -> str:
 
     lines = [f"    def {name}({params}) -> {ret_type}:"]
     lines.append(f'        """{_docstring(cmd.doc)}"""')
-    lines += [f"        {ln}" for ln in body]
+    lines += [f"        {ln}" for ln in _range_checks(cmd) + _clip(cmd) + body]
+    return "\n".join(lines)
+
+
+def _range_checks(cmd: Command) -> list[str]:
+    # Only spec'd ranges are checked per call; the wire type's own range is
+    # left to the board, as it always was.
+    lines = []
+    for a in cmd.args:
+        if a.range is not None:
+            lo, hi = a.range
+            lines += [
+                f"if not {lo} <= {a.name} <= {hi}:",
+                f"    raise ValueError(f'{a.name} is {{{a.name}}}, out of {lo}..{hi}')",
+            ]
+    return lines
+
+
+def _clip_args(cmd: Command) -> tuple[list[str], list[int]]:
+    cols = [i for i, a in enumerate(cmd.args) if a.clip is not None]
+    return [cmd.args[i].name for i in cols], cols
+
+
+def _clip(cmd: Command) -> list[str]:
+    if cmd.clip is None:
+        return []
+    names, _ = _clip_args(cmd)
+    call = f"clip.{cmd.clip.value}_{cmd.clip_shape}({', '.join(names)})"
+    if cmd.clip == ClipMode.CULL:
+        return [f"if {call}:", "    return"]
+    return [
+        f"_geom = {call}",
+        "if _geom is None:",
+        "    return",
+        f"{', '.join(names)} = _geom",
+    ]
+
+
+def _has_bulk(cmd: Command) -> bool:
+    # Only drawing commands (those clipped to the panel) get a vectorized
+    # variant: N rows of a state setter would only leave the last in effect.
+    return (
+        _is_buffered(cmd)
+        and cmd.clip is not None
+        and all(a.type in INT_RANGE for a in cmd.args)
+    )
+
+
+def _client_bulk_method(cmd: Command) -> str:
+    name = snake(cmd.name)
+    params = ["self"]
+    for a in cmd.args:
+        params.append(
+            f"{a.name}: ArrayLike" + (f" = {a.default!r}" if a.optional else "")
+        )
+    fmt = " ".join([cmd.name] + ["%d"] * len(cmd.args)) + "\n"
+    names = _tuple([a.name for a in cmd.args])
+    bounds = _tuple([repr(a.bounds) for a in cmd.args])
+    lines = [
+        f"    def {name}_many({', '.join(params)}) -> None:",
+        f'        """Bulk `{name}`: one command per row of the broadcast args."""',
+        f"        _rows = _table({names}, {bounds})",
+    ]
+    if cmd.clip is not None:
+        _, cols = _clip_args(cmd)
+        func = f"clip.{cmd.clip.value}_{cmd.clip_shape}_many"
+        lines.append(f"        _rows = {func}(_rows, {_tuple([str(c) for c in cols])})")
+    lines.append(f"        self._command.do_many(b{fmt!r}, _rows)")
     return "\n".join(lines)
 
 
 def render_command_line(proto: Protocol) -> str:
-    methods = "\n\n".join(_client_method(c) for c in proto.commands)
+    methods = "\n\n".join(
+        m
+        for c in proto.commands
+        for m in [_client_method(c)]
+        + ([_client_bulk_method(c)] if _has_bulk(c) else [])
+    )
     template = _env().get_template("command_line.py.jinja")
     return template.render(banner=BANNER, methods=methods)
 
@@ -172,11 +268,10 @@ def render_protocol_doc(proto: Protocol) -> str:
     return "\n".join([line(header), separator, *(line(r) for r in rows)])
 
 
-def _splice_managed_block(path: Path, begin: str, end: str, body: str) -> None:
-    text = path.read_text(encoding="utf-8")
+def _splice_managed_block(text: str, begin: str, end: str, body: str) -> str:
     head = text[: text.index(begin) + len(begin)]
     tail = text[text.index(end) :]
-    path.write_text(f"{head}\n\n{body}\n\n{tail}", encoding="utf-8")
+    return f"{head}\n\n{body}\n\n{tail}"
 
 
 # --- server C++ (parse dispatch, replay dispatch, handler header) ------------
@@ -286,25 +381,136 @@ def render_server_handlers(proto: Protocol) -> str:
     )
 
 
-def generate_all(proto: Protocol, repo_root: Path | None = None) -> list[Path]:
-    root = repo_root or REPO_ROOT
-    written: list[Path] = []
+# --- targets: format in memory, write only what changed ---------------------
+
+# The formatters of the target subprojects, run on the rendered text so that the
+# comparison with the committed stubs (and their mtimes) is formatting-stable.
+FORMATTERS: dict[str, list[str]] = {
+    ".py": ["ruff", "format", "--stdin-filename", "{path}", "-"],
+    ".h": ["clang-format", "--assume-filename={path}"],
+}
+
+# Digest of the generator inputs and outputs of the last `generate`, next to
+# the spec. Not committed.
+CACHE_NAME = ".generate-cache.json"
+
+
+def _format(path: Path, text: str) -> str | None:
+    argv = FORMATTERS.get(path.suffix)
+    if argv is None:
+        return text
+    if shutil.which(argv[0]) is None:
+        return None
+    argv = [a.format(path=path) for a in argv]
+    return subprocess.run(
+        argv, input=text, capture_output=True, text=True, check=True
+    ).stdout
 
-    command_line = root / COMMAND_LINE_PATH
-    command_line.write_text(render_command_line(proto), encoding="utf-8")
-    written.append(command_line)
 
+def render_targets(proto: Protocol, repo_root: Path | None = None) -> dict[Path, str]:
+    """Every generated file, formatted, by path — nothing is written. A target
+    whose formatter is not installed is left out, with a warning: written
+    unformatted, it would only be drift."""
+    root = repo_root or REPO_ROOT
     readme = root / README_PROTOCOL_PATH
-    _splice_managed_block(readme, DOC_BEGIN, DOC_END, render_protocol_doc(proto))
-    written.append(readme)
-
-    for rel, text in (
-        (SERVER_DISPATCH_PATH, render_command_dispatch(proto)),
-        (SERVER_REPLAY_PATH, render_replay_dispatch(proto)),
-        (SERVER_HANDLERS_PATH, render_server_handlers(proto)),
-    ):
-        path = root / rel
-        path.write_text(text, encoding="utf-8")
-        written.append(path)
-
-    return written
+    targets = {
+        root / COMMAND_LINE_PATH: render_command_line(proto),
+        readme: _splice_managed_block(
+            readme.read_text(encoding="utf-8"),
+            DOC_BEGIN,
+            DOC_END,
+            render_protocol_doc(proto),
+        ),
+        root / SERVER_DISPATCH_PATH: render_command_dispatch(proto),
+        root / SERVER_REPLAY_PATH: render_replay_dispatch(proto),
+        root / SERVER_HANDLERS_PATH: render_server_handlers(proto),
+    }
+    formatted = {}
+    for path, text in targets.items():
+        out = _format(path, text)
+        if out is None:
+            tool = FORMATTERS[path.suffix][0]
+            print(f"  {tool} not found: {path.name} not generated", file=sys.stderr)
+        else:
+            formatted[path] = out
+    return formatted
+
+
+def stale_targets(targets: dict[Path, str]) -> list[Path]:
+    """The targets whose file is missing or differs from its rendering."""
+    return [
+        path
+        for path, text in targets.items()
+        if not path.exists() or path.read_text(encoding="utf-8") != text
+    ]
+
+
+def write_targets(targets: dict[Path, str]) -> list[Path]:
+    """Write the stale targets, leaving the others (and their mtimes) alone."""
+    stale = stale_targets(targets)
+    for path in stale:
+        path.write_text(targets[path], encoding="utf-8")
+    return stale
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _formatter_versions() -> bytes:
+    # What each formatter says of its version ("missing" if not installed):
+    # an upgrade may reformat the stubs.
+    out = []
+    for argv in FORMATTERS.values():
+        if shutil.which(argv[0]) is None:
+            out.append(f"{argv[0]} missing")
+        else:
+            run = subprocess.run(
+                [argv[0], "--version"], check=False, capture_output=True, text=True
+            )
+            out.append(run.stdout.strip())
+    return "\n".join(out).encode()
+
+
+def inputs_digest(spec_path: Path) -> str:
+    """Digest of everything the stubs derive from: the spec, the generator's
+    own sources and templates, and the formatters' versions."""
+    sources = sorted(_HERE.glob("*.py")) + sorted(_TEMPLATES.iterdir())
+    h = hashlib.sha256(spec_path.read_bytes())
+    for path in sources:
+        h.update(path.name.encode() + b"\0" + path.read_bytes())
+    h.update(b"\0" + _formatter_versions())
+    return h.hexdigest()
+
+
+def _outputs_digest(repo_root: Path, paths: list[Path]) -> dict[str, str]:
+    return {
+        str(p.relative_to(repo_root)): _sha(p.read_bytes()) if p.exists() else ""
+        for p in paths
+    }
+
+
+def is_up_to_date(spec_path: Path, repo_root: Path | None = None) -> bool:
+    """True if neither the inputs nor the generated files changed since the
+    last `generate` — then there is nothing to render."""
+    root = repo_root or REPO_ROOT
+    try:
+        cache = json.loads((spec_path.parent / CACHE_NAME).read_text("utf-8"))
+    except (OSError, ValueError):
+        return False
+    outputs = [root / rel for rel in cache.get("outputs") or {}]
+    return cache.get("inputs") == inputs_digest(spec_path) and cache.get(
+        "outputs"
+    ) == _outputs_digest(root, outputs)
+
+
+def save_cache(spec_path: Path, repo_root: Path | None = None) -> None:
+    root = repo_root or REPO_ROOT
+    outputs = [root / rel for rel in TARGET_PATHS]
+    cache = {
+        "inputs": inputs_digest(spec_path),
+        "outputs": _outputs_digest(root, outputs),
+    }
+    (spec_path.parent / CACHE_NAME).write_text(
+        json.dumps(cache, indent=2) + "\n", encoding="utf-8"
+    )
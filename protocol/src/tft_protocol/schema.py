@@ -61,6 +61,47 @@ PY_TYPE: dict[ArgType, str] = {
     ArgType.RAW_REST: "str",
 }
 
+# Wire value range of each numeric arg type; an arg `range` narrows it.
+INT_RANGE: dict[ArgType, tuple[int, int]] = {
+    ArgType.INT16: (-(2**15), 2**15 - 1),
+    ArgType.INT: (-(2**31), 2**31 - 1),
+    ArgType.INT8: (-(2**7), 2**7 - 1),
+    ArgType.UCHAR: (0, 2**8 - 1),
+    ArgType.BOOL: (0, 1),
+}
+
+
+class ClipRole(str, Enum):
+    """What a geometry arg measures on the panel: a coordinate or an extent."""
+
+    X = "x"
+    Y = "y"
+    W = "w"
+    H = "h"
+    R = "r"
+
+
+class ClipMode(str, Enum):
+    """How the client treats a primitive against the panel bounds: `cull`
+    drops it when entirely off-screen; `trim` also cuts it to the panel,
+    for shapes whose clipped drawing is the same pixels."""
+
+    CULL = "cull"
+    TRIM = "trim"
+
+
+# Primitive shape, from the clip roles of its args in order.
+CLIP_SHAPES: dict[tuple[ClipRole, ...], str] = {
+    (ClipRole.X, ClipRole.Y): "point",
+    (ClipRole.X, ClipRole.Y, ClipRole.W): "hspan",
+    (ClipRole.X, ClipRole.Y, ClipRole.H): "vspan",
+    (ClipRole.X, ClipRole.Y, ClipRole.X, ClipRole.Y): "line",
+    (ClipRole.X, ClipRole.Y, ClipRole.W, ClipRole.H): "rect",
+    (ClipRole.X, ClipRole.Y, ClipRole.R): "circle",
+    (ClipRole.X, ClipRole.Y) * 3: "triangle",
+}
+TRIM_SHAPES = {"hspan", "vspan", "line", "rect"}
+
 
 class Arg(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -70,6 +111,10 @@ class Arg(BaseModel):
     # A literal int/bool default. Its presence makes the argument optional;
     # there is no separate `optional` flag.
     default: bool | int | None = None
+    # Accepted values [lo, hi], checked by the client before encoding.
+    range: tuple[int, int] | None = None
+    # The arg's part in the primitive's geometry, for client-side clipping.
+    clip: ClipRole | None = None
 
     @field_validator("name")
     @classmethod
@@ -78,6 +123,27 @@ class Arg(BaseModel):
             raise ValueError(f"arg name {v!r} is not a valid identifier")
         return v
 
+    @model_validator(mode="after")
+    def _range_fits_type(self) -> "Arg":
+        if self.range is not None:
+            if self.type not in INT_RANGE:
+                raise ValueError(f"{self.name}: a range needs a numeric type")
+            lo, hi = self.range
+            type_lo, type_hi = INT_RANGE[self.type]
+            if not type_lo <= lo <= hi <= type_hi:
+                raise ValueError(
+                    f"{self.name}: range {list(self.range)} is empty or exceeds "
+                    f"{self.type.value}"
+                )
+        if self.clip is not None and self.type not in INT_RANGE:
+            raise ValueError(f"{self.name}: a clip role needs a numeric type")
+        return self
+
+    @property
+    def bounds(self) -> tuple[int, int] | None:
+        """Accepted values, for numeric args."""
+        return self.range or INT_RANGE.get(self.type)
+
     @property
     def optional(self) -> bool:
         return self.default is not None
@@ -92,6 +158,8 @@ class Command(BaseModel):
     args: list[Arg] = []
     # Response shape; a list of field names denotes a space-separated int tuple.
     returns: Literal["ok", "none", "int", "string"] | list[str] = "ok"
+    # Client-side clipping against the panel, for args with a `clip` role.
+    clip: ClipMode | None = None
 
     @field_validator("doc")
     @classmethod
@@ -127,6 +195,29 @@ class Command(BaseModel):
                 )
         return self
 
+    @model_validator(mode="after")
+    def _clip_roles_make_a_shape(self) -> "Command":
+        roles = tuple(a.clip for a in self.args if a.clip is not None)
+        if not roles and self.clip is None:
+            return self
+        if self.category != Category.BUFFERED:
+            raise ValueError(f"{self.name}: only buffered commands are clipped")
+        if self.clip is None or not roles:
+            raise ValueError(f"{self.name}: `clip` needs args with clip roles")
+        shape = CLIP_SHAPES.get(roles)
+        if shape is None:
+            raise ValueError(
+                f"{self.name}: clip roles {[r.value for r in roles]} make no shape"
+            )
+        if self.clip == ClipMode.TRIM and shape not in TRIM_SHAPES:
+            raise ValueError(f"{self.name}: a {shape} can only be culled")
+        return self
+
+    @property
+    def clip_shape(self) -> str | None:
+        roles = tuple(a.clip for a in self.args if a.clip is not None)
+        return CLIP_SHAPES.get(roles)
+
     @property
     def returns_ints(self) -> list[str] | None:
         return self.returns if isinstance(self.returns, list) else None
@@ -0,0 +1,100 @@
+"""Micro-benchmark: command-line encoding, f-string vs generated bytes format.
+
+The old generated methods built an f-string that `Channel.write` then encoded
+and terminated (`str.encode(s) + b'\\n'`); the current ones %-format straight
+to the wire bytes. Both paths run here against a sink executor that does
+exactly what the channel does with each, for a few hot drawing commands.
+The generated methods run with the client's `clip` module against a 240x135
+panel, so the clipped commands (fillRect, drawLine) include their culling.
+
+Not collected by pytest; run with: uv run python tests/bench_encoders.py
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+from tft_protocol.generate import render_command_line
+from tft_protocol.load import load_protocol
+
+SPEC = Path(__file__).resolve().parents[1] / "protocol.yaml"
+CLIENT_SRC = Path(__file__).resolve().parents[2] / "client-py" / "src"
+NUMBER = 200_000
+
+
+class Sink:
+    """Stands for CommandExecutor + Channel.write: only the encoding."""
+
+    def do_command(self, cmd: str | bytes, ignore_response: bool = False) -> str:
+        line = cmd if isinstance(cmd, bytes) else str.encode(cmd) + b"\n"
+        return "" if line else "?"
+
+
+def generated_command_line() -> type:
+    source = render_command_line(load_protocol(SPEC))
+    source = source.replace("from .command_executor import CommandExecutor", "")
+    source = source.replace("from . import clip", "")
+    sys.path.insert(0, str(CLIENT_SRC))
+    from arduino_esp32_tft_terminal import config
+    from arduino_esp32_tft_terminal.lib import clip
+
+    config.WIDTH, config.HEIGHT = 240, 135
+    namespace = {"CommandExecutor": Sink, "clip": clip}
+    exec(compile(source, "command_line_autogen", "exec"), namespace)  # noqa: S102
+    return namespace["CommandLine"]
+
+
+class LegacyCommandLine:
+    """The same commands, as the f-string generator emitted them."""
+
+    def __init__(self, command: Sink) -> None:
+        self._command = command
+
+    def fill_rect(self, x: int, y: int, w: int, h: int, color: int) -> None:
+        self._command.do_command(f'fillRect {x} {y} {w} {h} {color}')
+
+    def draw_line(self, x0: int, y0: int, x1: int, y1: int, color: int) -> None:
+        self._command.do_command(f'drawLine {x0} {y0} {x1} {y1} {color}')
+
+    def set_text_color(self, r: int, g: int, b: int) -> None:
+        self._command.do_command(f'setTextColor {r} {g} {b}')
+
+    def auto_display(self, on: bool) -> None:
+        self._command.do_command(f'autoDisplay {int(on)}')
+
+    def print(self, text: str) -> None:
+        self._command.do_command(f'print {text}')
+
+    def display(self) -> None:
+        self._command.do_command('display')
+
+
+CALLS = {
+    "fillRect": "cl.fill_rect(120, 64, 30, 12, 1)",
+    "drawLine": "cl.draw_line(3, 130, 236, 7, 1)",
+    "setTextColor": "cl.set_text_color(255, 165, 0)",
+    "autoDisplay": "cl.auto_display(False)",
+    "print": "cl.print('12:34:56')",
+    "display": "cl.display()",
+}
+
+
+def per_call_ns(cl: object, stmt: str) -> float:
+    times = timeit.repeat(stmt, globals={"cl": cl}, number=NUMBER, repeat=9)
+    return min(times) / NUMBER * 1e9
+
+
+def main() -> None:
+    legacy = LegacyCommandLine(Sink())
+    generated = generated_command_line()(Sink())
+    print(f"{'command':14} {'f-string':>10} {'bytes fmt':>10} {'speedup':>8}")
+    for name, stmt in CALLS.items():
+        old = per_call_ns(legacy, stmt)
+        new = per_call_ns(generated, stmt)
+        print(f"{name:14} {old:8.0f}ns {new:8.0f}ns {old / new:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,51 +2,94 @@
 # Regenerate with: make protocol-gen
 """Typed command-line layer — one method per protocol command.
 
-Generated from protocol.yaml. Each method assembles the textual command line
-and parses the typed response, then defers to `CommandExecutor.do_command`.
+Generated from protocol.yaml. Each method encodes its command line straight to
+bytes, from a format specialised for its argument types, and parses the typed
+response; the round trip is `CommandExecutor.do_command`'s. Drawing commands
+(those with a `clip` mode) also get a `*_many` variant taking arrays: all the
+rows are checked and encoded in one go, and pipelined by
+`CommandExecutor.do_many`.
+Args with a spec'd `range` are checked before encoding, and the primitives of
+commands with a `clip` mode are culled or trimmed to the panel (see `clip`).
 App conveniences (text scaling, print slicing, HSV, recovery handling) live in
 the hand-written Gfx facade, not here.
 """
 
 from __future__ import annotations
 
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from . import clip
 from .command_executor import CommandExecutor
 
 
+def _table(
+    args: tuple[ArrayLike, ...], bounds: tuple[tuple[int, int], ...]
+) -> NDArray[np.int64]:
+    """Broadcast the args of a bulk call to an (N, len(args)) table of ints,
+    each column within its arg's range."""
+    cols = np.broadcast_arrays(*(np.asarray(a) for a in args))
+    table = np.stack([c.ravel() for c in cols], axis=1).astype(np.int64)
+    lo, hi = np.array(bounds).T
+    bad = (table < lo) | (table > hi)
+    if bad.any():
+        row, col = np.argwhere(bad)[0]
+        raise ValueError(
+            f'arg {col} of row {row} is {table[row, col]}, out of {bounds[col]}'
+        )
+    return table
+
+
 class CommandLine:
     def __init__(self, command: CommandExecutor) -> None:
         self._command = command
 
     def buf_no_args(self) -> None:
         """Buffered command with no arguments."""
-        self._command.do_command('bufNoArgs')
+        self._command.do_command(b'bufNoArgs\n')
 
     def buf_all_types(self, x: int, ch: int, flag: bool, sz: int, color: int) -> None:
         """Buffered command exercising every numeric arg type."""
-        self._command.do_command(f'bufAllTypes {x} {ch} {int(flag)} {sz} {color}')
+        self._command.do_command(b'bufAllTypes %d %d %d %d %d\n' % (x, ch, flag, sz, color))
 
     def buf_optional(self, a: int, b: int = -1) -> None:
         """Buffered command with an optional defaulted arg."""
-        self._command.do_command(f'bufOptional {a} {b}')
+        self._command.do_command(b'bufOptional %d %d\n' % (a, b))
+
+    def buf_clipped(self, x: int, y: int, w: int, h: int, color: int) -> None:
+        """Buffered rect trimmed to the panel, with a ranged arg."""
+        if not 0 <= color <= 1:
+            raise ValueError(f'color is {color}, out of 0..1')
+        _geom = clip.trim_rect(x, y, w, h)
+        if _geom is None:
+            return
+        x, y, w, h = _geom
+        self._command.do_command(b'bufClipped %d %d %d %d %d\n' % (x, y, w, h, color))
+
+    def buf_clipped_many(self, x: ArrayLike, y: ArrayLike, w: ArrayLike, h: ArrayLike, color: ArrayLike) -> None:
+        """Bulk `buf_clipped`: one command per row of the broadcast args."""
+        _rows = _table((x, y, w, h, color), ((-32768, 32767), (-32768, 32767), (-32768, 32767), (-32768, 32767), (0, 1)))
+        _rows = clip.trim_rect_many(_rows, (0, 1, 2, 3))
+        self._command.do_many(b'bufClipped %d %d %d %d %d\n', _rows)
 
     def buf_text(self, text: str) -> None:
         """Buffered raw-rest text; supports \\n escapes."""
-        self._command.do_command(f'bufText {text}')
+        self._command.do_command(b'bufText %s\n' % (text.encode(),))
 
     def q_bounds(self, x: int, s: str) -> tuple[int, int, int, int]:
         """Query with a trailing string returning an int tuple."""
-        _ans = self._command.do_command(f'qBounds {x} {s}')
+        _ans = self._command.do_command(b'qBounds %d %s\n' % (x, s.encode()))
         _parts = _ans.split()
         return (int(_parts[0]), int(_parts[1]), int(_parts[2]), int(_parts[3]))  # a b c d
 
     def q_value(self) -> int:
         """Query returning a single int."""
-        return int(self._command.do_command('qValue'))
+        return int(self._command.do_command(b'qValue\n'))
 
     def ctl_void(self) -> None:
         """Control command with no response."""
-        self._command.do_command('ctlVoid', ignore_response=True)
+        self._command.do_command(b'ctlVoid\n', ignore_response=True)
 
     def btn_read(self, ms: int = 100) -> str:
         """Button command returning a string."""
-        return self._command.do_command(f'btnRead {ms}')
+        return self._command.do_command(b'btnRead %d\n' % (ms,))
@@ -11,6 +11,7 @@
 void replay_bufNoArgs();
 void replay_bufAllTypes(int16_t x, unsigned char ch, bool flag, int8_t sz, int color);
 void replay_bufOptional(int a, int b);
+void replay_bufClipped(int16_t x, int16_t y, int16_t w, int16_t h, int color);
 void replay_bufText(const char * text);
 
 // Immediate command handlers — return the response string.
@@ -0,0 +1,91 @@
+"""Incremental generation — only changed stubs are written, and an unchanged
+spec + generator + stubs is recognised without rendering.
+
+Runs against a scratch repo root with the formatters disabled, so the result
+does not depend on which of them are installed.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from tft_protocol import generate
+from tft_protocol.generate import (
+    CACHE_NAME,
+    DOC_BEGIN,
+    DOC_END,
+    README_PROTOCOL_PATH,
+    TARGET_PATHS,
+    is_up_to_date,
+    render_targets,
+    save_cache,
+    stale_targets,
+    write_targets,
+)
+from tft_protocol.load import load_protocol
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "sample_protocol.yaml"
+
+
+@pytest.fixture
+def root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(generate, "FORMATTERS", {})
+    for rel in TARGET_PATHS:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+    readme = tmp_path / README_PROTOCOL_PATH
+    readme.write_text(f"# Protocol\n\n{DOC_BEGIN}\n{DOC_END}\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_only_changed_targets_are_written(root: Path) -> None:
+    targets = render_targets(load_protocol(FIXTURE), root)
+    assert len(write_targets(targets)) == len(TARGET_PATHS)
+    assert write_targets(targets) == []
+    assert stale_targets(targets) == []
+
+    edited = root / TARGET_PATHS[0]
+    edited.write_text("# hand edit\n", encoding="utf-8")
+    assert stale_targets(targets) == [edited]
+    assert write_targets(targets) == [edited]
+    assert "# hand edit" not in edited.read_text(encoding="utf-8")
+
+
+def test_cache_tracks_spec_and_stubs(root: Path, tmp_path: Path) -> None:
+    spec = tmp_path / "protocol.yaml"
+    spec.write_bytes(FIXTURE.read_bytes())
+    assert not is_up_to_date(spec, root)
+
+    write_targets(render_targets(load_protocol(spec), root))
+    save_cache(spec, root)
+    assert is_up_to_date(spec, root)
+
+    stub = root / TARGET_PATHS[-1]
+    stub.write_text(stub.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    assert not is_up_to_date(spec, root)  # a touched stub is regenerated
+
+    save_cache(spec, root)
+    spec.write_text(spec.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    assert not is_up_to_date(spec, root)
+
+
+def test_cache_tracks_formatters_and_survives_bad_files(
+    root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    spec = tmp_path / "protocol.yaml"
+    spec.write_bytes(FIXTURE.read_bytes())
+    write_targets(render_targets(load_protocol(spec), root))
+    save_cache(spec, root)
+    assert is_up_to_date(spec, root)
+
+    # a formatter installed or upgraded since: its version is an input
+    monkeypatch.setattr(generate, "FORMATTERS", {".txt": [sys.executable]})
+    assert not is_up_to_date(spec, root)
+    save_cache(spec, root)
+    assert is_up_to_date(spec, root)
+
+    cache = spec.parent / CACHE_NAME
+    inputs = json.loads(cache.read_text(encoding="utf-8"))["inputs"]
+    cache.write_text(json.dumps({"inputs": inputs}), encoding="utf-8")
+    assert not is_up_to_date(spec, root)  # stale, not a KeyError